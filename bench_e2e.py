@@ -0,0 +1,94 @@
+"""로컬 대역 서버를 상대로 crawl_hmall()을 실행하는 종단 간 벤치마크
+
+실제 사이트 대신 hmall_stub_server.py를 띄워 원격 서버 잡음 없이
+벽시계 시간, 스크롤 횟수, 초당 수집 항목, 정답 대비 완전성을 잽니다.
+
+사용 예:
+    python bench_e2e.py
+    python bench_e2e.py --mode xhr --mode dom --latency 0.3 --repeat 3 --json bench_output.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+import hmall_crawler
+from hmall_stub_server import StubConfig, StubServer, ground_truth
+
+
+def _key(item: dict) -> tuple:
+    return (item["날짜"], item["방송시간"], item["상품코드"])
+
+
+async def run_once(url: str, mode: str, truth: list) -> dict:
+    """크롤러를 한 번 실행하고 측정값을 반환합니다."""
+    stats = {}
+    started = time.perf_counter()
+    results = await hmall_crawler.crawl_hmall(mode=mode, url=url, stats=stats)
+    elapsed = time.perf_counter() - started
+
+    expected = {_key(item) for item in truth}
+    found = {_key(item) for item in results}
+    hit = len(expected & found)
+    return {
+        "mode": mode,
+        "seconds": elapsed,
+        "scrolls": stats.get("scrolls", 0),
+        "items": len(results),
+        "items_per_sec": len(results) / elapsed if elapsed else 0.0,
+        "completeness": hit / len(expected) if expected else 1.0,
+        "unexpected": len(found - expected),
+        "waits": {signal: {"count": c, "seconds": s} for signal, (c, s) in stats.get("waits", {}).items()},
+        "phases": stats["metrics"].report()["phases"] if "metrics" in stats else {},
+    }
+
+
+async def run_benchmark(config: StubConfig, modes: list, repeat: int) -> list:
+    truth = ground_truth(config, channel="tv")
+    runs = []
+    # 대역 서버용 선택자 프로필은 임시 파일에 (실제 사이트용 .hmall_selectors.json을 덮어쓰지 않도록)
+    saved_profile = hmall_crawler.SELECTOR_PROFILE
+    try:
+        with tempfile.TemporaryDirectory() as tmp, StubServer(config) as server:
+            hmall_crawler.SELECTOR_PROFILE = os.path.join(tmp, "selectors.json")
+            print(f"🧪 대역 서버: {server.url} (정답 {len(truth)}개)")
+            for mode in modes:
+                for i in range(repeat):
+                    before = server.api_requests
+                    result = await run_once(server.url, mode, truth)
+                    result["api_requests"] = server.api_requests - before
+                    runs.append(result)
+                    print(f"  [{mode} #{i + 1}] {result['seconds']:.1f}s, 스크롤 {result['scrolls']}회, "
+                          f"{result['items']}개 ({result['items_per_sec']:.1f}개/s), "
+                          f"완전성 {result['completeness']:.1%}, 오답 {result['unexpected']}개")
+    finally:
+        hmall_crawler.SELECTOR_PROFILE = saved_profile
+    return runs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="대역 서버 기반 크롤러 종단 간 벤치마크")
+    parser.add_argument("--mode", action="append", choices=["xhr", "dom"], help="수집 방식 (기본: 둘 다)")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--slots-per-day", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.0, help="API 응답 지연(초)")
+    parser.add_argument("--more-every", type=int, default=3, help="'상품 더보기' 주기 (0 = 없음)")
+    parser.add_argument("--json", dest="json_path", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args(argv)
+
+    config = StubConfig(days=args.days, slots_per_day=args.slots_per_day,
+                        latency=args.latency, more_every=args.more_every)
+    runs = asyncio.run(run_benchmark(config, args.mode or ["xhr", "dom"], args.repeat))
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"config": {k: v for k, v in vars(config).items() if k != "base_date"}, "runs": runs},
+                      f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""오프라인 추출 엔진 벤치마크 — 저장된 HTML 스냅샷으로 파서 백엔드별 속도·메모리·정확도 비교
+
+사용 예:
+    python bench_extract.py                       # debug_page.html + snapshots/*.html
+    python bench_extract.py page1.html page2.html --repeat 50
+    python bench_extract.py --backend lxml --json bench_output.json
+"""
+import argparse
+import glob
+import json
+import os
+import time
+import tracemalloc
+
+from hmall_extract import available_backends, extract_records
+
+DEFAULT_CORPUS = ["debug_page.html", "snapshots/*.html"]
+
+
+def load_corpus(patterns: list) -> list:
+    """(경로, HTML) 목록을 읽습니다. 패턴은 glob으로 확장합니다."""
+    docs = []
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)):
+            with open(path, encoding="utf-8") as f:
+                docs.append((path, f.read()))
+    return docs
+
+
+def bench_backend(backend: str, docs: list, repeat: int) -> dict:
+    """한 백엔드로 코퍼스 전체를 repeat번 추출하고 처리량·최대 메모리를 잽니다."""
+    extract_records(docs[0][1], backend)  # 워밍업 (임포트·XPath 컴파일)
+
+    records = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for _, html in docs:
+            records += len(extract_records(html, backend))
+    elapsed = time.perf_counter() - started
+
+    # 메모리는 속도 측정과 분리해 한 번만 측정 (tracemalloc 오버헤드 제외)
+    tracemalloc.start()
+    for _, html in docs:
+        extract_records(html, backend)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    runs = repeat * len(docs)
+    return {
+        "backend": backend,
+        "documents": runs,
+        "seconds": elapsed,
+        "docs_per_sec": runs / elapsed if elapsed else 0.0,
+        "records_per_sec": records / elapsed if elapsed else 0.0,
+        "peak_memory_kb": peak / 1024,
+    }
+
+
+def compare_accuracy(backends: list, docs: list, reference: str) -> dict:
+    """문서별로 각 백엔드 결과가 기준 백엔드와 같은지 확인합니다."""
+    mismatches = {b: [] for b in backends}
+    for path, html in docs:
+        expected = extract_records(html, reference)
+        for b in backends:
+            if extract_records(html, b) != expected:
+                mismatches[b].append(path)
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="편성표 오프라인 추출 벤치마크")
+    parser.add_argument("corpus", nargs="*", default=DEFAULT_CORPUS, help="HTML 파일 또는 glob 패턴")
+    parser.add_argument("--backend", action="append", help="측정할 백엔드 (여러 번 지정 가능, 기본: 설치된 전부)")
+    parser.add_argument("--repeat", type=int, default=20, help="코퍼스 반복 횟수")
+    parser.add_argument("--reference", default="bs4", help="정확도 비교 기준 백엔드")
+    parser.add_argument("--json", dest="json_path", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args(argv)
+
+    docs = load_corpus(args.corpus)
+    if not docs:
+        print("⚠️ 스냅샷 HTML이 없습니다.")
+        return
+
+    backends = args.backend or available_backends()
+    total_kb = sum(len(html.encode("utf-8")) for _, html in docs) / 1024
+    print(f"📂 코퍼스: {len(docs)}개 문서 ({total_kb:.0f} KB), 반복 {args.repeat}회")
+
+    results = [bench_backend(b, docs, args.repeat) for b in backends]
+
+    reference = args.reference if args.reference in available_backends() else backends[0]
+    mismatches = compare_accuracy(backends, docs, reference)
+
+    print(f"\n{'backend':<12}{'docs/s':>10}{'records/s':>12}{'peak KB':>10}  {reference} 대비")
+    for r in results:
+        diff = mismatches[r["backend"]]
+        accuracy = "일치" if not diff else f"불일치 {len(diff)}건"
+        print(f"{r['backend']:<12}{r['docs_per_sec']:>10.1f}{r['records_per_sec']:>12.0f}"
+              f"{r['peak_memory_kb']:>10.0f}  {accuracy}")
+        r["mismatched_documents"] = diff
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"corpus": [os.path.basename(p) for p, _ in docs], "results": results},
+                      f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
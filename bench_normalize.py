@@ -0,0 +1,126 @@
+"""정규화·중복 제거 단계 벤치마크 — 항목별 루프와 열 단위 배치 단계(hmall_normalize.py)의 처리량 비교
+
+대역 서버(hmall_stub_server.py)의 편성표로 스크롤 배치를 흉내 냅니다. 일부 상품명에는
+가격·버튼 문구를 붙이고 일부는 버튼 문구만 남깁니다 (정리하면 빈 이름).
+
+- delta (기본, 실제 파이프라인): 페이지 내 수집기가 새 항목만 넘기므로 배치가 겹치지 않음 (--step개씩)
+- overlap (참고): 화면에 남은 이전 항목(--window)이 배치마다 다시 넘어오는 경우 (델타 수집기 이전 방식)
+
+사용 예:
+    python bench_normalize.py
+    python bench_normalize.py --days 7 --step 6 --window 60 --repeat 20
+    python bench_normalize.py --json bench_output.json
+"""
+import argparse
+import datetime
+import json
+import time
+
+from hmall_catalog import clean_name
+from hmall_extract import normalize_date
+from hmall_normalize import RawBatch, RecordNormalizer
+from hmall_stub_server import StubConfig, build_schedule
+
+_JUNK_TAILS = ("", "", "", "149,000원최대 무3개월", "방송중 구매가능", "구매하기")
+_JUNK_ONLY_EVERY = 17   # 이 간격마다 상품명 자리에 버튼 문구만 잡힌 항목
+
+
+def build_batches(days: int, slots_per_day: int, window: int, step: int) -> list:
+    """수집기 drain 결과 형식({time, code, name, itemDate} 리스트)의 배치 목록"""
+    today = datetime.date.today()
+    items = []
+    for slot in build_schedule(StubConfig(days=days, slots_per_day=slots_per_day)):
+        offset = (slot["date"] - today).days
+        raw_date = "오늘" if offset == 0 else "내일" if offset == 1 else f"{slot['date'].month}월 {slot['date'].day}일"
+        for k, (code, name) in enumerate(slot["items"]):
+            name = "구매하기" if int(code) % _JUNK_ONLY_EVERY == 0 else \
+                name + _JUNK_TAILS[(int(code) + k) % len(_JUNK_TAILS)]
+            items.append({"time": slot["time"], "code": code, "name": name, "itemDate": raw_date})
+    return [items[max(0, end - window):end] for end in range(step, len(items) + step, step)]
+
+
+def per_item_loop(batches: list, fallback: str) -> list:
+    """지금까지의 스크롤 루프 방식: 배치마다 now(), 항목마다 날짜 정규식·키·dict"""
+    results = {}
+    for batch in batches:
+        today = datetime.datetime.now()
+        for item in batch:
+            final_date = normalize_date(item["itemDate"], fallback, today)
+            key = (final_date, item["time"], item["code"])
+            if key not in results:
+                results[key] = {
+                    "날짜": final_date,
+                    "방송시간": item["time"],
+                    "상품코드": item["code"],
+                    "상품명": clean_name(item["name"]),
+                }
+    return list(results.values())
+
+
+def batch_stage(batches: list, fallback: str) -> list:
+    """열 단위 배치 단계: 날짜 조회 표, 배치 해시 중복 제거, 새 항목만 상품명 정리"""
+    normalizer = RecordNormalizer()
+    results = []
+    for batch in batches:
+        results.extend(normalizer.add(RawBatch.from_items(batch), fallback))
+    return results
+
+
+def bench(fn, batches: list, fallback: str, repeat: int) -> dict:
+    fn(batches, fallback)  # 워밍업
+    items = sum(len(b) for b in batches)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(batches, fallback)
+    elapsed = time.perf_counter() - started
+    return {
+        "stage": fn.__name__,
+        "seconds": elapsed,
+        "records_per_sec": items * repeat / elapsed if elapsed else 0.0,
+        "batches_per_sec": len(batches) * repeat / elapsed if elapsed else 0.0,
+    }
+
+
+def run_case(name: str, batches: list, fallback: str, repeat: int) -> dict:
+    expected = per_item_loop(batches, fallback)
+    actual = batch_stage(batches, fallback)
+    results = [bench(fn, batches, fallback, repeat) for fn in (per_item_loop, batch_stage)]
+    speedup = results[1]["records_per_sec"] / results[0]["records_per_sec"] if results[0]["records_per_sec"] else 0
+    accuracy = "일치" if actual == expected else f"불일치 ({len(actual)}개 / 기준 {len(expected)}개)"
+
+    items = sum(len(b) for b in batches)
+    print(f"\n[{name}] 배치 {len(batches)}개, 항목 {items}개")
+    print(f"{'stage':<16}{'records/s':>12}{'batches/s':>12}{'seconds':>10}")
+    for r in results:
+        print(f"{r['stage']:<16}{r['records_per_sec']:>12.0f}{r['batches_per_sec']:>12.0f}{r['seconds']:>10.2f}")
+    print(f"⚡ 배치 단계 {speedup:.1f}배 (결과 {len(expected)}개, 항목별 루프와 {accuracy})")
+    return {"case": name, "batches": len(batches), "items": items, "results": results,
+            "speedup": speedup, "accurate": actual == expected}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="정규화·중복 제거 단계 벤치마크")
+    parser.add_argument("--days", type=int, default=7, help="편성 일수")
+    parser.add_argument("--slots", type=int, default=48, help="하루 방송 슬롯 수")
+    parser.add_argument("--step", type=int, default=4, help="배치마다 새로 나타나는 항목 수")
+    parser.add_argument("--window", type=int, default=40, help="overlap 경우 배치마다 다시 넘어오는 화면 항목 수")
+    parser.add_argument("--repeat", type=int, default=10, help="반복 횟수")
+    parser.add_argument("--json", dest="json_path", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args(argv)
+
+    fallback = datetime.date.today().strftime("%m.%d")
+    print(f"📦 스크롤당 새 항목 {args.step}개, 반복 {args.repeat}회")
+    cases = [
+        run_case("delta", build_batches(args.days, args.slots, args.step, args.step), fallback, args.repeat),
+        run_case(f"overlap (화면 {args.window}개)", build_batches(args.days, args.slots, args.window, args.step),
+                 fallback, args.repeat),
+    ]
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"step": args.step, "window": args.window, "cases": cases}, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
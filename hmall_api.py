@@ -0,0 +1,187 @@
+"""현대홈쇼핑 편성표 API(JSON) 응답 디코더 및 응답 가로채기 수집기"""
+import asyncio
+import json
+import re
+
+# ───────────────────────────────────────────────────
+# 편성표 JSON 필드 후보 (H.mall API 응답 키 이름)
+# ───────────────────────────────────────────────────
+CODE_KEYS = ("slitmCd", "slitm_cd", "slitmCode", "prdCd", "itemCd")
+NAME_KEYS = ("slitmNm", "slitmNmEx", "prdNm", "itemNm", "goodsNm")
+DATETIME_KEYS = ("brodStrtDtm", "brodStrDtm", "bdStrtDtm", "brodDtm", "brodStrtDt", "strtDtm")
+DATE_KEYS = ("brodDt", "bdDt", "brodYmd", "dispDt")
+TIME_KEYS = ("brodStrtTm", "bdStrtTm", "brodTm", "strtTm", "startTime")
+HAS_MORE_KEYS = ("hasNext", "hasNextPage", "nextYn", "moreYn", "existNextYn")
+IS_LAST_KEYS = ("isLast", "lastYn", "lastPage", "isLastPage")
+
+# 편성표 응답으로 간주할 URL 키워드 (brod=방송, tvtbl=편성표)
+SCHEDULE_URL_KEYWORDS = ("brod", "tvtbl", "schd", "schedule")
+
+_DATETIME_RE = re.compile(r"(\d{4})[-./]?(\d{2})[-./]?(\d{2})(?:[ T]?(\d{2}):?(\d{2}))?")
+_TIME_RE = re.compile(r"^(\d{2}):?(\d{2})")
+
+
+def _first(obj: dict, keys):
+    for k in keys:
+        v = obj.get(k)
+        if v not in (None, ""):
+            return v
+    return None
+
+
+def _parse_datetime(value):
+    """'20260223 12:30', '2026-02-23 12:30:00' 등을 ('02.23', '12:30')으로 변환합니다."""
+    m = _DATETIME_RE.search(str(value))
+    if not m:
+        return None, None
+    date = f"{m.group(2)}.{m.group(3)}"
+    time = f"{m.group(4)}:{m.group(5)}" if m.group(4) else None
+    return date, time
+
+
+def _parse_time(value):
+    m = _TIME_RE.match(str(value).strip())
+    return f"{m.group(1)}:{m.group(2)}" if m else None
+
+
+def _parse_flag(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.upper() in ("Y", "N", "TRUE", "FALSE"):
+        return value.upper() in ("Y", "TRUE")
+    return None
+
+
+def decode_schedule_payload(payload) -> tuple:
+    """편성표 JSON 응답을 (레코드 리스트, 다음 페이지 여부)로 변환합니다.
+
+    방송 단위 객체의 날짜/시간을 하위 상품 객체로 전파합니다 (DOM 수집의
+    lastDate/lastTime 전파와 동일). 다음 페이지 여부를 알 수 없으면 None입니다.
+    레코드의 날짜가 응답에 없으면 "날짜"는 None으로 남습니다.
+    """
+    records = []
+    has_more = None
+
+    def walk(node, date, time):
+        nonlocal has_more
+        if isinstance(node, list):
+            for child in node:
+                walk(child, date, time)
+            return
+        if not isinstance(node, dict):
+            return
+
+        flag = _parse_flag(_first(node, HAS_MORE_KEYS))
+        if flag is not None:
+            has_more = flag
+        flag = _parse_flag(_first(node, IS_LAST_KEYS))
+        if flag is not None:
+            has_more = not flag
+
+        dtm = _first(node, DATETIME_KEYS)
+        if dtm is not None:
+            d, t = _parse_datetime(dtm)
+            date, time = d or date, t or time
+        raw_date = _first(node, DATE_KEYS)
+        if raw_date is not None:
+            date = _parse_datetime(raw_date)[0] or date
+        raw_time = _first(node, TIME_KEYS)
+        if raw_time is not None:
+            time = _parse_time(raw_time) or time
+
+        code = _first(node, CODE_KEYS)
+        name = _first(node, NAME_KEYS)
+        if code is not None and name is not None and time:
+            code = str(code).strip()
+            name = str(name).strip()
+            if code.isdigit() and len(name) >= 2:
+                records.append({
+                    "날짜": date,
+                    "방송시간": time,
+                    "상품코드": code,
+                    "상품명": name,
+                })
+
+        for child in node.values():
+            if isinstance(child, (dict, list)):
+                walk(child, date, time)
+
+    walk(payload, None, None)
+    return records, has_more
+
+
+def is_schedule_url(url: str) -> bool:
+    lowered = url.lower()
+    return any(k in lowered for k in SCHEDULE_URL_KEYWORDS)
+
+
+class ScheduleResponseCollector:
+    """page.on("response")로 편성표 API 응답을 가로채 레코드를 누적합니다.
+
+    keep_payloads가 True면 받아들인 응답 본문을 payloads에 남깁니다 (원본 보관용).
+    """
+
+    def __init__(self, fallback_date: str, keep_payloads: bool = False):
+        self.fallback_date = fallback_date
+        self.keep_payloads = keep_payloads
+        self.payloads = []
+        self.results = {}  # { (date, time, code): item_dict }
+        self.dates = set()
+        self.responses = 0
+        self.has_more = None
+        self.latencies = []     # 응답별 요청 시작 → 응답 완료 시간(초)
+        self.payload_bytes = 0
+        self._event = asyncio.Event()
+
+    def reset(self):
+        """필터 전환 등으로 이전 응답을 버려야 할 때 호출합니다."""
+        self.results.clear()
+        self.dates.clear()
+        self.payloads.clear()
+        self.responses = 0
+        self.has_more = None
+        self._event.clear()
+
+    async def on_response(self, response):
+        if response.request.resource_type not in ("xhr", "fetch"):
+            return
+        if "json" not in (response.headers.get("content-type") or ""):
+            return
+        if not is_schedule_url(response.url):
+            return
+        try:
+            body = await response.body()
+            payload = json.loads(body)
+        except Exception:
+            return
+        timing = response.request.timing
+        if timing.get("responseEnd", -1) >= 0:
+            self.latencies.append(timing["responseEnd"] / 1000)
+        self.payload_bytes += len(body)
+
+        records, has_more = decode_schedule_payload(payload)
+        if not records and has_more is None:
+            return
+        if self.keep_payloads:
+            self.payloads.append(body)
+
+        for item in records:
+            if item["날짜"] is None:
+                item["날짜"] = self.fallback_date
+            key = (item["날짜"], item["방송시간"], item["상품코드"])
+            if key not in self.results:
+                self.results[key] = item
+                self.dates.add(item["날짜"])
+        self.responses += 1
+        if has_more is not None:
+            self.has_more = has_more
+        self._event.set()
+
+    async def wait_next(self, timeout: float) -> bool:
+        """다음 편성표 응답을 최대 timeout초 기다립니다. 응답이 오면 True."""
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._event.clear()
+        return True
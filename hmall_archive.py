@@ -0,0 +1,437 @@
+"""수집 원본 보관소 — 렌더링된 목록 HTML과 가로챈 JSON을 실행별로 보관하고 다시 추출
+
+DOM 스크롤 수집은 스크롤마다 페이지 내 수집기가 넘긴 새 항목(델타) JSON과 몇 번의 스크롤마다
+(ARCHIVE_SNAPSHOT_EVERY) 목록 컨테이너의 HTML을, API 응답 가로채기는 응답 본문을, 빠른 경로는
+받은 HTML 페이지를 스냅숏으로 남깁니다. 목록(Virtuoso)은 화면 구간만 그려지므로 HTML 스냅숏
+사이를 지나간 항목은 델타에만 남습니다. 스냅숏은 내용 기준 경계(HTML 요소 시작,
+JSON 객체 시작)에서 청크로 나누고 청크 해시로 저장하므로, 매시간 거의 같은 편성표와
+스크롤 사이에 겹치는 화면은 한 번만 저장됩니다. 청크는 zstandard가 설치돼 있으면 학습한
+사전(dictionary)을 쓴 zstd로, 없으면 zlib으로 압축합니다.
+
+추출 규칙을 고치거나 잘못 저장된 실행을 바로잡을 때는 사이트를 다시 수집하지 않고
+보관된 원본에서 결과를 다시 만듭니다 (네트워크 불필요).
+
+사용 예:
+    python hmall_archive.py runs
+    python hmall_archive.py reparse 12                    # → hmall_reparse_12.csv
+    python hmall_archive.py reparse 12 --backend selectolax --catalog --jsonl -
+    python hmall_archive.py stats
+    python hmall_archive.py train                         # zstd 사전 다시 학습
+    python hmall_archive.py prune --days 14
+"""
+import argparse
+import asyncio
+import csv
+import datetime
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+import zlib
+
+from hmall_api import decode_schedule_payload
+from hmall_extract import extract_raw_items
+from hmall_fastpath import extract_next_data
+from hmall_normalize import RawBatch, RecordNormalizer
+from hmall_pipeline import stdout_reserved
+
+ARCHIVE_DB = "hmall_archive.db"
+CHUNK_MIN = 1024              # 이보다 작은 청크는 만들지 않음
+CHUNK_MAX = 64 * 1024         # 이보다 커지면 다음 경계에서 무조건 자름
+CHUNK_MASK = 0x0F             # 경계 조각의 CRC 하위 비트가 0이면 자름 (평균 16조각마다)
+ZSTD_LEVEL = 9
+ZLIB_LEVEL = 9
+DICT_SIZE = 64 * 1024         # zstd 사전 크기
+DICT_TRAIN_MIN_CHUNKS = 300   # 청크가 이만큼 쌓이면 사전을 처음 학습
+DICT_SAMPLE_CHUNKS = 2000     # 학습에 쓰는 최근 청크 수
+
+# 청크 경계 후보: 내용이 같으면 위치가 달라도 같은 곳에서 잘리도록 요소/객체 시작에서만 자름
+_BOUNDARIES = {
+    "html": re.compile(rb"<(?:div|li|ul|section|article|a)\b"),
+    "page": re.compile(rb"<(?:div|li|ul|section|article|a|script)\b|\{\""),
+    "json": re.compile(rb"\{\""),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_at      TEXT NOT NULL,
+    tier        TEXT NOT NULL,
+    mode        TEXT NOT NULL,
+    item_count  INTEGER,
+    outcome     TEXT
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    snapshot_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id      INTEGER NOT NULL REFERENCES runs(run_id),
+    job         TEXT NOT NULL,      -- 작업 이름 (날짜 탭 / 채널) 또는 "fast_path"
+    kind        TEXT NOT NULL,      -- 'items' = 수집기 델타, 'html' = 목록 HTML, 'json' = API 응답, 'page' = 빠른 경로 HTML
+    fallback    TEXT NOT NULL,      -- 날짜가 없는 항목에 쓸 'MM.DD' (작업 날짜)
+    captured_at TEXT NOT NULL,
+    size        INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshot_chunks (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(snapshot_id),
+    seq         INTEGER NOT NULL,
+    hash        TEXT NOT NULL,
+    PRIMARY KEY (snapshot_id, seq)
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    hash        TEXT PRIMARY KEY,   -- 원본 청크의 BLAKE2b-128
+    codec       TEXT NOT NULL,      -- 'zstd' / 'zlib'
+    dict_id     INTEGER,            -- zstd 사전 (없으면 NULL)
+    size        INTEGER NOT NULL,   -- 원본 크기
+    data        BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dicts (
+    dict_id     INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at  TEXT NOT NULL,
+    data        BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_run ON snapshots(run_id, snapshot_id);
+CREATE INDEX IF NOT EXISTS idx_snapshot_chunks_hash ON snapshot_chunks(hash);
+"""
+
+
+def _zstd():
+    """zstandard 모듈 (설치돼 있지 않으면 None — zlib으로 압축)"""
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def split_chunks(data: bytes, kind: str = "html") -> list:
+    """data를 내용 기준 경계에서 청크 리스트로 나눕니다 (이어 붙이면 원본과 같음).
+
+    경계 후보 사이의 조각마다 CRC를 구해 하위 비트가 0인 곳에서 자르므로, 앞쪽에 내용이
+    끼어들거나 빠져도 그 뒤의 같은 내용은 같은 청크가 됩니다.
+    """
+    boundary = _BOUNDARIES.get(kind, _BOUNDARIES["json"])
+    view = memoryview(data)
+    chunks = []
+    start = piece = 0
+    for m in boundary.finditer(data):
+        pos = m.start()
+        if pos == piece:
+            continue
+        size = pos - start
+        if size >= CHUNK_MAX or (size >= CHUNK_MIN and zlib.crc32(view[piece:pos]) & CHUNK_MASK == 0):
+            chunks.append(data[start:pos])
+            start = pos
+        piece = pos
+    if start < len(data):
+        chunks.append(data[start:])
+    return chunks
+
+
+class SnapshotArchive:
+    """수집 원본 스냅숏 보관소 (SQLite, 청크 단위 중복 제거·압축)
+
+    한 인스턴스는 한 실행(begin_run ~ finish_run)을 기록합니다. 스냅숏은 add마다 커밋되므로
+    중간에 실패한 실행도 그때까지의 원본으로 다시 추출할 수 있습니다.
+    """
+
+    def __init__(self, path: str = ARCHIVE_DB):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.run_id = None
+        self.zstd = _zstd()
+        self._compressors = {}
+        self._decompressors = {}
+        self._dicts = {}
+        row = self.conn.execute("SELECT MAX(dict_id) FROM dicts").fetchone()
+        self.dict_id = row[0] if self.zstd is not None else None
+        self.stats = {"snapshots": 0, "bytes": 0, "new_chunks": 0, "reused_chunks": 0, "stored_bytes": 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    # ── 압축 ─────────────────────────────────────────
+    def _dict(self, dict_id: int):
+        if dict_id not in self._dicts:
+            row = self.conn.execute("SELECT data FROM dicts WHERE dict_id = ?", (dict_id,)).fetchone()
+            self._dicts[dict_id] = self.zstd.ZstdCompressionDict(row["data"])
+        return self._dicts[dict_id]
+
+    def _compress(self, raw: bytes) -> tuple:
+        """(codec, dict_id, 압축 데이터)"""
+        if self.zstd is None:
+            return "zlib", None, zlib.compress(raw, ZLIB_LEVEL)
+        if self.dict_id not in self._compressors:
+            options = {"dict_data": self._dict(self.dict_id)} if self.dict_id is not None else {}
+            self._compressors[self.dict_id] = self.zstd.ZstdCompressor(level=ZSTD_LEVEL, **options)
+        return "zstd", self.dict_id, self._compressors[self.dict_id].compress(raw)
+
+    def _decompress(self, codec: str, dict_id, data: bytes) -> bytes:
+        if codec == "zlib":
+            return zlib.decompress(data)
+        if self.zstd is None:
+            raise RuntimeError("zstd로 압축된 청크입니다. zstandard 패키지를 설치하세요 (pip install zstandard).")
+        if dict_id not in self._decompressors:
+            options = {"dict_data": self._dict(dict_id)} if dict_id is not None else {}
+            self._decompressors[dict_id] = self.zstd.ZstdDecompressor(**options)
+        return self._decompressors[dict_id].decompress(data)
+
+    # ── 기록 ─────────────────────────────────────────
+    def begin_run(self, run_at: datetime.datetime = None, tier: str = "full", mode: str = "xhr") -> int:
+        run_at = run_at or datetime.datetime.now()
+        cur = self.conn.execute("INSERT INTO runs (run_at, tier, mode) VALUES (?, ?, ?)",
+                                (run_at.isoformat(timespec="seconds"), tier, mode))
+        self.conn.commit()
+        self.run_id = cur.lastrowid
+        return self.run_id
+
+    def add(self, job: str, kind: str, data, fallback: str) -> int:
+        """스냅숏 하나를 현재 실행에 추가하고 새로 저장한 청크의 압축 크기를 반환합니다."""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        chunks = split_chunks(data, kind)
+        hashes = [hashlib.blake2b(chunk, digest_size=16).hexdigest() for chunk in chunks]
+        existing = set()
+        for i in range(0, len(hashes), 500):
+            part = hashes[i:i + 500]
+            existing.update(row[0] for row in self.conn.execute(
+                f"SELECT hash FROM chunks WHERE hash IN ({','.join('?' * len(part))})", part))
+
+        stored = 0
+        for chunk, digest in zip(chunks, hashes):
+            if digest in existing:
+                self.stats["reused_chunks"] += 1
+                continue
+            codec, dict_id, blob = self._compress(chunk)
+            self.conn.execute("INSERT INTO chunks (hash, codec, dict_id, size, data) VALUES (?, ?, ?, ?, ?)",
+                              (digest, codec, dict_id, len(chunk), blob))
+            existing.add(digest)
+            stored += len(blob)
+            self.stats["new_chunks"] += 1
+
+        cur = self.conn.execute(
+            "INSERT INTO snapshots (run_id, job, kind, fallback, captured_at, size) VALUES (?, ?, ?, ?, ?, ?)",
+            (self.run_id, job, kind, fallback, datetime.datetime.now().isoformat(timespec="seconds"), len(data)))
+        self.conn.executemany("INSERT INTO snapshot_chunks (snapshot_id, seq, hash) VALUES (?, ?, ?)",
+                              [(cur.lastrowid, seq, digest) for seq, digest in enumerate(hashes)])
+        self.conn.commit()
+        self.stats["snapshots"] += 1
+        self.stats["bytes"] += len(data)
+        self.stats["stored_bytes"] += stored
+        return stored
+
+    def finish_run(self, item_count: int, outcome: str):
+        self.conn.execute("UPDATE runs SET item_count = ?, outcome = ? WHERE run_id = ?",
+                          (item_count, outcome, self.run_id))
+        self.conn.commit()
+
+    def report(self):
+        s = self.stats
+        codec = "zlib" if self.zstd is None else ("zstd+사전" if self.dict_id is not None else "zstd")
+        print(f"🗃️ 원본 보관 #{self.run_id}: 스냅숏 {s['snapshots']}개, 원본 {s['bytes'] / 1024:.0f}KB "
+              f"→ 새 청크 {s['new_chunks']}개 {s['stored_bytes'] / 1024:.1f}KB "
+              f"(재사용 {s['reused_chunks']}개, {codec})")
+
+    # ── 유지 관리 ─────────────────────────────────────
+    def train_dictionary(self) -> int:
+        """최근 청크로 zstd 사전을 학습해 이후 청크에 씁니다. 학습하지 못하면 None."""
+        if self.zstd is None:
+            return None
+        rows = self.conn.execute("SELECT codec, dict_id, data FROM chunks ORDER BY rowid DESC LIMIT ?",
+                                 (DICT_SAMPLE_CHUNKS,)).fetchall()
+        samples = [self._decompress(r["codec"], r["dict_id"], r["data"]) for r in rows]
+        try:
+            trained = self.zstd.train_dictionary(DICT_SIZE, samples)
+        except self.zstd.ZstdError as e:
+            print(f"  ⚠️ zstd 사전 학습 실패: {e}")
+            return None
+        cur = self.conn.execute("INSERT INTO dicts (created_at, data) VALUES (?, ?)",
+                                (datetime.datetime.now().isoformat(timespec="seconds"), trained.as_bytes()))
+        self.conn.commit()
+        self.dict_id = cur.lastrowid
+        return self.dict_id
+
+    def maybe_train(self):
+        """사전이 아직 없고 청크가 충분히 쌓였으면 처음 학습합니다."""
+        if self.zstd is None or self.dict_id is not None:
+            return
+        count = self.conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+        if count >= DICT_TRAIN_MIN_CHUNKS and self.train_dictionary() is not None:
+            print(f"  📚 zstd 사전 학습 (청크 {min(count, DICT_SAMPLE_CHUNKS)}개) — 다음 스냅숏부터 사용")
+
+    def prune(self, keep_days: int, now: datetime.datetime = None) -> int:
+        """keep_days일보다 오래된 실행과, 어느 스냅숏도 참조하지 않는 청크·사전을 지웁니다."""
+        now = now or datetime.datetime.now()
+        cutoff = (now - datetime.timedelta(days=keep_days)).isoformat(timespec="seconds")
+        run_ids = [row[0] for row in self.conn.execute("SELECT run_id FROM runs WHERE run_at < ?", (cutoff,))]
+        if not run_ids:
+            return 0
+        marks = ",".join("?" * len(run_ids))
+        self.conn.execute(f"DELETE FROM snapshot_chunks WHERE snapshot_id IN "
+                          f"(SELECT snapshot_id FROM snapshots WHERE run_id IN ({marks}))", run_ids)
+        self.conn.execute(f"DELETE FROM snapshots WHERE run_id IN ({marks})", run_ids)
+        self.conn.execute(f"DELETE FROM runs WHERE run_id IN ({marks})", run_ids)
+        self.conn.execute("DELETE FROM chunks WHERE hash NOT IN (SELECT hash FROM snapshot_chunks)")
+        self.conn.execute("DELETE FROM dicts WHERE dict_id <> (SELECT MAX(dict_id) FROM dicts) "
+                          "AND dict_id NOT IN (SELECT dict_id FROM chunks WHERE dict_id IS NOT NULL)")
+        self.conn.commit()
+        return len(run_ids)
+
+    # ── 조회 ─────────────────────────────────────────
+    def runs(self, limit: int = 20) -> list:
+        return self.conn.execute(
+            "SELECT r.*, COUNT(s.snapshot_id) AS snapshots, COALESCE(SUM(s.size), 0) AS bytes "
+            "FROM runs r LEFT JOIN snapshots s ON s.run_id = r.run_id "
+            "GROUP BY r.run_id ORDER BY r.run_id DESC LIMIT ?", (limit,)).fetchall()
+
+    def run(self, run_id: int):
+        return self.conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+
+    def snapshots(self, run_id: int):
+        """실행의 스냅숏을 기록 순서대로 (행, 원본 bytes)로 내보냅니다."""
+        for snap in self.conn.execute("SELECT * FROM snapshots WHERE run_id = ? ORDER BY snapshot_id",
+                                      (run_id,)).fetchall():
+            rows = self.conn.execute(
+                "SELECT c.codec, c.dict_id, c.data FROM snapshot_chunks sc JOIN chunks c ON c.hash = sc.hash "
+                "WHERE sc.snapshot_id = ? ORDER BY sc.seq", (snap["snapshot_id"],))
+            yield snap, b"".join(self._decompress(r["codec"], r["dict_id"], r["data"]) for r in rows)
+
+    def totals(self) -> dict:
+        raw = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM snapshots").fetchone()
+        chunks = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) "
+                                   "FROM chunks").fetchone()
+        codecs = dict(self.conn.execute("SELECT codec, COUNT(*) FROM chunks GROUP BY codec").fetchall())
+        dicts = self.conn.execute("SELECT COUNT(*) FROM dicts").fetchone()[0]
+        return {"snapshots": raw[0], "bytes": raw[1], "chunks": chunks[0], "unique_bytes": chunks[1],
+                "stored_bytes": chunks[2], "codecs": codecs, "dicts": dicts}
+
+
+def reparse_run(archive: SnapshotArchive, run_id: int, backend: str = "lxml") -> list:
+    """보관된 원본만으로 실행 결과(날짜/방송시간/상품코드/상품명)를 다시 만듭니다.
+
+    작업마다 스냅숏을 기록 순서대로 현재 추출 규칙(hmall_extract, decode_schedule_payload)에
+    넣고, 날짜 표기는 그 실행 시각 기준으로 정규화합니다. DOM 스크롤 수집의 델타("items")는
+    페이지 내 수집기가 뽑은 원시 항목이므로 정규화·상품명 정리만 다시 적용됩니다. 카탈로그로 채운 상품명은 원본에
+    없으므로 페이지의 상품명이 들어갑니다 (reparse --catalog로 다시 채울 수 있음).
+    hot 실행은 그 실행이 새로 수집한 시간대만 나옵니다.
+    """
+    run = archive.run(run_id)
+    if run is None:
+        raise ValueError(f"보관된 실행이 없습니다: #{run_id}")
+    normalizer = RecordNormalizer(datetime.datetime.fromisoformat(run["run_at"]))
+    results = {}
+    states = {}   # 작업별 lastDate/lastTime (스크롤 스냅숏 사이에 이어짐)
+
+    for snap, data in archive.snapshots(run_id):
+        if snap["kind"] == "items":
+            records = normalizer.add(RawBatch.from_items(json.loads(data)["items"]), snap["fallback"])
+        elif snap["kind"] == "html":
+            state = states.get(snap["job"])
+            extracted = extract_raw_items(data.decode("utf-8", "replace"), backend, state)
+            states[snap["job"]] = {"lastDate": extracted["lastDate"], "lastTime": extracted["lastTime"]}
+            records = normalizer.add(RawBatch.from_items(extracted["items"]), snap["fallback"])
+        else:
+            payload = extract_next_data(data.decode("utf-8", "replace")) if snap["kind"] == "page" else json.loads(data)
+            records = decode_schedule_payload(payload)[0] if payload is not None else []
+
+        for item in records:
+            if item["날짜"] is None:
+                item["날짜"] = snap["fallback"]
+            key = (item["날짜"], item["방송시간"], item["상품코드"])
+            if key not in results:
+                results[key] = item
+    return list(results.values())
+
+
+def _write_results(results: list, csv_path: str = None, jsonl: str = None):
+    fields = ("날짜", "방송시간", "상품코드", "상품명")
+    if csv_path:
+        with open(csv_path, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.writer(f)
+            writer.writerow(fields)
+            writer.writerows([item[field] for field in fields] for item in results)
+        print(f"💾 CSV 저장: {csv_path} ({len(results)}개)")
+    if jsonl:
+        out = sys.__stdout__ if jsonl == "-" else open(jsonl, "w", encoding="utf-8")
+        try:
+            for item in results:
+                out.write(json.dumps(item, ensure_ascii=False) + "\n")
+        finally:
+            if out is not sys.__stdout__:
+                out.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="수집 원본 보관소 조회·다시 추출")
+    parser.add_argument("--db", default=ARCHIVE_DB, help="보관소 DB 경로")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_runs = sub.add_parser("runs", help="보관된 실행 목록")
+    p_runs.add_argument("--limit", type=int, default=20)
+
+    p_reparse = sub.add_parser("reparse", help="보관된 원본에서 실행 결과 다시 만들기")
+    p_reparse.add_argument("run_id", type=int)
+    p_reparse.add_argument("--backend", default="lxml", help="HTML 파서 백엔드 (hmall_extract.py)")
+    p_reparse.add_argument("--csv", metavar="PATH", help="결과 CSV 경로 (기본: hmall_reparse_<run_id>.csv)")
+    p_reparse.add_argument("--jsonl", metavar="PATH", help="결과를 JSON Lines로 기록 (\"-\" = 표준 출력)")
+    p_reparse.add_argument("--catalog", action="store_true", help="상품명을 상품 카탈로그의 정식 상품명으로 채움")
+
+    sub.add_parser("stats", help="보관소 크기와 중복 제거·압축률")
+    sub.add_parser("train", help="zstd 사전 다시 학습 (zstandard 필요)")
+
+    p_prune = sub.add_parser("prune", help="오래된 실행 지우기")
+    p_prune.add_argument("--days", type=int, required=True)
+
+    args = parser.parse_args(argv)
+
+    with SnapshotArchive(args.db) as archive:
+        if args.command == "runs":
+            for r in archive.runs(args.limit):
+                print(f"#{r['run_id']}  {r['run_at']}  {r['tier']:<4}  {r['mode']:<4}  {r['outcome'] or '-':<16}"
+                      f"  스냅숏 {r['snapshots']}개  {r['bytes'] / 1024:.0f}KB")
+        elif args.command == "reparse":
+            # --jsonl - 이면 표준 출력은 JSONL 전용, 진행 상황은 표준 오류로
+            with stdout_reserved(args.jsonl):
+                results = reparse_run(archive, args.run_id, args.backend)
+                if args.catalog:
+                    from hmall_catalog import ProductCatalog
+
+                    async def names():
+                        async with ProductCatalog() as catalog:
+                            return catalog.names({item["상품코드"] for item in results})
+
+                    found = asyncio.run(names())
+                    for item in results:
+                        item["상품명"] = found.get(item["상품코드"], item["상품명"])
+                print(f"🔁 #{args.run_id} 다시 추출: {len(results)}개")
+                csv_path = args.csv or (None if args.jsonl else f"hmall_reparse_{args.run_id}.csv")
+                _write_results(results, csv_path, args.jsonl)
+        elif args.command == "stats":
+            t = archive.totals()
+            dedup = t["bytes"] / t["unique_bytes"] if t["unique_bytes"] else 0
+            ratio = t["unique_bytes"] / t["stored_bytes"] if t["stored_bytes"] else 0
+            print(f"스냅숏 {t['snapshots']}개, 원본 {t['bytes'] / 1024 / 1024:.1f}MB")
+            print(f"청크 {t['chunks']}개 {t['unique_bytes'] / 1024 / 1024:.1f}MB (중복 제거 {dedup:.1f}배)")
+            print(f"저장 {t['stored_bytes'] / 1024 / 1024:.2f}MB (압축 {ratio:.1f}배, "
+                  f"{', '.join(f'{k} {v}개' for k, v in t['codecs'].items()) or '-'}, 사전 {t['dicts']}개)")
+        elif args.command == "train":
+            dict_id = archive.train_dictionary()
+            if dict_id is None and archive.zstd is None:
+                print("zstandard 패키지가 없어 zlib으로 압축합니다 (pip install zstandard).")
+            elif dict_id is not None:
+                print(f"📚 zstd 사전 #{dict_id} 학습 완료 — 다음 스냅숏부터 사용")
+        elif args.command == "prune":
+            print(f"🧹 실행 {archive.prune(args.days)}개 삭제")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""크롤링에 필요 없는 이미지·폰트·동영상·추적 스크립트 요청 차단 (page.route 기반)"""
+from urllib.parse import urlsplit
+
+# 항상 통과시킬 리소스 타입 (텍스트와 slitmCd 링크를 그리는 데 필요)
+ALLOWED_RESOURCE_TYPES = {"document", "script", "xhr", "fetch"}
+
+# 차단할 리소스 타입
+# stylesheet는 '상품 더보기' 버튼의 is_visible() 판정과 Virtuoso 높이 계산에 쓰이므로 통과
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "texttrack", "eventsource", "websocket", "manifest", "ping"}
+
+# 차단할 호스트 (분석/광고 비콘) — 하위 도메인까지 포함
+BLOCKED_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googleadservices.com",
+    "facebook.net",
+    "facebook.com",
+    "criteo.com",
+    "criteo.net",
+    "wcs.naver.net",
+    "analytics.naver.com",
+    "kakao.com",
+    "daumcdn.net",
+    "mobon.net",
+    "appsflyer.com",
+    "branch.io",
+    "hotjar.com",
+)
+
+
+class ResourceBlocker:
+    """컨텍스트의 모든 요청을 검사해 불필요한 요청을 abort하고 횟수를 집계합니다.
+
+    Playwright는 route가 걸리면 HTTP 캐시를 쓰지 않으므로, 차단으로 줄어드는
+    전송량이 캐시 손실보다 클 때만 사용하세요 (매 실행이 새 브라우저라면 해당).
+    """
+
+    def __init__(self, allowed_types=None, blocked_types=None, blocked_hosts=None):
+        self.allowed_types = set(ALLOWED_RESOURCE_TYPES if allowed_types is None else allowed_types)
+        self.blocked_types = set(BLOCKED_RESOURCE_TYPES if blocked_types is None else blocked_types)
+        self.blocked_hosts = tuple(BLOCKED_HOSTS if blocked_hosts is None else blocked_hosts)
+        self.blocked = {}         # { 사유: 요청 수 }
+        self.allowed_requests = 0
+        self.allowed_bytes = 0    # 통과한 응답의 Content-Length 합계
+
+    def reset(self):
+        """실행별 집계를 위해 카운터를 초기화합니다 (데몬 모드에서 컨텍스트 재사용 시)."""
+        self.blocked = {}
+        self.allowed_requests = 0
+        self.allowed_bytes = 0
+
+    def block_reason(self, request):
+        """차단 사유("host:...", "type:...")를 반환합니다. 통과시킬 요청이면 None."""
+        host = urlsplit(request.url).hostname or ""
+        for blocked in self.blocked_hosts:
+            if host == blocked or host.endswith("." + blocked):
+                return f"host:{blocked}"
+        if request.resource_type in self.allowed_types:
+            return None
+        if request.resource_type in self.blocked_types:
+            return f"type:{request.resource_type}"
+        return None
+
+    async def handle(self, route):
+        reason = self.block_reason(route.request)
+        if reason is None:
+            self.allowed_requests += 1
+            await route.continue_()
+            return
+        self.blocked[reason] = self.blocked.get(reason, 0) + 1
+        await route.abort("blockedbyclient")
+
+    def _on_response(self, response):
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            self.allowed_bytes += int(length)
+
+    async def install(self, context):
+        """브라우저 컨텍스트에 차단 규칙을 등록합니다 (페이지 생성 전에 호출)."""
+        await context.route("**/*", self.handle)
+        context.on("response", self._on_response)
+
+    @property
+    def blocked_requests(self) -> int:
+        return sum(self.blocked.values())
+
+    def report(self):
+        """차단/통과 요청 수와 통과 바이트를 출력합니다."""
+        total = self.blocked_requests + self.allowed_requests
+        print(
+            f"  🚫 요청 차단: {self.blocked_requests}/{total}건 차단, "
+            f"통과 {self.allowed_requests}건 ({self.allowed_bytes / 1024:.0f} KB)"
+        )
+        top = sorted(self.blocked.items(), key=lambda kv: kv[1], reverse=True)[:5]
+        if top:
+            print("     " + ", ".join(f"{reason} {count}" for reason, count in top))
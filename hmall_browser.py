@@ -0,0 +1,114 @@
+"""여러 실행에 걸쳐 재사용하는 Chromium 세션 (데몬 모드용)
+
+영구 프로필(user_data_dir)로 컨텍스트를 띄워 쿠키, localStorage, 서비스 워커와
+HTTP 캐시를 디스크에 유지합니다. N회 실행하거나 메모리가 임계값을 넘으면
+브라우저만 재시작하고, 프로필은 그대로 이어 씁니다.
+
+route 기반 요청 차단(hmall_blocking.py)은 컨텍스트의 HTTP 캐시를 끄므로 기본으로 설치하지 않습니다.
+"""
+import os
+
+from playwright.async_api import async_playwright
+
+from hmall_blocking import ResourceBlocker
+
+# 모바일 H.mall 페이지용 컨텍스트 설정
+CONTEXT_OPTIONS = {
+    "user_agent": (
+        "Mozilla/5.0 (iPhone; CPU iPhone OS 16_6 like Mac OS X) "
+        "AppleWebKit/605.1.15 (KHTML, like Gecko) "
+        "Version/16.6 Mobile/15E148 Safari/604.1"
+    ),
+    "viewport": {"width": 390, "height": 844},
+    "is_mobile": True,
+}
+
+PROFILE_DIR = ".hmall_profile"   # 영구 프로필 경로 (쿠키·localStorage·캐시)
+RECYCLE_RUNS = 20                # 이 횟수만큼 실행하면 브라우저 재시작
+RECYCLE_MEMORY_MB = 1500         # Chromium 프로세스 RSS 합계가 이 값을 넘으면 재시작
+
+
+def browser_memory_mb(profile_dir: str):
+    """profile_dir로 실행된 Chromium 프로세스 트리의 RSS 합계(MB). 리눅스 외에는 None."""
+    if not os.path.isdir("/proc"):
+        return None
+    marker = f"--user-data-dir={os.path.abspath(profile_dir)}".encode()
+    parents, roots, rss = {}, [], {}
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f"/proc/{pid}/stat", "rb") as f:
+                fields = f.read().rsplit(b")", 1)[1].split()
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                cmdline = f.read()
+        except OSError:
+            continue
+        parents[pid] = fields[1].decode()             # ppid
+        rss[pid] = int(fields[21]) * os.sysconf("SC_PAGE_SIZE")
+        if marker in cmdline and b"--type=" not in cmdline:
+            roots.append(pid)
+    if not roots:
+        return None
+
+    # 루트(브라우저 프로세스)의 모든 하위 프로세스 합산
+    tree = set(roots)
+    changed = True
+    while changed:
+        changed = False
+        for pid, ppid in parents.items():
+            if ppid in tree and pid not in tree:
+                tree.add(pid)
+                changed = True
+    return sum(rss[pid] for pid in tree) / (1024 * 1024)
+
+
+class BrowserSession:
+    """따뜻한 브라우저 컨텍스트 하나를 유지하고 필요할 때만 재시작합니다."""
+
+    def __init__(self, profile_dir: str = PROFILE_DIR, recycle_runs: int = RECYCLE_RUNS,
+                 recycle_memory_mb: float = RECYCLE_MEMORY_MB, block_resources: bool = False):
+        self.profile_dir = profile_dir
+        self.recycle_runs = recycle_runs
+        self.recycle_memory_mb = recycle_memory_mb
+        self.block_resources = block_resources
+        self.context = None
+        self.blocker = None
+        self.runs = 0           # 현재 브라우저로 실행한 횟수
+        self.launches = 0
+        self._pw = None
+
+    async def start(self):
+        if self._pw is None:
+            self._pw = await async_playwright().start()
+        self.context = await self._pw.chromium.launch_persistent_context(
+            self.profile_dir, headless=True, **CONTEXT_OPTIONS
+        )
+        self.blocker = ResourceBlocker() if self.block_resources else None
+        if self.blocker:
+            await self.blocker.install(self.context)
+        self.runs = 0
+        self.launches += 1
+
+    async def recycle_if_needed(self) -> bool:
+        """실행 횟수나 메모리 임계값을 넘었으면 브라우저를 재시작합니다."""
+        memory = browser_memory_mb(self.profile_dir)
+        reason = None
+        if self.runs >= self.recycle_runs:
+            reason = f"{self.runs}회 실행"
+        elif memory is not None and memory > self.recycle_memory_mb:
+            reason = f"메모리 {memory:.0f}MB"
+        if reason is None:
+            return False
+        print(f"♻️ 브라우저 재시작 ({reason})")
+        await self.context.close()
+        await self.start()
+        return True
+
+    async def close(self):
+        if self.context:
+            await self.context.close()
+            self.context = None
+        if self._pw:
+            await self._pw.stop()
+            self._pw = None
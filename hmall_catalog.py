@@ -0,0 +1,305 @@
+"""상품 카탈로그 — 상품코드별 정식 상품명·가격·카테고리 캐시
+
+DOM에서 긁은 상품명은 버튼·가격 문구("방송중 구매가능", "구매하기", "149,000원최대 무3월…")가
+섞이기 쉬우므로, 상품코드(slitmCd)마다 상품 상세 페이지에서 한 번만 정식 정보를 가져와
+카탈로그 DB(hmall_catalog.db)의 products 테이블에 저장합니다. 수집 결과는 이 카탈로그와 조인해
+상품명을 채우고, CATALOG_TTL_DAYS가 지난 항목만 다시 가져옵니다.
+
+카탈로그는 이력 DB와 파일을 나눕니다. 스트리밍 수집 중에는 이력 저장(HistorySink)이 실행이
+끝날 때까지 이력 DB에 쓰기 트랜잭션을 열어 두므로, 같은 파일에 쓰면 배치마다의 카탈로그 저장이
+잠금에 막힙니다.
+
+사용 예:
+    python hmall_catalog.py show 2232380752
+    python hmall_catalog.py refresh 2232380752 2250139670
+"""
+import argparse
+import asyncio
+import datetime
+import re
+import sqlite3
+
+import httpx
+
+from hmall_api import CODE_KEYS, NAME_KEYS, _first
+from hmall_fastpath import BASE_URL, REQUEST_TIMEOUT, USER_AGENT, extract_next_data
+CATALOG_DB = "hmall_catalog.db"
+PRODUCT_PATH = "/md/pda/itemPtc"   # 상품 상세 페이지 (?slitmCd=상품코드)
+CATALOG_TTL_DAYS = 7               # 이보다 오래된 상품 정보는 다시 가져옴
+CATALOG_MISS_TTL_HOURS = 24        # 가져오기에 실패한 상품을 다시 시도하는 간격
+CATALOG_CONCURRENCY = 4            # 동시에 여는 상품 페이지 요청 수
+
+PRICE_KEYS = ("sellPrc", "salePrc", "dcSellPrc", "finalPrc", "bbprc", "prc")
+CATEGORY_KEYS = ("dispCtgrNm", "ctgrNm", "lctgrNm", "mctgrNm", "sctgrNm", "sectNm")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    slitm_cd    TEXT PRIMARY KEY,
+    slitm_nm    TEXT,               -- NULL이면 가져오기 실패 (CATALOG_MISS_TTL_HOURS 뒤 재시도)
+    price       INTEGER,
+    category    TEXT,
+    fetched_at  TEXT NOT NULL
+);
+"""
+
+_META_RE = re.compile(r'<meta\s+(?:property|name)="([^"]+)"\s+content="([^"]*)"', re.I)
+_PRICE_TAIL_RE = re.compile(r"\d{1,3}(?:,\d{3})+원.*$", re.S)
+# 상품명 자리에 잘못 잡히는 버튼·안내 문구
+JUNK_NAMES = ("방송중 구매가능", "구매하기", "상담예약", "알림신청", "알리미")
+# 이름 앞뒤에 붙은 문구만 (상품명 가운데의 같은 단어는 그대로 둠)
+_JUNK = "|".join(map(re.escape, JUNK_NAMES))
+_JUNK_RE = re.compile(rf"^(?:\s*(?:{_JUNK}))+|(?:(?:{_JUNK})\s*)+$")
+
+
+def clean_name(name: str) -> str:
+    """카탈로그에 없는 상품의 DOM 상품명에서 붙어 온 가격·버튼 문구를 떼어 냅니다.
+
+    떼어 내고 2자 미만만 남으면(상품명 자리에 버튼 문구만 잡힌 경우) 빈 문자열을 반환합니다.
+    """
+    cleaned = _JUNK_RE.sub("", _PRICE_TAIL_RE.sub("", name)).strip()
+    return cleaned if len(cleaned) >= 2 else ""
+
+
+def _parse_price(value):
+    digits = re.sub(r"\D", "", str(value))
+    return int(digits) if digits else None
+
+
+def _find_product(node, code: str):
+    """__NEXT_DATA__에서 상품코드가 code이고 상품명이 있는 객체를 찾습니다."""
+    if isinstance(node, list):
+        for child in node:
+            found = _find_product(child, code)
+            if found is not None:
+                return found
+    elif isinstance(node, dict):
+        if str(_first(node, CODE_KEYS) or "").strip() == code and _first(node, NAME_KEYS) is not None:
+            return node
+        for child in node.values():
+            if isinstance(child, (dict, list)):
+                found = _find_product(child, code)
+                if found is not None:
+                    return found
+    return None
+
+
+def _find_key(node, keys):
+    """payload 전체에서 keys 중 처음 나오는 값 (카테고리가 상품 객체 밖 breadcrumb에 있는 경우)"""
+    if isinstance(node, dict):
+        value = _first(node, keys)
+        if value is not None and not isinstance(value, (dict, list)):
+            return value
+        node = list(node.values())
+    if isinstance(node, list):
+        for child in node:
+            if isinstance(child, (dict, list)):
+                value = _find_key(child, keys)
+                if value is not None:
+                    return value
+    return None
+
+
+def parse_product_page(html: str, code: str):
+    """상품 상세 HTML에서 {"name", "price", "category"}를 꺼냅니다. 상품명이 없으면 None.
+
+    __NEXT_DATA__의 상품 객체를 먼저 보고, 없으면 og:title / product:price:amount 메타 태그를 씁니다.
+    """
+    data = extract_next_data(html)
+    product = _find_product(data, code) if data is not None else None
+    if product is not None:
+        price = _first(product, PRICE_KEYS)
+        category = _first(product, CATEGORY_KEYS) or _find_key(data, CATEGORY_KEYS)
+        return {
+            "name": str(_first(product, NAME_KEYS)).strip(),
+            "price": _parse_price(price) if price is not None else None,
+            "category": str(category).strip() if category is not None else None,
+        }
+
+    meta = {key.lower(): value.strip() for key, value in _META_RE.findall(html)}
+    name = meta.get("og:title", "").split("|")[0].strip()
+    if len(name) < 2:
+        return None
+    price = meta.get("product:price:amount")
+    return {"name": name, "price": _parse_price(price) if price else None, "category": None}
+
+
+class ProductCatalog:
+    """상품코드 → 정식 상품 정보 캐시 (카탈로그 DB의 products 테이블)"""
+
+    def __init__(self, path: str = CATALOG_DB, base_url: str = BASE_URL, metrics=None,
+                 ttl_days: float = CATALOG_TTL_DAYS, concurrency: int = CATALOG_CONCURRENCY):
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+        self.base_url = base_url
+        self.metrics = metrics
+        self.ttl_days = ttl_days
+        self.concurrency = concurrency
+        self.stats = {"joined": 0, "fetched": 0, "missed": 0}
+        self._client = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self.conn.close()
+
+    def get(self, code: str):
+        row = self.conn.execute("SELECT * FROM products WHERE slitm_cd = ?", (code,)).fetchone()
+        return dict(row) if row else None
+
+    def known_codes(self) -> frozenset:
+        """정식 상품명이 있는 상품코드 (페이지에서 상품명 추출을 건너뛸 수 있는 상품)"""
+        return frozenset(r[0] for r in self.conn.execute("SELECT slitm_cd FROM products WHERE slitm_nm IS NOT NULL"))
+
+    def names(self, codes) -> dict:
+        """{ 상품코드: 정식 상품명 } — 기한이 지난 항목도 포함 (다시 가져오기에 실패해도 쓸 수 있게)"""
+        codes = list(codes)
+        found = {}
+        for i in range(0, len(codes), 500):
+            chunk = codes[i:i + 500]
+            found.update(self.conn.execute(
+                f"SELECT slitm_cd, slitm_nm FROM products WHERE slitm_nm IS NOT NULL "
+                f"AND slitm_cd IN ({','.join('?' * len(chunk))})", chunk).fetchall())
+        return found
+
+    def stale(self, codes, now: datetime.datetime = None) -> list:
+        """카탈로그에 없거나 기한(성공 CATALOG_TTL_DAYS, 실패 CATALOG_MISS_TTL_HOURS)이 지난 상품코드"""
+        now = now or datetime.datetime.now()
+        fresh_after = (now - datetime.timedelta(days=self.ttl_days)).strftime("%Y-%m-%d %H:%M:%S")
+        retry_after = (now - datetime.timedelta(hours=CATALOG_MISS_TTL_HOURS)).strftime("%Y-%m-%d %H:%M:%S")
+        codes = list(dict.fromkeys(codes))
+        fresh = set()
+        for i in range(0, len(codes), 500):
+            chunk = codes[i:i + 500]
+            fresh.update(r[0] for r in self.conn.execute(
+                f"""SELECT slitm_cd FROM products WHERE slitm_cd IN ({','.join('?' * len(chunk))})
+                    AND fetched_at > CASE WHEN slitm_nm IS NULL THEN ? ELSE ? END""",
+                [*chunk, retry_after, fresh_after]))
+        return [code for code in codes if code not in fresh]
+
+    def store(self, records: dict, now: datetime.datetime = None):
+        """{ 상품코드: {"name", "price", "category"} 또는 None(실패) }를 기록합니다.
+
+        실패한 상품은 이전에 가져온 정보를 지우지 않고 가져온 시각만 갱신합니다.
+        """
+        stamp = (now or datetime.datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+        with self.conn:
+            self.conn.executemany(
+                """INSERT INTO products (slitm_cd, slitm_nm, price, category, fetched_at)
+                   VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT (slitm_cd) DO UPDATE SET
+                       slitm_nm = COALESCE(excluded.slitm_nm, slitm_nm),
+                       price = CASE WHEN excluded.slitm_nm IS NULL THEN price ELSE excluded.price END,
+                       category = CASE WHEN excluded.slitm_nm IS NULL THEN category ELSE excluded.category END,
+                       fetched_at = excluded.fetched_at""",
+                [
+                    (code, r["name"] if r else None, r["price"] if r else None, r["category"] if r else None, stamp)
+                    for code, r in records.items()
+                ],
+            )
+
+    async def fetch(self, codes: list) -> dict:
+        """상품 페이지를 최대 concurrency개씩 동시에 가져와 { 상품코드: 정보 또는 None }을 반환합니다."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"User-Agent": USER_AGENT, "Accept-Language": "ko-KR,ko;q=0.9"},
+                timeout=REQUEST_TIMEOUT,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+            )
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch_one(code):
+            async with semaphore:
+                started = asyncio.get_running_loop().time()
+                try:
+                    resp = await self._client.get(PRODUCT_PATH, params={"slitmCd": code})
+                    resp.raise_for_status()
+                    record = parse_product_page(resp.text, code)
+                except httpx.HTTPError:
+                    record = None
+                if self.metrics is not None:
+                    self.metrics.record_api("product_page", asyncio.get_running_loop().time() - started,
+                                            record is not None)
+                return code, record
+
+        return dict(await asyncio.gather(*(fetch_one(code) for code in codes)))
+
+    async def refresh(self, codes) -> dict:
+        """없거나 기한이 지난 상품만 가져와 저장하고, 가져온 결과를 반환합니다."""
+        stale = self.stale(codes)
+        if not stale:
+            return {}
+        records = await self.fetch(stale)
+        self.store(records)
+        self.stats["fetched"] += sum(1 for r in records.values() if r is not None)
+        self.stats["missed"] += sum(1 for r in records.values() if r is None)
+        return records
+
+    async def join(self, results: list) -> list:
+        """수집 결과의 상품명을 카탈로그의 정식 상품명으로 바꾼 새 리스트를 반환합니다.
+
+        카탈로그에 없는 상품은 먼저 가져오고, 그래도 없으면 DOM 상품명을 clean_name으로 다듬습니다
+        (버튼 문구뿐이던 상품명은 빈 문자열로 남음).
+        """
+        codes = [item["상품코드"] for item in results]
+        await self.refresh(codes)
+        names = self.names(set(codes))
+        joined = []
+        for item in results:
+            name = names.get(item["상품코드"])
+            if name is not None:
+                self.stats["joined"] += 1
+            joined.append({**item, "상품명": name if name is not None else clean_name(item["상품명"])})
+        return joined
+
+    async def joined(self, source):
+        """항목 배치를 카탈로그와 조인하며 그대로 흘려보냅니다 (파이프라인 단계)."""
+        async for batch in source:
+            yield await self.join(batch)
+
+    def report(self):
+        print(f"📚 상품 카탈로그: 정식 상품명 {self.stats['joined']}개 적용, "
+              f"새로 가져옴 {self.stats['fetched']}개, 실패 {self.stats['missed']}개")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="현대홈쇼핑 상품 카탈로그")
+    parser.add_argument("--db", default=CATALOG_DB, help="카탈로그 DB 경로")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_show = sub.add_parser("show", help="저장된 상품 정보")
+    p_show.add_argument("codes", nargs="+")
+
+    p_refresh = sub.add_parser("refresh", help="상품 정보를 지금 다시 가져오기")
+    p_refresh.add_argument("codes", nargs="+")
+
+    args = parser.parse_args(argv)
+
+    async def run():
+        async with ProductCatalog(args.db) as catalog:
+            if args.command == "refresh":
+                catalog.store(await catalog.fetch(args.codes))
+            for code in args.codes:
+                r = catalog.get(code)
+                if r is None:
+                    print(f"{code}  (없음)")
+                else:
+                    price = f"{r['price']:,}원" if r["price"] is not None else "-"
+                    print(f"{code}  {r['slitm_nm'] or '(가져오기 실패)'}  {price}  {r['category'] or '-'}"
+                          f"  ({r['fetched_at']})")
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""중단된 수집 이어 하기 — 작업별 진행 상황을 주기적으로 디스크에 기록합니다.
+
+작업(날짜 탭 × 채널)마다 수집한 항목, 마지막으로 도달한 슬롯(lastDate/lastTime),
+스크롤 횟수와 완료 여부를 CHECKPOINT_FILE에 저장합니다. 다음 실행은 같은 조건
+(run_key)의 체크포인트가 CHECKPOINT_MAX_AGE_MINUTES 안이면 이어서 수집합니다:
+완료된 작업은 건너뛰고, 진행 중이던 작업은 저장된 항목을 유지한 채 계속합니다.
+"""
+import datetime
+import json
+import os
+
+CHECKPOINT_FILE = ".hmall_checkpoint.json"
+CHECKPOINT_MAX_AGE_MINUTES = 120   # 이보다 오래된 체크포인트는 버림 (편성이 바뀌었을 수 있음)
+CHECKPOINT_EVERY = 10              # 스크롤(또는 API 응답) 이 횟수마다 기록
+
+
+def _key(item: dict) -> tuple:
+    return (item["날짜"], item["방송시간"], item["상품코드"])
+
+
+class Checkpoint:
+    """작업별 진행 상황 { job.name: {"done", "items", "state", "scrolls"} }"""
+
+    def __init__(self, run_key: str, path: str = CHECKPOINT_FILE, started_at: str = None, jobs: dict = None):
+        self.run_key = run_key
+        self.path = path
+        self.started_at = started_at or datetime.datetime.now().isoformat(timespec="seconds")
+        self.jobs = jobs or {}
+
+    @classmethod
+    def load(cls, run_key: str, path: str = CHECKPOINT_FILE,
+             max_age_minutes: float = CHECKPOINT_MAX_AGE_MINUTES) -> "Checkpoint":
+        """같은 run_key의 최근 체크포인트를 읽습니다. 없거나 맞지 않으면 빈 체크포인트."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            started = datetime.datetime.fromisoformat(data["started_at"])
+        except (OSError, ValueError, KeyError):
+            return cls(run_key, path)
+        age = (datetime.datetime.now() - started).total_seconds()
+        if data.get("run_key") != run_key or age > max_age_minutes * 60:
+            return cls(run_key, path)
+        return cls(run_key, path, data["started_at"], data.get("jobs", {}))
+
+    @property
+    def resumed(self) -> bool:
+        return bool(self.jobs)
+
+    def is_done(self, name: str) -> bool:
+        return self.jobs.get(name, {}).get("done", False)
+
+    def results(self, name: str) -> dict:
+        """작업의 저장된 항목을 { (날짜, 방송시간, 상품코드): item } 형태로 반환합니다."""
+        return {_key(item): item for item in self.jobs.get(name, {}).get("items", [])}
+
+    def reached(self, name: str):
+        """작업이 마지막으로 도달한 {"lastDate", "lastTime"}. 없으면 None."""
+        return self.jobs.get(name, {}).get("state")
+
+    def update(self, name: str, results: dict, state: dict = None, scrolls: int = None, done: bool = False):
+        """작업 진행 상황을 기록하고 파일에 씁니다. 생략한 state/scrolls는 이전 값을 유지합니다."""
+        previous = self.jobs.get(name, {})
+        self.jobs[name] = {
+            "done": done,
+            "items": list(results.values()),
+            "state": dict(state) if state else previous.get("state"),
+            "scrolls": previous.get("scrolls", 0) if scrolls is None else scrolls,
+        }
+        self.save()
+
+    def save(self):
+        # 쓰는 도중 프로세스가 죽어도 이전 체크포인트가 남도록 임시 파일에 쓴 뒤 교체
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"run_key": self.run_key, "started_at": self.started_at, "jobs": self.jobs},
+                      f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def clear(self):
+        """결과를 저장한 뒤 호출해 체크포인트를 지웁니다."""
+        self.jobs = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
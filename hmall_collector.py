@@ -0,0 +1,137 @@
+"""페이지에 한 번 설치하는 증분 수집기 (MutationObserver)
+
+스크롤마다 전체 컨테이너를 다시 훑는 대신, 새로 추가된 컨테이너만 처리해
+페이지 안에 쌓아 두고 drain 시 마지막 drain 이후의 새 항목만 반환합니다.
+lastDate/lastTime 전파와 (날짜, 시간, 상품코드) 중복 제거도 페이지에서 합니다.
+상품 카탈로그에 정식 상품명이 있는 상품(known)은 상품명 추출을 건너뛰고 빈 이름으로 넘깁니다.
+선택자 프로필(hmall_selectors.py)이 있으면 방송 컨테이너·상품 링크·상품명을 그 선택자로 찾습니다.
+"""
+
+_INSTALL_SCRIPT = """([state, known, selectors]) => {
+    const SELECTOR = selectors.items || '[data-time], ._1jauv3p0';
+    const LINK_SELECTOR = selectors.links || 'a[href*="slitmCd="], [data-slitm-cd], [data-slitm_cd]';
+    const NAME_SELECTOR = selectors.names || null;
+    if (window.__hmallCollector) window.__hmallCollector.observer.disconnect();
+
+    const c = {
+        seen: new Set(),
+        pending: [],
+        known: new Set(known),
+        lastDate: state.lastDate,
+        lastTime: state.lastTime,
+    };
+
+    const processContainer = (container) => {
+        let broadcastTime = container.getAttribute('data-time') || "";
+        if (broadcastTime && broadcastTime.includes(' ')) {
+            broadcastTime = broadcastTime.split(' ')[1];
+        }
+
+        // 시간 정보 추출 시도
+        let currentTime = "";
+        if (!broadcastTime || broadcastTime === "") {
+            let tMatch = container.innerText.match(/(\\d{2}:\\d{2})/);
+            if (tMatch) currentTime = tMatch[1];
+        } else {
+            let startMatch = broadcastTime.match(/(\\d{2}:\\d{2})/);
+            if (startMatch) currentTime = startMatch[1];
+        }
+
+        // 날짜 정보 추출 시도 (예: "오늘", "2월 23일")
+        let currentDate = null;
+        let dMatch = container.innerText.match(/(\\d{1,2}월\\s*\\d{1,2}일)/);
+        if (dMatch) {
+            currentDate = dMatch[1];
+        } else if (container.innerText.includes("내일")) {
+            currentDate = "내일";
+        } else if (container.innerText.includes("오늘")) {
+            currentDate = "오늘";
+        }
+
+        // 정보가 있으면 업데이트, 없으면 유지 (Stateful Propagation)
+        if (currentTime) c.lastTime = currentTime;
+        if (currentDate) c.lastDate = currentDate;
+
+        // 해당 컨테이너 내의 모든 상품 코드 링크 탐색
+        container.querySelectorAll(LINK_SELECTOR).forEach(l => {
+            let code = l.getAttribute('data-slitm-cd') || l.getAttribute('data-slitm_cd');
+            if (!code) {
+                let match = l.href ? l.href.match(/slitmCd=(\\d+)/) : null;
+                if (match) code = match[1];
+            }
+            if (!code) return;
+
+            const key = c.lastDate + '|' + c.lastTime + '|' + code;
+            if (c.seen.has(key)) return;
+            if (c.known.has(code)) {
+                c.seen.add(key);
+                c.pending.push({ time: c.lastTime, code, name: "", itemDate: c.lastDate });
+                return;
+            }
+
+            // 프로필의 상품명 요소가 있으면 레이아웃 계산 없이 textContent로 읽음
+            const profiled = NAME_SELECTOR ? l.querySelector(NAME_SELECTOR) : null;
+            let name = profiled ? profiled.textContent.trim() : "";
+            if (name.length < 2) name = l.innerText.trim().split('\\n')[0].replace(/\\d+%.*/, '').trim();
+            if (name.length < 2) {
+                let nameEl = container.querySelector('[aria-label="제품명"], .pdname, .h84bfs5 span');
+                if (nameEl) name = nameEl.innerText.trim().split('\\n')[0].trim();
+            }
+
+            if (name.length >= 2) {
+                c.seen.add(key);
+                c.pending.push({ time: c.lastTime, code, name, itemDate: c.lastDate });
+            }
+        });
+    };
+
+    // 상태 전파가 화면 순서를 따르도록 문서 순서로 정렬 후 처리
+    const processAll = (containers) => {
+        containers.sort((a, b) =>
+            (a.compareDocumentPosition(b) & Node.DOCUMENT_POSITION_FOLLOWING) ? -1 : 1);
+        containers.forEach(processContainer);
+    };
+
+    c.observer = new MutationObserver(mutations => {
+        const found = new Set();
+        for (const m of mutations) {
+            for (const n of m.addedNodes) {
+                if (n.nodeType !== 1) continue;
+                if (n.matches(SELECTOR)) found.add(n);
+                n.querySelectorAll(SELECTOR).forEach(x => found.add(x));
+                // 기존 컨테이너 안에 상품이 추가된 경우 (상품 더보기 등)
+                const owner = n.parentElement && n.parentElement.closest(SELECTOR);
+                if (owner) found.add(owner);
+            }
+        }
+        if (found.size) processAll(Array.from(found));
+    });
+    c.observer.observe(document.body, { childList: true, subtree: true });
+
+    c.drain = () => {
+        const items = c.pending;
+        c.pending = [];
+        return { items, lastDate: c.lastDate, lastTime: c.lastTime };
+    };
+
+    window.__hmallCollector = c;
+    processAll(Array.from(document.querySelectorAll(SELECTOR)));
+}"""
+
+_DRAIN_SCRIPT = """() => window.__hmallCollector
+    ? window.__hmallCollector.drain()
+    : { items: [], lastDate: null, lastTime: null }"""
+
+
+async def install_collector(page, state: dict, known_codes=frozenset(), selectors: dict = None):
+    """수집기를 설치하고 현재 화면의 항목을 첫 배치로 쌓습니다. 필터 전환 후 다시 호출하세요.
+
+    known_codes의 상품은 상품명을 추출하지 않습니다 (카탈로그 조인으로 채움).
+    selectors는 선택자 프로필의 {"items", "links", "names"} (없는 키는 기본 선택자).
+    """
+    await page.evaluate(_INSTALL_SCRIPT, [state, list(known_codes), selectors or {}])
+
+
+async def drain_collector(page) -> dict:
+    """마지막 drain 이후 새로 발견된 항목과 현재 lastDate/lastTime을 반환합니다."""
+    return await page.evaluate(_DRAIN_SCRIPT)
@@ -1,346 +1,910 @@
+import argparse
 import asyncio
-import csv
 import datetime
 import os
+import sys
 import json
-import gspread
+import time
 from google.oauth2.service_account import Credentials
-import re
 from playwright.async_api import async_playwright
 
+from hmall_api import ScheduleResponseCollector
+from hmall_archive import SnapshotArchive
+from hmall_blocking import ResourceBlocker
+from hmall_checkpoint import CHECKPOINT_EVERY, Checkpoint
+from hmall_browser import BrowserSession
+from hmall_catalog import ProductCatalog
+from hmall_fastpath import crawl_hmall_fast
+from hmall_fingerprint import (FingerprintStore, ResultsHasher, http_fingerprint, results_fingerprint,
+                               window_fingerprint)
+from hmall_history import HistoryStore
+from hmall_jobs import CrawlJob, build_jobs, stream_jobs
+from hmall_metrics import RunMetrics, metrics_of
+from hmall_normalize import RawBatch, RecordNormalizer
+from hmall_pipeline import BufferedSink, CsvSink, HistorySink, JsonlSink, run_pipeline, stdout_reserved
+from hmall_selectors import SELECTOR_PROFILE_FILE
+from hmall_sheets import SCOPES as SHEETS_SCOPES
+from hmall_sheets import SheetsClient, load_cached_grids, save_cached_grids
+from hmall_sites import HmallAdapter, SiteAdapter
+from hmall_tiers import choose_tier, horizon_dates, merge_hot, past_horizon, slot_datetime
+from hmall_waits import AdaptiveWaiter
+
 # ───────────────────────────────────────────────────
 # 설정 영역 (Google Sheets 정보 입력)
 # ───────────────────────────────────────────────────
 SPREADSHEET_ID = "1NEsimkXycdXQCz4g0cr31j93MGI7HKNDeoiJO4HjgOw"  # 시트 URL의 /d/와 /edit 사이 값
 SHEET_NAME = "크롤링"              # 데이터를 저장할 시트 탭 이름
 SERVICE_ACCOUNT_FILE = "service_account.json"  # 서비스 계정 JSON 파일 경로
+GSHEET_SYNC_MODE = "diff"          # "diff" = 바뀐 셀만 갱신, "full" = 전체 삭제 후 재작성
+GSHEET_USE_CACHE = False           # True면 시트를 다시 읽지 않고 마지막 업로드 캐시와 비교
+GSHEET_DAY_TABS = False            # True면 날짜별 탭("크롤링 10.18")에도 같은 요청 묶음으로 함께 기록
+
+SCHEDULE_URL = "https://www.hmall.com/md/dpl/index?mainDispSeq=2&brodType=all"
+
+# 수집 방식: "xhr" = 편성표 API 응답 가로채기 (실패 시 DOM으로 전환), "dom" = DOM 스크롤 수집
+CRAWL_MODE = "xhr"
+XHR_RESPONSE_TIMEOUT = 5   # 스크롤 후 다음 API 응답을 기다리는 최대 시간(초)
+XHR_IDLE_LIMIT = 3         # 연속으로 응답이 없으면 종료하는 횟수
+USE_FAST_PATH = True       # 브라우저 없이 HTML(__NEXT_DATA__)에서 먼저 수집 시도
+CHANGE_DETECTION = True    # 편성표 지문이 지난 실행과 같으면 수집·저장 생략 (hmall_fingerprint.py 참고)
+
+# 대기 상한(초) — 실제 신호(DOM 변경/네트워크 유휴/새 항목)가 오면 즉시 진행
+WAIT_LOAD_MAX = 10         # 페이지 로드 후 첫 항목 렌더링
+WAIT_TAB_MAX = 4           # 날짜 탭 클릭 후
+WAIT_FILTER_MAX = 5        # 'TV쇼핑' 필터 클릭 후
+WAIT_SCROLL_MAX = 3        # 스크롤 1회 후
+WAIT_MORE_MAX = 2          # '상품 더보기' 클릭 후
+STAGNANT_LIMIT = 3         # 목록 변화 없는 스크롤이 연속 이 횟수면 종료
+
+# 수집 계층 (hmall_tiers.py 참고): "hot" = 가까운 시간대만, "full" = 7일 전체,
+# "auto" = 마지막 전체 수집 후 FULL_SWEEP_MINUTES가 지났으면 full, 아니면 hot
+CRAWL_TIER = "auto"
+HOT_WINDOW_HOURS = 6       # hot 수집은 지금부터 이 시간 뒤 방송까지만 스크롤
+FULL_SWEEP_MINUTES = 720   # 전체 수집 주기
+
+# 체크포인트 (hmall_checkpoint.py 참고): 중단된 실행을 다음 실행에서 이어 수집
+CHECKPOINT_ENABLED = True
+RESUME_SCROLL_STEP = 3000  # 이어 하기 시 지난번 도달 지점까지는 이 간격(px)으로 빠르게 스크롤
+
+# 상품 카탈로그 (hmall_catalog.py 참고): 상품코드별 정식 상품명·가격·카테고리를 한 번만
+# 가져와 캐시하고, 수집 결과의 상품명을 카탈로그 값으로 채움
+PRODUCT_CATALOG = True
+
+# 선택자 프로필 (hmall_selectors.py 참고): 탭·목록·상품 링크 선택자를 한 번 보정해 저장하고
+# 실행마다 가볍게 검사해 맞지 않을 때만 다시 보정 (None이면 매번 버튼 전체를 훑음)
+SELECTOR_PROFILE = SELECTOR_PROFILE_FILE
+
+# 원본 보관 (hmall_archive.py 참고): 목록 HTML·API 응답을 청크 단위로 중복 제거·압축해 보관하고
+# 추출 규칙을 고치면 `python hmall_archive.py reparse <실행 번호>`로 다시 수집 없이 결과를 다시 만듦
+ARCHIVE_SNAPSHOTS = True
+ARCHIVE_SNAPSHOT_EVERY = 10   # DOM 스크롤 수집에서 목록 HTML을 보관하는 스크롤 간격 (정체·마지막 화면은 항상 보관)
+                              # 다시 추출에 필요한 새 항목(수집기 델타)은 스크롤마다 보관
+ARCHIVE_KEEP_DAYS = 30     # 이보다 오래된 실행의 원본은 삭제
+
+BLOCK_RESOURCES = True     # 이미지·폰트·동영상·추적 스크립트 요청 차단 (hmall_blocking.py 참고)
+# 데몬 모드의 요청 차단: context.route를 걸면 Chromium이 그 컨텍스트의 HTTP 캐시를 쓰지 않아
+# 영구 프로필에 쌓아 둔 JS·CSS 캐시가 무효가 됨. 캐시 재사용이 차단보다 이득이라 기본은 끔
+DAEMON_BLOCK_RESOURCES = False
+
+# 동시 수집: (날짜 탭 × 채널 필터) 작업을 페이지 풀에서 병렬 실행
+CRAWL_ALL_TABS = True      # False면 '오늘' 탭 하나에서 무한 스크롤로 전체 수집
+CHANNELS = ["TV쇼핑"]       # 적용할 채널 필터 버튼 텍스트
+PAGE_POOL_SIZE = 3         # 동시에 여는 페이지 수
+JOB_TIMEOUT = 300          # 작업당 최대 시간(초)
+JOB_RETRIES = 1            # 실패한 작업 재시도 횟수
+
+# 실행 계측 (hmall_metrics.py 참고): 단계별 시간·API 지연·브라우저 메모리
+METRICS_FILE = "hmall_metrics.json"   # 실행마다 덮어쓰는 JSON 리포트 (None이면 기록 안 함)
+PROMETHEUS_FILE = None                 # 예: "/var/lib/node_exporter/textfile/hmall.prom"
+
+# 데몬 모드 (--daemon): 브라우저를 유지한 채 반복 실행 (재시작 기준은 hmall_browser.py)
+DAEMON_INTERVAL_MINUTES = 90
+DAEMON_ACTIVE_HOURS = (9, 21)   # 실행 시간대 [시작, 끝) — 로컬 시각 기준
+DAEMON_WEEKDAYS_ONLY = True
 # ───────────────────────────────────────────────────
 
 
-def get_gspread_client():
-    """Google Sheets 클라이언트를 반환합니다."""
+_credentials = None   # 서비스 계정 자격 증명 (토큰과 함께 데몬 실행 사이에도 재사용)
+
+
+def get_credentials():
+    """Google 서비스 계정 자격 증명을 반환합니다 (한 번만 읽고, 토큰 갱신은 SheetsClient가 함)."""
+    global _credentials
+    if _credentials is not None:
+        return _credentials
+
     # GitHub Actions에서는 GOOGLE_CREDENTIALS 환경 변수에서 읽음
     creds_json = os.environ.get("GOOGLE_CREDENTIALS")
-    
+
     if creds_json:
         creds_dict = json.loads(creds_json)
-        creds = Credentials.from_service_account_info(
-            creds_dict,
-            scopes=[
-                "https://spreadsheets.google.com/feeds",
-                "https://www.googleapis.com/auth/spreadsheets",
-            ]
-        )
+        _credentials = Credentials.from_service_account_info(creds_dict, scopes=SHEETS_SCOPES)
     elif os.path.exists(SERVICE_ACCOUNT_FILE):
-        creds = Credentials.from_service_account_file(
-            SERVICE_ACCOUNT_FILE,
-            scopes=[
-                "https://spreadsheets.google.com/feeds",
-                "https://www.googleapis.com/auth/spreadsheets",
-            ]
-        )
+        _credentials = Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE, scopes=SHEETS_SCOPES)
     else:
         raise FileNotFoundError(
             f"서비스 계정 파일({SERVICE_ACCOUNT_FILE})이 없고,\n"
             "GOOGLE_CREDENTIALS 환경 변수도 설정되지 않았습니다.\n"
             "로컬 실행 시 service_account.json 파일을 이 스크립트와 같은 폴더에 놓아주세요."
         )
-    
-    return gspread.authorize(creds)
+    return _credentials
 
 
-def save_to_gsheet(results: list):
-    """수집한 데이터를 Google Sheets에 저장합니다."""
-    print("📊 Google Sheets 연결 중...")
-    client = get_gspread_client()
-    spreadsheet = client.open_by_key(SPREADSHEET_ID)
-
-    try:
-        worksheet = spreadsheet.worksheet(SHEET_NAME)
-    except gspread.exceptions.WorksheetNotFound:
-        worksheet = spreadsheet.add_worksheet(title=SHEET_NAME, rows=5000, cols=10)
-
-    # 기존 데이터 전체 삭제 후 새로 씀 (항상 최신 상태 유지)
-    worksheet.clear()
-
+def _sheet_grids(results: list) -> dict:
+    """{ 탭 이름: 격자 } — SHEET_NAME 탭 전체와 (GSHEET_DAY_TABS면) 날짜별 탭"""
     updated_at = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
     header = ["날짜", "방송시간", "상품코드", "상품명", f"업데이트: {updated_at}"]
-    rows = [header]
+    rows = [[item["날짜"], item["방송시간"], item["상품코드"], item["상품명"]] for item in results]
 
-    for item in results:
-        rows.append([
-            item["날짜"],
-            item["방송시간"],
-            item["상품코드"],
-            item["상품명"],
-        ])
+    grids = {SHEET_NAME: [header] + rows}
+    if GSHEET_DAY_TABS:
+        for row in rows:
+            grids.setdefault(f"{SHEET_NAME} {row[0]}", [header]).append(row)
+    return grids
 
-    # 한 번에 업로드 (속도 최적화)
-    worksheet.update(rows, "A1")
 
-    print(f"✅ Google Sheets 저장 완료 — {len(results)}개 항목 (탭: {SHEET_NAME})")
-
-
-async def crawl_hmall() -> list:
-    """현대홈쇼핑 방송편성표를 크롤링하여 결과 리스트를 반환합니다."""
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(
-            user_agent=(
-                "Mozilla/5.0 (iPhone; CPU iPhone OS 16_6 like Mac OS X) "
-                "AppleWebKit/605.1.15 (KHTML, like Gecko) "
-                "Version/16.6 Mobile/15E148 Safari/604.1"
-            ),
-            viewport={"width": 390, "height": 844},
-            is_mobile=True,
+async def _prepare_gsheet():
+    """인증·비교용 기존 격자 읽기 (스트리밍 수집 중 미리 실행). (client, old_grids)를 반환합니다."""
+    print("📊 Google Sheets 연결 중...")
+    client = SheetsClient(get_credentials(), SPREADSHEET_ID)
+    try:
+        old_grids = None
+        if GSHEET_SYNC_MODE == "diff":
+            old_grids = load_cached_grids() if GSHEET_USE_CACHE else {}
+            if SHEET_NAME not in old_grids:
+                old_grids.update(await client.get_values([SHEET_NAME]))
+    except BaseException:
+        await client.aclose()
+        raise
+    return client, old_grids
+
+
+async def save_to_gsheet(results: list, client: SheetsClient = None, old_grids: dict = None):
+    """수집한 데이터를 Google Sheets에 저장합니다.
+
+    client/old_grids를 넘기면(_prepare_gsheet) 연결과 기존 시트 읽기를 생략합니다.
+    client는 저장 후 닫습니다.
+    """
+    if client is None:
+        print("📊 Google Sheets 연결 중...")
+        client = SheetsClient(get_credentials(), SPREADSHEET_ID)
+
+    grids = _sheet_grids(results)
+    try:
+        # diff: 바뀐 셀만 갱신 (시트가 비는 순간 없음), full: 탭을 비운 뒤 전체를 다시 씀
+        stats = await client.sync(grids, GSHEET_SYNC_MODE, old_grids)
+    finally:
+        await client.aclose()
+    save_cached_grids(grids)
+
+    if GSHEET_SYNC_MODE == "diff":
+        inserted, removed, changed, ranges, cells = (
+            sum(s[key] for s in stats.values()) for key in ("inserted", "removed", "changed", "ranges", "cells"))
+        print(
+            f"   추가 {inserted} · 삭제 {removed} · 변경 {changed}행 "
+            f"→ {ranges}개 범위, {cells}셀 기록"
         )
-        page = await context.new_page()
-
-        # stealth 적용 (봇 감지 우회)
+    retried = f", 재시도 {client.retries}회" if client.retries else ""
+    print(f"✅ Google Sheets 저장 완료 — {len(results)}개 항목 (탭 {len(grids)}개, "
+          f"API 요청 {client.requests}회{retried})")
+
+
+async def _collect_by_scrolling(page, waiter: AdaptiveWaiter, adapter: SiteAdapter, clean_date: str,
+                                stop_dates=frozenset(),
+                                stats: dict = None, horizon: datetime.datetime = None,
+                                reached: dict = None, progress=None, emit=None,
+                                known_codes: frozenset = frozenset(), snapshot=None, label: str = None) -> dict:
+    """DOM을 스크롤하며 보이는 상품을 어댑터의 페이지 내 수집기로 증분 수집합니다 (Virtuoso 대응).
+
+    stop_dates의 날짜(다른 작업이 맡은 날짜)에 도달하거나, horizon(hot 수집 범위)을
+    넘은 방송이 나오면 스크롤을 멈춥니다. reached(체크포인트의 마지막 도달 슬롯)까지는
+    RESUME_SCROLL_STEP 간격으로 빠르게 스크롤하고, progress(결과, 상태, 스크롤 횟수)는
+    CHECKPOINT_EVERY회마다 호출됩니다. emit(새 항목 리스트)은 스크롤마다 await됩니다.
+    known_codes(카탈로그에 있는 상품)는 상품명을 추출하지 않고 빈 이름으로 둡니다.
+    snapshot(kind, data)을 넘기면 원본 보관용으로 수집기가 넘긴 새 항목(델타) JSON을 매번("items"),
+    렌더링된 목록 컨테이너의 HTML을 ARCHIVE_SNAPSHOT_EVERY회 스크롤마다와 목록이 멈췄을 때·
+    마지막 수집 때("html") 넘겨줍니다.
+    label(작업 이름, 기본: clean_date)은 스크롤 계측에 붙는 이름입니다.
+    """
+    # 상태 유지 변수 (루프 외부에서 관리)
+    day_results = {} # { (date, time, code): item_dict }
+    current_state = {"lastDate": "오늘", "lastTime": "시간정보없음"}
+    normalizer = RecordNormalizer(resolve=adapter.normalize_date)   # 날짜 조회 표는 작업 시작 시각 기준
+
+    scroll_count = 0
+    stagnant_count = 0
+    metrics = metrics_of(stats)
+    reached_at = slot_datetime(reached["lastDate"], reached["lastTime"], datetime.datetime.now()) if reached else None
+
+    async def drain(final: bool = False):
+        """수집기에서 델타를 가져와 병합하고 추출 시간·전송 크기·새 항목 수를 기록합니다."""
+        started = time.perf_counter()
+        eval_result = await adapter.drain_collector(page)
+        seconds = time.perf_counter() - started
+        payload = json.dumps(eval_result, ensure_ascii=False).encode("utf-8")
+        metrics.add_phase("extract", seconds)
+        metrics.record_scroll(label or clean_date, seconds, len(payload), await merge(eval_result))
+        if snapshot is None:
+            return
+        with metrics.phase("archive"):
+            # 목록은 화면 구간만 그려지므로 다시 추출은 스크롤마다의 델타로 (이미 받은 JSON이라 추가 전송 없음)
+            if eval_result["items"]:
+                snapshot("items", payload)
+            # outerHTML 전체는 전송 비용이 커서 간격·정체·마지막에만 (추출 규칙 점검용)
+            if final or stagnant_count or scroll_count % ARCHIVE_SNAPSHOT_EVERY == 0:
+                snapshot("html", await page.evaluate(
+                    "(selector) => (document.querySelector(selector) || document.body).outerHTML",
+                    adapter.list_selector))
+
+    async def merge(eval_result) -> int:
+        """페이지 수집기가 넘긴 새 항목(델타)을 배치로 정규화해 저장하고 emit합니다 (중복 자동 제거)."""
+        if eval_result["lastDate"] is not None:
+            current_state["lastDate"] = eval_result["lastDate"]
+            current_state["lastTime"] = eval_result["lastTime"]
+        new_items = normalizer.add(RawBatch.from_items(eval_result["items"]), clean_date)
+        for item in new_items:
+            day_results[(item["날짜"], item["방송시간"], item["상품코드"])] = item
+        if emit is not None and new_items:
+            await emit(new_items)
+        return len(new_items)
+
+    # 페이지에 증분 수집기 설치 (현재 화면 항목이 첫 배치)
+    await adapter.install_collector(page, current_state, known_codes)
+
+    while scroll_count < 200: # 충분히 늘려 편성표 전체(7일치) 수집 보장
+        # 지난 스크롤 이후 새로 나타난 상품만 가져옴
+        await drain()
+        now = datetime.datetime.now()
+        last_date = normalizer.date(current_state["lastDate"], clean_date)
+        if last_date in stop_dates:
+            break
+        if horizon is not None and past_horizon(last_date, current_state["lastTime"], horizon, now):
+            break
+        if progress is not None and scroll_count and scroll_count % CHECKPOINT_EVERY == 0:
+            progress(day_results, {"lastDate": last_date, "lastTime": current_state["lastTime"]}, scroll_count)
+
+        # 이어 하기: 지난번 도달 지점 전까지는 큰 간격으로 스크롤 (이미 수집한 구간)
+        step = 1000
+        if reached_at is not None:
+            slot = slot_datetime(last_date, current_state["lastTime"], now)
+            if slot is None or slot < reached_at:
+                step = RESUME_SCROLL_STEP
+            else:
+                reached_at = None
+
+        # 스크롤 다운
+        scroll_count += 1
+        previous_height = await page.evaluate("document.body.scrollHeight")
+        await waiter.arm()
+        await page.evaluate("(step) => window.scrollBy(0, step)", step)
+        with metrics.phase("scroll_wait"):
+            signal = await waiter.wait_for_change(WAIT_SCROLL_MAX)
+
+        # "상품 더보기" 버튼 클릭 (있을 경우)
+        expanded = False
         try:
-            from playwright_stealth import Stealth
-            await Stealth().apply_stealth_async(page)
-        except Exception:
+            with metrics.phase("more_button"):
+                more_button = page.locator(adapter.more_selector).first if adapter.more_selector else None
+                if more_button is not None and await more_button.is_visible():
+                    await waiter.arm()
+                    await more_button.click()
+                    await waiter.wait_for_change(WAIT_MORE_MAX)
+                    expanded = True
+                    stagnant_count = 0
+        except:
             pass
 
-        url = "https://www.hmall.com/md/dpl/index?mainDispSeq=2&brodType=all"
-        print(f"[{datetime.datetime.now().strftime('%H:%M:%S')}] 접속 중: {url}")
+        new_height = await page.evaluate("document.body.scrollHeight")
 
-        try:
-            await page.goto(url, wait_until="load", timeout=120000)
-            await asyncio.sleep(10)
-        except Exception as e:
-            print(f"❌ 접속 실패: {e}")
-            await browser.close()
-            return []
-
-        # ── 날짜 탭 목록 수집 ────────────────────────────
-        tab_info = await page.evaluate("""() => {
-            let btns = Array.from(document.querySelectorAll('button'));
-            return btns
-                .filter(b => (b.innerText.includes('오늘') || /\\d+/.test(b.innerText)) && b.innerText.length < 15)
-                .map(b => b.innerText.trim());
-        }""")
-
-        print(f"📅 발견된 날짜 탭: {len(tab_info)}개")
-
-        # 오늘(또는 첫 번째)부터 시작
-        start_idx = next((i for i, t in enumerate(tab_info) if "오늘" in t), 0)
-        print(f"'{tab_info[start_idx]}'부터 수집 시작")
-
-        results = []
+        if new_height == previous_height and signal == "timeout":
+            stagnant_count += 1
+        else:
+            stagnant_count = 0
 
-        for i in range(start_idx, start_idx + 1):  # '오늘' 탭에서 시작하여 무한 스크롤로 전체 수집
-            current_day_text = tab_info[i]
-            clean_date = current_day_text.replace("\n", " ").strip()
-            print(f"\n  📆 {clean_date} 수집 중...")
+        if scroll_count % 10 == 0:
+            print(f"    ... 스크롤 중 ({scroll_count}회, 현재 {len(day_results)}개 발견)", end='\r')
+
+        # 더 이상 로딩되지 않으면 종료 (연속으로 높이·목록 변화 없음)
+        if stagnant_count >= STAGNANT_LIMIT and not expanded:
+            break
+
+    # 마지막 스크롤에서 추가된 항목
+    await drain(final=True)
+    if stats is not None:
+        stats["scrolls"] = stats.get("scrolls", 0) + scroll_count
+    return day_results
+
+
+async def _collect_by_responses(page, adapter: SiteAdapter, collector: ScheduleResponseCollector,
+                                stop_dates=frozenset(),
+                                stats: dict = None, horizon: datetime.datetime = None, progress=None,
+                                emit=None, label: str = "xhr") -> dict:
+    """편성표 API 응답만으로 수집합니다. 스크롤은 다음 페이지 요청을 유발하는 용도입니다.
+
+    API가 다음 페이지가 없다고 응답하거나, 연속으로 응답이 오지 않거나,
+    stop_dates의 날짜 또는 horizon(hot 수집 범위)을 넘은 방송이 나오면 종료합니다.
+    emit(새 항목 리스트)은 응답이 올 때마다 await됩니다. label(작업 이름)은 스크롤 계측에 붙는 이름입니다.
+    """
+    emitted = 0
+    metrics = metrics_of(stats)
+
+    async def flush():
+        nonlocal emitted
+        items = list(collector.results.values())
+        if emit is not None and len(items) > emitted:
+            await emit(items[emitted:])
+        emitted = len(items)
+
+    def reached_horizon() -> bool:
+        now = datetime.datetime.now()
+        return any(past_horizon(date, time, horizon, now) for date, time, _ in collector.results)
+
+    # 필터 적용 직후의 첫 응답 대기
+    if not collector.responses:
+        await collector.wait_next(XHR_RESPONSE_TIMEOUT)
+
+    scroll_count = 0
+    idle_count = 0
+    while scroll_count < 200 and collector.has_more is not False:
+        before_bytes, before_items = collector.payload_bytes, len(collector.results)
+        if collector.dates & stop_dates:
+            break
+        if horizon is not None and reached_horizon():
+            break
+        scroll_count += 1
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        try:
+            with metrics.phase("more_button"):
+                more_button = page.locator(adapter.more_selector).first if adapter.more_selector else None
+                if more_button is not None and await more_button.is_visible():
+                    await more_button.click()
+        except:
+            pass
 
-            # JavaScript로 탭 클릭 (viewport 바깥 요소도 안전하게 처리)
+        started = time.perf_counter()
+        received = await collector.wait_next(XHR_RESPONSE_TIMEOUT)
+        metrics.add_phase("api_wait", time.perf_counter() - started)
+        metrics.record_scroll(label, time.perf_counter() - started, collector.payload_bytes - before_bytes,
+                              len(collector.results) - before_items)
+        if received:
+            idle_count = 0
+            await flush()
+        else:
+            idle_count += 1
+            if idle_count >= XHR_IDLE_LIMIT:
+                break
+
+        if progress is not None and scroll_count % CHECKPOINT_EVERY == 0:
+            progress(collector.results, None, scroll_count)
+        if scroll_count % 10 == 0:
+            print(f"    ... 응답 수신 중 ({collector.responses}건, 현재 {len(collector.results)}개 발견)", end='\r')
+
+    await flush()
+    if stats is not None:
+        stats["scrolls"] = stats.get("scrolls", 0) + scroll_count
+    return dict(collector.results)
+
+
+async def _new_page(context, waiter_stats: dict, adapter: SiteAdapter):
+    """stealth가 적용된 새 페이지와 대기 계층을 만듭니다."""
+    page = await context.new_page()
+    waiter = AdaptiveWaiter(page, adapter.list_selector, waiter_stats, adapter.item_selector)
+
+    # stealth 적용 (봇 감지 우회)
+    try:
+        from playwright_stealth import Stealth
+        await Stealth().apply_stealth_async(page)
+    except Exception:
+        pass
+    return page, waiter
+
+
+async def _goto_schedule(page, waiter: AdaptiveWaiter, url: str, metrics: RunMetrics):
+    with metrics.phase("goto"):
+        await page.goto(url, wait_until="load", timeout=120000)
+    with metrics.phase("wait_first_items"):
+        await waiter.wait_for_items(WAIT_LOAD_MAX)
+
+
+async def _crawl_job(context, job: CrawlJob, adapter: SiteAdapter, mode: str, stats: dict,
+                     horizon: datetime.datetime = None, checkpoint: Checkpoint = None, emit=None,
+                     known_codes: frozenset = frozenset()) -> dict:
+    """새 페이지에서 어댑터로 날짜 탭과 채널 필터를 적용해 한 작업을 수집합니다.
+
+    checkpoint에 완료로 기록된 작업은 페이지를 열지 않고 저장된 결과를 반환하고,
+    진행 중이던 작업은 저장된 항목에 이어서 수집합니다. emit을 넘기면 새 항목을
+    수집하는 즉시 흘려보냅니다 (stream_jobs 참고).
+    """
+    seed, reached, progress = {}, None, None
+    if checkpoint is not None:
+        if checkpoint.is_done(job.name):
+            print(f"  ⏩ [{job.name}] 체크포인트에서 복원")
+            return checkpoint.results(job.name)
+        seed, reached = checkpoint.results(job.name), checkpoint.reached(job.name)
+
+        def progress(results, state, scrolls):
+            checkpoint.update(job.name, {**seed, **results}, state, scrolls)
+
+    if emit is not None and seed:
+        await emit(list(seed.values()))
+
+    metrics = metrics_of(stats)
+    archive = stats.get("archive")
+    page, waiter = await _new_page(context, stats.setdefault("waits", {}), adapter)
+    try:
+        # 편성표 API 응답 가로채기 (페이지 로드 전에 등록, 어댑터가 지원할 때만)
+        collector = adapter.response_collector(job.date) if mode == "xhr" else None
+        if collector is not None:
+            collector.keep_payloads = archive is not None
+            page.on("response", collector.on_response)
+
+        await _goto_schedule(page, waiter, adapter.url, metrics)
+        print(f"\n  📆 {job.name} 수집 중...")
+
+        # 탭 클릭 전에 비워야 탭 클릭으로 받은 첫 페이지 응답이 남음 (탭 대기 중에 도착할 수 있음)
+        if collector is not None:
+            collector.reset()
+        with metrics.phase("tab_click"):
+            await waiter.arm()
+            await adapter.open_tab(page, job.day_label)
+            await waiter.wait_for_change(WAIT_TAB_MAX)
+
+        # ── 채널(예: 'TV쇼핑') 필터 적용 ─────────────────────────
+        # 필터를 누를 때만 필터 전(brodType=all) 응답을 버리고 필터 후 응답만 사용
+        if job.channel:
+            if collector is not None:
+                collector.reset()
             try:
-                button_label = current_day_text.split("\n")[0]
-                await page.evaluate("""(label) => {
-                    let btns = Array.from(document.querySelectorAll('button'));
-                    let target = btns.find(b => b.innerText.includes(label));
-                    if (target) target.click();
-                }""", button_label)
-                await asyncio.sleep(4)
+                with metrics.phase("filter_click"):
+                    await waiter.arm()
+                    await adapter.apply_filter(page, job.channel)
+                    if collector is None:
+                        await waiter.wait_for_change(WAIT_FILTER_MAX)
             except Exception as e:
-                print(f"  ⚠️ 탭 전환 실패: {e}")
-                continue
+                print(f"  ⚠️ [{job.name}] '{job.channel}' 필터 적용 실패: {e}")
+
+        day_results = {}
+        if collector is not None:
+            day_results = await _collect_by_responses(page, adapter, collector, job.later_dates, stats, horizon,
+                                                      progress, emit, job.name)
+            if archive is not None:
+                with metrics.phase("archive"):
+                    for body in collector.payloads:
+                        archive.add(job.name, "json", body, job.date)
+            if not day_results:
+                print(f"  ⚠️ [{job.name}] 편성표 API 응답을 받지 못해 DOM 스크롤 수집으로 전환합니다.")
+
+        if not day_results:
+            # ── 스크롤 및 증분 수집 (Virtuoso 대응) ────────────────────
+            snapshot = None
+            if archive is not None:
+                def snapshot(kind, data):
+                    archive.add(job.name, kind, data, job.date)
+            day_results = await _collect_by_scrolling(page, waiter, adapter, job.date, job.later_dates, stats,
+                                                      horizon, reached, progress, emit, known_codes, snapshot,
+                                                      job.name)
+        if collector is not None:
+            for latency in collector.latencies:
+                metrics.record_api("schedule_api", latency)
+        await metrics.sample_browser(page, job.name)
+        day_results = {**seed, **day_results}
+        if checkpoint is not None:
+            checkpoint.update(job.name, day_results, done=True)
+        return day_results
+    finally:
+        await page.close()
+
+
+async def stream_site(context, blocker, adapter: SiteAdapter, mode: str, stats: dict,
+                      fingerprints: FingerprintStore = None, horizon: datetime.datetime = None,
+                      checkpoint: Checkpoint = None, known_codes: frozenset = frozenset()):
+    """이미 열린 브라우저 컨텍스트에서 어댑터의 편성표를 수집하며 새 항목 배치를 내보냅니다.
+
+    (날짜 탭 × 채널) 작업을 adapter.pool_size개 페이지에서 동시에 수집합니다.
+    첫 화면이 지난 전체 수집 때와 같으면 아무것도 내보내지 않고 stats["skipped"]를 남깁니다.
+    """
+    if blocker:
+        blocker.reset()
+    metrics = metrics_of(stats)
+    page, waiter = await _new_page(context, stats.setdefault("waits", {}), adapter)
+
+    print(f"[{datetime.datetime.now().strftime('%H:%M:%S')}] 접속 중: {adapter.url}")
 
-            # ── 'TV쇼핑' 탭 필터링 추가 ─────────────────────────
-            try:
-                print(f"  📺 'TV쇼핑' 필터 적용 중...")
-                await page.evaluate("""() => {
-                    let btns = Array.from(document.querySelectorAll('button, a'));
-                    let tvBtn = btns.find(b => b.innerText.trim() === 'TV쇼핑' || b.innerText.includes('TV쇼핑'));
-                    if (tvBtn) tvBtn.click();
-                }""")
-                await asyncio.sleep(5)
-            except Exception as e:
-                print(f"  ⚠️ 'TV쇼핑' 필터 적용 실패: {e}")
+    try:
+        await _goto_schedule(page, waiter, adapter.url, metrics)
+    except Exception as e:
+        print(f"❌ 접속 실패: {e}")
+        await page.close()
+        return
 
-            # ── 스크롤 및 증분 수집 (Virtuoso 대응) ────────────────────
-            print("  🔽 모든 상품 증분 수집 중...")
-            # 상태 유지 변수 (루프 외부에서 관리)
-            day_results = {} # { (date, time, code): item_dict }
-            current_state = {"lastDate": "오늘", "lastTime": "시간정보없음"}
-            
-            last_height = 0
-            scroll_count = 0
-            stagnant_count = 0
-            
-            while scroll_count < 200: # 충분히 늘려 편성표 전체(7일치) 수집 보장
-                # 현재 보이는 상품 수집 (상태값 전달)
-                eval_result = await page.evaluate("""(state) => {
-                    let items = [];
-                    // data-time 속성이 있는 컨테이너 또는 상품 링크 탐색
-                    let containers = Array.from(document.querySelectorAll('[data-time], ._1jauv3p0'));
-                    
-                    let lastDate = state.lastDate;
-                    let lastTime = state.lastTime;
-
-                    containers.forEach(container => {
-                        let broadcastTime = container.getAttribute('data-time') || "";
-                        if (broadcastTime && broadcastTime.includes(' ')) {
-                            broadcastTime = broadcastTime.split(' ')[1];
-                        }
-                        
-                        // 시간 정보 추출 시도
-                        let currentTime = "";
-                        if (!broadcastTime || broadcastTime === "") {
-                            let tMatch = container.innerText.match(/(\\d{2}:\\d{2})/);
-                            if (tMatch) currentTime = tMatch[1];
-                        } else {
-                            let startMatch = broadcastTime.match(/(\\d{2}:\\d{2})/);
-                            if (startMatch) currentTime = startMatch[1];
-                        }
-                        
-                        // 날짜 정보 추출 시도 (예: "오늘", "2월 23일")
-                        let currentDate = null;
-                        let dMatch = container.innerText.match(/(\\d{1,2}월\\s*\\d{1,2}일)/);
-                        if (dMatch) {
-                            currentDate = dMatch[1];
-                        } else if (container.innerText.includes("내일")) {
-                            currentDate = "내일";
-                        } else if (container.innerText.includes("오늘")) {
-                            currentDate = "오늘";
-                        }
-
-                        // 정보가 있으면 업데이트, 없으면 유지 (Stateful Propagation)
-                        if (currentTime) lastTime = currentTime;
-                        if (currentDate) lastDate = currentDate;
-
-                        // 해당 컨테이너 내의 모든 상품 코드 링크 탐색
-                        let links = Array.from(container.querySelectorAll('a[href*="slitmCd="], [data-slitm-cd], [data-slitm_cd]'));
-                        links.forEach(l => {
-                            let code = l.getAttribute('data-slitm-cd') || l.getAttribute('data-slitm_cd');
-                            if (!code) {
-                                let match = l.href ? l.href.match(/slitmCd=(\\d+)/) : null;
-                                if (match) code = match[1];
-                            }
-                            if (!code) return;
-
-                            let name = l.innerText.trim().split('\\n')[0].replace(/\\d+%.*/, '').trim();
-                            if (name.length < 2) {
-                                let nameEl = container.querySelector('[aria-label="제품명"], .pdname, .h84bfs5 span');
-                                if (nameEl) name = nameEl.innerText.trim().split('\\n')[0].trim();
-                            }
-                            
-                            if (name.length >= 2) {
-                                items.push({ 
-                                    time: lastTime, 
-                                    code, 
-                                    name,
-                                    itemDate: lastDate
-                                });
-                            }
-                        });
-                    });
-                    return { items, lastDate, lastTime };
-                }""", current_state)
-                
-                new_items = eval_result["items"]
-                current_state["lastDate"] = eval_result["lastDate"]
-                current_state["lastTime"] = eval_result["lastTime"]
-                
-                # 수집된 데이터 저장 (중복 자동 제거)
-                today = datetime.datetime.now()
-                for item in new_items:
-                    # 날짜 정규화
-                    raw_date = item["itemDate"]
-                    final_date = clean_date 
-                    
-                    if raw_date == "오늘":
-                        final_date = today.strftime("%m.%d")
-                    elif raw_date == "내일":
-                        final_date = (today + datetime.timedelta(days=1)).strftime("%m.%d")
-                    elif "월" in raw_date and "일" in raw_date:
-                        m_match = re.search(r"(\d+)월", raw_date)
-                        d_match = re.search(r"(\d+)일", raw_date)
-                        if m_match and d_match:
-                            final_date = f"{int(m_match.group(1)):02d}.{int(d_match.group(1)):02d}"
-                    
-                    key = (final_date, item["time"], item["code"])
-                    if key not in day_results:
-                        day_results[key] = {
-                            "날짜": final_date,
-                            "방송시간": item["time"],
-                            "상품코드": item["code"],
-                            "상품명": item["name"],
-                        }
-
-                # 스크롤 다운
-                scroll_count += 1
-                previous_height = await page.evaluate("document.body.scrollHeight")
-                await page.evaluate("window.scrollBy(0, 1000)")
-                await asyncio.sleep(1.5)
-                
-                # "상품 더보기" 버튼 클릭 (있을 경우)
-                expanded = False
-                try:
-                    more_button = page.locator("button:has-text('상품 더보기'), .btn_more").first
-                    if await more_button.is_visible():
-                        await more_button.click()
-                        await asyncio.sleep(2)
-                        expanded = True
-                        stagnant_count = 0 
-                except:
-                    pass
-
-                new_height = await page.evaluate("document.body.scrollHeight")
-                
-                if new_height == previous_height:
-                    stagnant_count += 1
-                else:
-                    stagnant_count = 0
-                
-                if scroll_count % 10 == 0:
-                    print(f"    ... 스크롤 중 ({scroll_count}회, 현재 {len(day_results)}개 발견)", end='\r')
-                
-                # 더 이상 로딩되지 않으면 종료 (15회 연속 높이 변화 없음)
-                if stagnant_count >= 15 and not expanded:
-                    break
-            before = len(results)
-            results.extend(day_results.values())
-            print(f"  ✔ {len(results) - before}개 수집 (누적 {len(results)}개)")
-
-        await browser.close()
-        return results
-
-
-def save_to_csv(results: list, filename="hmall_schedule.csv"):
-    """결과를 CSV 파일로 저장합니다."""
-    with open(filename, "w", newline="", encoding="utf-8-sig") as f:
-        writer = csv.DictWriter(f, fieldnames=["날짜", "방송시간", "상품코드", "상품명"])
-        writer.writeheader()
-        writer.writerows(results)
-    print(f"💾 CSV 저장: {filename} ({len(results)}개)")
+    # ── 변경 감지: 첫 화면이 지난 전체 수집 때와 같으면 중단 ──────
+    if fingerprints is not None:
+        with metrics.phase("fingerprint_window"):
+            stats["window_fingerprint"] = await window_fingerprint(page)
+        if fingerprints.unchanged("window", stats["window_fingerprint"]):
+            print("⏭️ 편성표 첫 화면이 지난 실행과 같아 수집을 건너뜁니다.")
+            stats["skipped"] = "window"
+            await page.close()
+            return
+
+    # ── 선택자 프로필 검사 (맞지 않을 때만 다시 보정) ──────────
+    with metrics.phase("selector_check"):
+        await adapter.prepare(page)
+
+    # ── 날짜 탭 목록 수집 ────────────────────────────
+    with metrics.phase("tab_discovery"):
+        tab_info = await adapter.discover_tabs(page)
+    await metrics.sample_browser(page, "discovery")
+    await page.close()
+
+    print(f"📅 발견된 날짜 탭: {len(tab_info)}개")
+    if not tab_info:
+        tab_info = ["오늘"]
+
+    start_idx = adapter.start_tab(tab_info)
+    print(f"'{tab_info[start_idx]}'부터 수집 시작")
+
+    if CRAWL_ALL_TABS:
+        day_labels = tab_info[start_idx:]
+    else:
+        day_labels = [tab_info[start_idx]]  # '오늘' 탭에서 시작하여 무한 스크롤로 전체 수집
+    now = datetime.datetime.now()
+    channels = adapter.channels or [""]
+    jobs = build_jobs(day_labels, channels, now, adapter.tab_date)
+    if horizon is not None:
+        # hot 수집: horizon까지의 날짜 탭만 (마지막 탭은 날짜 경계 대신 horizon에서 멈춤)
+        hot_dates = horizon_dates(now, horizon)
+        jobs = [job for job in jobs if job.date in hot_dates] or jobs[:len(channels)]
+        print(f"🔥 hot 수집 — {horizon.strftime('%m.%d %H:%M')} 방송까지")
+    print(f"🧵 작업 {len(jobs)}개를 페이지 {min(adapter.pool_size, len(jobs))}개로 수집")
+
+    failed = []
+    total = 0
+    attempts = {}
+
+    async def worker(job, emit):
+        attempts[job.name] = attempts.get(job.name, 0) + 1
+        if attempts[job.name] > 1:
+            metrics.count("job_retries")
+        return await _crawl_job(context, job, adapter, mode, stats, horizon, checkpoint, emit, known_codes)
+
+    async for batch in stream_jobs(
+        jobs,
+        worker,
+        pool_size=adapter.pool_size,
+        timeout=JOB_TIMEOUT,
+        retries=JOB_RETRIES,
+        failed=failed,
+    ):
+        total += len(batch)
+        yield batch
+    print(f"  ✔ 총 {total}개 수집")
+    stats["failed_jobs"] = [job.name for job in failed]
+    metrics.count("jobs", len(jobs))
+    metrics.count("failed_jobs", len(failed))
+    if failed:
+        print(f"  ⚠️ 실패한 작업: {', '.join(job.name for job in failed)}")
+
+    waiter.report()
+    if blocker:
+        blocker.report()
+
+
+async def stream_hmall(mode: str = None, url: str = None, stats: dict = None,
+                       session: BrowserSession = None, fingerprints: FingerprintStore = None,
+                       horizon: datetime.datetime = None, checkpoint: Checkpoint = None,
+                       known_codes: frozenset = frozenset()):
+    """현대홈쇼핑 방송편성표를 크롤링하며 새 항목 배치(list)를 차례로 내보내는 async generator.
+
+    배치는 작업(날짜 탭 × 채널) 순서대로, 중복 없이 나옵니다. 인자는 crawl_hmall과 같고,
+    첫 화면 지문이 같아 건너뛰면 아무것도 내보내지 않고 stats["skipped"]를 남깁니다.
+    """
+    mode = mode or CRAWL_MODE
+    adapter = HmallAdapter(url or SCHEDULE_URL, CHANNELS, PAGE_POOL_SIZE, SELECTOR_PROFILE)
+    stats = {} if stats is None else stats
+
+    if session is not None:
+        async for batch in stream_site(session.context, session.blocker, adapter, mode, stats,
+                                       fingerprints, horizon, checkpoint, known_codes):
+            yield batch
+        return
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        context = await browser.new_context(**adapter.context_options)
+        blocker = ResourceBlocker() if BLOCK_RESOURCES else None
+        if blocker:
+            await blocker.install(context)
+        try:
+            async for batch in stream_site(context, blocker, adapter, mode, stats,
+                                           fingerprints, horizon, checkpoint, known_codes):
+                yield batch
+        finally:
+            await browser.close()
 
 
-async def main():
+async def crawl_hmall(mode: str = None, url: str = None, stats: dict = None,
+                      session: BrowserSession = None, fingerprints: FingerprintStore = None,
+                      horizon: datetime.datetime = None, checkpoint: Checkpoint = None,
+                      known_codes: frozenset = frozenset()):
+    """현대홈쇼핑 방송편성표를 크롤링하여 결과 리스트를 반환합니다 (stream_hmall을 모두 모은 것).
+
+    mode="xhr"이면 편성표 API 응답을 가로채 수집하고, 응답을 받지 못하면
+    DOM 스크롤 수집("dom")으로 전환합니다. CRAWL_ALL_TABS가 켜져 있으면
+    (날짜 탭 × CHANNELS) 작업을 PAGE_POOL_SIZE개 페이지에서 동시에 수집합니다.
+
+    url로 편성표 주소를 바꿀 수 있고(예: hmall_stub_server.py), stats dict를 넘기면
+    스크롤 횟수("scrolls")와 대기 신호 통계("waits")가 기록됩니다.
+    session(데몬 모드)을 넘기면 새 브라우저를 띄우지 않고 그 컨텍스트를 재사용합니다.
+    fingerprints를 넘기면 첫 화면 지문("window_fingerprint")을 stats에 남기고,
+    지난 전체 수집 때와 같으면 스크롤 없이 None을 반환합니다.
+    horizon을 넘기면(hot 수집) 그 시각 이후 방송이 나오는 곳에서 스크롤을 멈춥니다.
+    checkpoint를 넘기면 작업별 진행 상황을 기록하고, 이미 완료된 작업은 건너뜁니다.
+    known_codes(상품 카탈로그에 정식 상품명이 있는 상품코드)는 DOM에서 상품명을 추출하지 않고
+    빈 이름으로 반환하므로 ProductCatalog.join으로 채워야 합니다.
+    """
+    stats = {} if stats is None else stats
+    results = []
+    async for batch in stream_hmall(mode, url, stats, session, fingerprints, horizon, checkpoint, known_codes):
+        results.extend(batch)
+    return None if stats.get("skipped") else results
+
+
+async def _as_batches(results: list):
+    """이미 모은 결과를 파이프라인에 넣을 수 있도록 한 배치로 내보냅니다 (비었으면 내보내지 않음)."""
+    if results:
+        yield results
+
+
+async def _hashed(source, hasher: ResultsHasher):
+    """배치를 그대로 넘기면서 결과 지문을 누적합니다."""
+    async for batch in source:
+        hasher.update(batch)
+        yield batch
+
+
+def _build_sinks(tier: str, fingerprints: FingerprintStore, hasher: ResultsHasher, metrics: RunMetrics,
+                 jsonl: str = None, observed=None) -> list:
+    """이력 DB, CSV, Google Sheets (선택: JSONL) 저장 대상
+
+    observed(항목)를 주면 이력 DB에는 참인 항목(이번 실행에서 실제로 수집한 항목)만 기록합니다.
+    """
+
+    async def prepare():
+        with metrics.api_call("sheets_prepare"):
+            return await _prepare_gsheet()
+
+    async def discard(prepared):
+        await prepared[0].aclose()
+
+    async def upload(results, prepared):
+        # 결과가 지난 실행과 같으면 시트 쓰기(할당량) 생략
+        if fingerprints is not None and fingerprints.unchanged("results", hasher.hexdigest()):
+            print("⏭️ 수집 결과가 지난 실행과 같아 Google Sheets 저장을 건너뜁니다.")
+            await discard(prepared)
+            return
+        with metrics.api_call("sheets_upload"):
+            await save_to_gsheet(results, *prepared)
+
+    sinks = [HistorySink(tier, keep=observed), CsvSink(), BufferedSink("sheets", upload, prepare=prepare, discard=discard)]
+    if jsonl:
+        sinks.append(JsonlSink(jsonl))
+    return sinks
+
+
+async def _run(metrics: RunMetrics, catalog: ProductCatalog, archive: SnapshotArchive, session: BrowserSession,
+               tier: str, resume: bool, jsonl: str) -> str:
+    """수집과 저장 본체. 실행 결과(outcome) 문자열을 반환합니다."""
+    # 변경 감지: 브라우저 없이 구한 지문이 지난 실행과 같으면 바로 종료
+    fingerprints = FingerprintStore() if CHANGE_DETECTION else None
+    http_fp = None
+    if fingerprints is not None:
+        with metrics.phase("fingerprint_http"), metrics.api_call("hmall_html"):
+            http_fp = await http_fingerprint()
+        if fingerprints.unchanged("http", http_fp):
+            print("⏭️ 편성표가 지난 실행 이후 바뀌지 않았습니다 (HTTP 지문) — 수집을 건너뜁니다.")
+            return "unchanged_http"
+
+    now = datetime.datetime.now()
+    with HistoryStore() as store:
+        last_full_at = store.last_run_at("full")
+        stored = store.run_results(tier="full")
+    tier = choose_tier(tier or CRAWL_TIER, last_full_at if stored else None, now, FULL_SWEEP_MINUTES)
+    horizon = now + datetime.timedelta(hours=HOT_WINDOW_HOURS) if tier == "hot" else None
+
+    results = None
+    observed = None     # hot 병합 결과 중 이번 실행에서 수집한 항목 판별 (이력 DB에는 이것만 기록)
+    crawl_stats = {"metrics": metrics}
+    checkpoint = None
+    known_codes = catalog.known_codes() if catalog is not None else frozenset()
+    captured = []
+    if USE_FAST_PATH:
+        with metrics.phase("fast_path"):
+            results = await crawl_hmall_fast(capture=(lambda kind, body: captured.append((kind, body)))
+                                             if archive is not None else None, channels=CHANNELS)
+        if results is not None:
+            tier = "full"  # 채널 필터를 적용했고 EXPECTED_DAYS일이 모두 들어 있을 때만 결과가 나옴
+    if archive is not None and results is not None:
+        archive.begin_run(now, tier, "fast")
+        for kind, body in captured:
+            archive.add("fast_path", kind, body, now.strftime("%m.%d"))
+
+    if results is None:
+        # HMALL_FAST_ONLY=1이면 브라우저를 띄우지 않고 실패 코드로 종료
+        # (GitHub Actions에서 이 경우에만 Chromium을 설치해 다시 실행)
+        if session is None and os.environ.get("HMALL_FAST_ONLY") == "1":
+            print("⚠️ 빠른 경로 실패 — 브라우저 수집이 필요합니다.")
+            metrics.finish("fast_path_failed")
+            sys.exit(2)
+        if archive is not None:
+            archive.begin_run(now, tier, CRAWL_MODE)
+            crawl_stats["archive"] = archive
+        if CHECKPOINT_ENABLED:
+            run_key = "|".join([CRAWL_MODE, SCHEDULE_URL, ",".join(CHANNELS), tier, now.strftime("%Y-%m-%d")])
+            checkpoint = Checkpoint.load(run_key) if resume else Checkpoint(run_key)
+            if checkpoint.resumed:
+                done = sum(1 for job in checkpoint.jobs.values() if job["done"])
+                print(f"⏯️ {checkpoint.started_at} 실행의 체크포인트에서 이어 수집 (완료 작업 {done}개)")
+        if tier == "hot":
+            # hot 결과는 저장된 편성표와 병합해야 하므로 모두 모은 뒤 저장
+            results = await crawl_hmall(session=session, stats=crawl_stats, fingerprints=fingerprints,
+                                        horizon=horizon, checkpoint=checkpoint, known_codes=known_codes)
+            if results:
+                results = merge_hot(stored, results, horizon, now)
+                observed = lambda item: not past_horizon(item["날짜"], item["방송시간"], horizon, now)
+            results = results or []
+        else:
+            source = stream_hmall(session=session, stats=crawl_stats, fingerprints=fingerprints,
+                                  checkpoint=checkpoint, known_codes=known_codes)
+            if catalog is not None:
+                source = catalog.joined(source)
+
+    if results is not None:
+        if catalog is not None and results:
+            with metrics.phase("catalog_join"):
+                results = await catalog.join(results)
+        source = _as_batches(results)
+
+    if results and fingerprints is not None and fingerprints.unchanged("results", results_fingerprint(results)):
+        print("⏭️ 수집 결과가 지난 실행과 같아 저장을 건너뜁니다.")
+        return "unchanged_results"
+
+    hasher = ResultsHasher()
+    report = await run_pipeline(_hashed(source, hasher), _build_sinks(tier, fingerprints, hasher, metrics, jsonl, observed))
+    for name, seconds in report["seconds"].items():
+        metrics.add_phase(f"sink:{name}", seconds)
+    metrics.counters["items"] = report["items"]
+    metrics.counters["scrolls"] = crawl_stats.get("scrolls", 0)
+    for signal, (count, seconds) in crawl_stats.get("waits", {}).items():
+        metrics.phases[f"wait:{signal}"] = [count, seconds]
+
+    if crawl_stats.get("skipped"):
+        return "unchanged_window"
+    if checkpoint is not None and report["items"] and not crawl_stats.get("failed_jobs"):
+        checkpoint.clear()   # 모든 작업 완료 — 실패한 작업이 있으면 다음 실행에서 그 작업만 이어 수집
+    if not report["items"]:
+        print("⚠️ 수집된 데이터가 없습니다.")
+        return "empty"
+
+    # 모든 저장이 끝난 실행의 지문만 기록 (실패하면 다음 실행에서 다시 시도)
+    if report["failed"]:
+        return "partial"
+    if fingerprints is not None:
+        fingerprints.update(http=http_fp, window=crawl_stats.get("window_fingerprint"),
+                            results=hasher.hexdigest())
+    return "saved"
+
+
+async def run_once(session: BrowserSession = None, tier: str = None, resume: bool = True, jsonl: str = None,
+                   metrics_file: str = None, prometheus_file: str = None):
+    """한 번 수집하고 이력 DB·CSV·Google Sheets(선택: JSONL)에 저장합니다.
+
+    tier(기본: CRAWL_TIER)가 "hot"이면 HOT_WINDOW_HOURS까지만 수집해 저장된 편성표에 병합합니다.
+    resume이 True면 같은 조건으로 중단된 실행의 체크포인트에서 이어 수집합니다.
+    PRODUCT_CATALOG가 켜져 있으면 상품명을 상품 카탈로그의 정식 상품명으로 채웁니다.
+    ARCHIVE_SNAPSHOTS가 켜져 있으면 수집한 원본(목록 HTML, API 응답)을 hmall_archive.db에 보관합니다.
+    full 브라우저 수집은 결과를 스트리밍해 수집하는 동안 저장 대상들이 동시에 기록합니다.
+    실행 계측은 metrics_file(기본 METRICS_FILE)에 JSON으로, prometheus_file(기본
+    PROMETHEUS_FILE)이 있으면 Prometheus 텍스트 형식으로도 기록합니다.
+    """
     print("=" * 50)
     print("  현대홈쇼핑 방송편성표 크롤러")
     print(f"  실행 시각: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 50)
 
-    results = await crawl_hmall()
-
-    if not results:
-        print("⚠️ 수집된 데이터가 없습니다.")
-        return
+    metrics = RunMetrics()
+    catalog = ProductCatalog(metrics=metrics) if PRODUCT_CATALOG else None
+    archive = SnapshotArchive() if ARCHIVE_SNAPSHOTS else None
+    try:
+        outcome = await _run(metrics, catalog, archive, session, tier, resume, jsonl)
+        metrics.finish(outcome)
+        if outcome == "saved":
+            print("\n🎉 완료!")
+    finally:
+        if catalog is not None:
+            if catalog.stats["joined"] or catalog.stats["fetched"] or catalog.stats["missed"]:
+                catalog.report()
+            await catalog.aclose()
+        if metrics.outcome is None:
+            metrics.finish("error")
+        if archive is not None:
+            if archive.run_id is not None:
+                archive.finish_run(metrics.counters.get("items", 0), metrics.outcome)
+                archive.report()
+                archive.maybe_train()
+                archive.prune(ARCHIVE_KEEP_DAYS)
+            archive.close()
+        metrics.print_summary()
+        metrics_file = metrics_file or METRICS_FILE
+        prometheus_file = prometheus_file or PROMETHEUS_FILE
+        if metrics_file:
+            metrics.write_json(metrics_file)
+        if prometheus_file:
+            metrics.write_prometheus(prometheus_file)
+
+
+def _next_run_delay(now: datetime.datetime, interval_minutes: float) -> float:
+    """다음 실행까지 기다릴 초. 실행 시간대(DAEMON_ACTIVE_HOURS, 평일) 밖이면 다음 시작 시각까지."""
+    candidate = now + datetime.timedelta(minutes=interval_minutes)
+    start_hour, end_hour = DAEMON_ACTIVE_HOURS
+    while (candidate.hour < start_hour or candidate.hour >= end_hour
+           or (DAEMON_WEEKDAYS_ONLY and candidate.weekday() >= 5)):
+        if candidate.hour >= end_hour or (DAEMON_WEEKDAYS_ONLY and candidate.weekday() >= 5):
+            candidate = (candidate + datetime.timedelta(days=1)).replace(hour=start_hour, minute=0, second=0)
+        else:
+            candidate = candidate.replace(hour=start_hour, minute=0, second=0)
+    return (candidate - now).total_seconds()
+
+
+async def run_daemon(interval_minutes: float = None, max_runs: int = None, tier: str = None,
+                     resume: bool = True, jsonl: str = None, metrics_file: str = None, prometheus_file: str = None):
+    """브라우저 하나를 띄워 둔 채 내부 일정에 따라 반복 수집합니다."""
+    interval_minutes = interval_minutes or DAEMON_INTERVAL_MINUTES
+    session = BrowserSession(block_resources=DAEMON_BLOCK_RESOURCES)
+    await session.start()
+    print(f"🛰️ 데몬 모드 시작 — {interval_minutes:g}분 간격, 프로필: {session.profile_dir}")
+    total = 0
+    try:
+        while max_runs is None or total < max_runs:
+            started = datetime.datetime.now()
+            try:
+                await run_once(session, tier, resume, jsonl, metrics_file, prometheus_file)
+            except Exception as e:
+                print(f"❌ 실행 실패: {e}")
+            session.runs += 1
+            total += 1
+            await session.recycle_if_needed()
 
-    # CSV 저장 (백업용)
-    save_to_csv(results)
+            if max_runs is not None and total >= max_runs:
+                break
+            delay = _next_run_delay(started, interval_minutes) - (datetime.datetime.now() - started).total_seconds()
+            print(f"💤 다음 실행까지 {max(0, delay) / 60:.0f}분 대기 (브라우저 실행 {session.launches}회)")
+            await asyncio.sleep(max(0, delay))
+    finally:
+        await session.close()
 
-    # Google Sheets 저장
-    try:
-        save_to_gsheet(results)
-    except Exception as e:
-        print(f"❌ Google Sheets 저장 실패: {e}")
-        print("   (CSV 파일은 정상 저장되었습니다)")
 
-    print("\n🎉 완료!")
+async def main():
+    parser = argparse.ArgumentParser(description="현대홈쇼핑 방송편성표 크롤러")
+    parser.add_argument("--daemon", action="store_true", help="브라우저를 유지한 채 일정에 따라 반복 실행")
+    parser.add_argument("--interval", type=float, help=f"데몬 실행 간격(분, 기본 {DAEMON_INTERVAL_MINUTES})")
+    parser.add_argument("--max-runs", type=int, help="데몬 최대 실행 횟수 (기본: 무제한)")
+    parser.add_argument("--tier", choices=["hot", "full", "auto"],
+                        help=f"수집 계층 (기본: {CRAWL_TIER}, hot = {HOT_WINDOW_HOURS}시간 앞까지만)")
+    parser.add_argument("--fresh", action="store_true", help="체크포인트를 무시하고 처음부터 수집")
+    parser.add_argument("--jsonl", metavar="PATH", help="수집 항목을 JSON Lines로도 기록 (\"-\" = 표준 출력)")
+    parser.add_argument("--metrics", metavar="PATH", help=f"실행 계측 JSON 경로 (기본: {METRICS_FILE})")
+    parser.add_argument("--prometheus", metavar="PATH", help="실행 계측을 Prometheus 텍스트 형식으로도 기록")
+    args = parser.parse_args()
+
+    # --jsonl - 이면 표준 출력은 JSONL 전용, 진행 상황은 표준 오류로
+    with stdout_reserved(args.jsonl):
+        if args.daemon:
+            await run_daemon(args.interval, args.max_runs, args.tier, not args.fresh, args.jsonl,
+                             args.metrics, args.prometheus)
+        else:
+            await run_once(tier=args.tier, resume=not args.fresh, jsonl=args.jsonl,
+                           metrics_file=args.metrics, prometheus_file=args.prometheus)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,310 @@
+"""저장된 HTML에서 편성표를 추출하는 오프라인 엔진
+
+브라우저 수집기(hmall_collector.py)의 컨테이너/시간/날짜/상품명 규칙을 정적
+HTML 위에서 그대로 재현합니다. 네트워크나 브라우저 없이 추출 규칙을 시험하고
+프로파일링할 수 있습니다.
+
+파서 백엔드: "lxml" (기본, 가장 빠름), "selectolax", "bs4" (html.parser)
+"""
+import datetime
+import re
+
+BACKENDS = ("lxml", "selectolax", "bs4")
+
+# innerText에서 줄바꿈을 만드는 블록 요소
+_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4",
+    "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section",
+    "table", "tr", "ul",
+}
+_SKIP_TAGS = {"script", "style", "noscript", "template"}
+
+_TIME_RE = re.compile(r"(\d{2}:\d{2})")
+_DATE_RE = re.compile(r"(\d{1,2}월\s*\d{1,2}일)")
+_CODE_RE = re.compile(r"slitmCd=(\d+)")
+_PERCENT_RE = re.compile(r"\d+%.*")
+_MONTH_RE = re.compile(r"(\d+)월")
+_DAY_RE = re.compile(r"(\d+)일")
+
+
+def normalize_date(raw_date: str, fallback: str, today: datetime.datetime) -> str:
+    """'오늘', '내일', '2월 23일' 형식의 날짜를 'MM.DD'로 정규화합니다."""
+    if raw_date == "오늘":
+        return today.strftime("%m.%d")
+    if raw_date == "내일":
+        return (today + datetime.timedelta(days=1)).strftime("%m.%d")
+    if "월" in raw_date and "일" in raw_date:
+        m_match = _MONTH_RE.search(raw_date)
+        d_match = _DAY_RE.search(raw_date)
+        if m_match and d_match:
+            return f"{int(m_match.group(1)):02d}.{int(d_match.group(1)):02d}"
+    return fallback
+
+
+# ───────────────────────────────────────────────────
+# 파서 백엔드 — 각 백엔드는 같은 4개 선택과 innerText 근사를 제공
+# ───────────────────────────────────────────────────
+class _LxmlBackend:
+    """lxml.html + XPath (cssselect 의존성 없음)"""
+
+    _CONTAINERS = "//*[@data-time or contains(concat(' ', normalize-space(@class), ' '), ' _1jauv3p0 ')]"
+    _LINKS = ".//a[contains(@href, 'slitmCd=')] | .//*[@data-slitm-cd] | .//*[@data-slitm_cd]"
+    _NAME = (
+        "(.//*[@aria-label='제품명']"
+        " | .//*[contains(concat(' ', normalize-space(@class), ' '), ' pdname ')]"
+        " | .//*[contains(concat(' ', normalize-space(@class), ' '), ' h84bfs5 ')]//span)[1]"
+    )
+
+    def __init__(self):
+        import lxml.html
+        from lxml import etree
+        self._parse = lxml.html.document_fromstring
+        self._comment = etree._Comment
+        self._containers = etree.XPath(self._CONTAINERS)
+        self._links = etree.XPath(self._LINKS)
+        self._name = etree.XPath(self._NAME)
+
+    def parse(self, html: str):
+        return self._parse(html)
+
+    def containers(self, root):
+        return self._containers(root)
+
+    def links(self, container):
+        return self._links(container)
+
+    def name_element(self, container):
+        found = self._name(container)
+        return found[0] if found else None
+
+    def attr(self, el, name):
+        return el.get(name)
+
+    def inner_text(self, el) -> str:
+        parts = []
+
+        def walk(node):
+            tag = node.tag if isinstance(node.tag, str) else None
+            if tag in _SKIP_TAGS or isinstance(node, self._comment):
+                return
+            block = tag in _BLOCK_TAGS
+            if block:
+                parts.append("\n")
+            if node.text:
+                parts.append(node.text)
+            for child in node:
+                walk(child)
+                if child.tail:
+                    parts.append(child.tail)
+            if block:
+                parts.append("\n")
+
+        walk(el)
+        return _collapse("".join(parts))
+
+
+class _SelectolaxBackend:
+    """selectolax (lexbor) — C 기반 CSS 선택"""
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser = LexborHTMLParser
+
+    def parse(self, html: str):
+        return self._parser(html)
+
+    def containers(self, root):
+        return root.css("[data-time], ._1jauv3p0")
+
+    def links(self, container):
+        return container.css('a[href*="slitmCd="], [data-slitm-cd], [data-slitm_cd]')
+
+    def name_element(self, container):
+        return container.css_first('[aria-label="제품명"], .pdname, .h84bfs5 span')
+
+    def attr(self, el, name):
+        return el.attributes.get(name)
+
+    def inner_text(self, el) -> str:
+        parts = []
+
+        def walk(node):
+            tag = node.tag
+            if tag == "-text":
+                parts.append(node.text_content or "")
+                return
+            if tag in _SKIP_TAGS or tag.startswith("_") or tag == "-comment":
+                return
+            block = tag in _BLOCK_TAGS
+            if block:
+                parts.append("\n")
+            for child in node.iter(include_text=True):
+                walk(child)
+            if block:
+                parts.append("\n")
+
+        walk(el)
+        return _collapse("".join(parts))
+
+
+class _Bs4Backend:
+    """BeautifulSoup + html.parser (analyze_html.py와 같은 구성, 기준용)"""
+
+    def __init__(self):
+        from bs4 import BeautifulSoup, Comment, NavigableString
+        self._soup = BeautifulSoup
+        self._comment = Comment
+        self._string = NavigableString
+
+    def parse(self, html: str):
+        return self._soup(html, "html.parser")
+
+    def containers(self, root):
+        return root.select("[data-time], ._1jauv3p0")
+
+    def links(self, container):
+        return container.select('a[href*="slitmCd="], [data-slitm-cd], [data-slitm_cd]')
+
+    def name_element(self, container):
+        return container.select_one('[aria-label="제품명"], .pdname, .h84bfs5 span')
+
+    def attr(self, el, name):
+        value = el.get(name)
+        return " ".join(value) if isinstance(value, list) else value
+
+    def inner_text(self, el) -> str:
+        parts = []
+
+        def walk(node):
+            if isinstance(node, self._comment):
+                return
+            if isinstance(node, self._string):
+                parts.append(str(node))
+                return
+            if node.name in _SKIP_TAGS:
+                return
+            block = node.name in _BLOCK_TAGS
+            if block:
+                parts.append("\n")
+            for child in node.children:
+                walk(child)
+            if block:
+                parts.append("\n")
+
+        walk(el)
+        return _collapse("".join(parts))
+
+
+_BACKEND_CLASSES = {"lxml": _LxmlBackend, "selectolax": _SelectolaxBackend, "bs4": _Bs4Backend}
+_backend_cache = {}
+
+
+def _collapse(text: str) -> str:
+    """innerText처럼 줄 안의 연속 공백을 하나로 줄이고 빈 줄을 없앱니다."""
+    lines = (" ".join(line.split()) for line in text.split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def get_backend(name: str):
+    """파서 백엔드를 반환합니다. 패키지가 없으면 ImportError가 납니다."""
+    if name not in _backend_cache:
+        if name not in _BACKEND_CLASSES:
+            raise ValueError(f"알 수 없는 파서 백엔드: {name} (가능: {', '.join(BACKENDS)})")
+        _backend_cache[name] = _BACKEND_CLASSES[name]()
+    return _backend_cache[name]
+
+
+def available_backends() -> list:
+    """현재 환경에 설치된 파서 백엔드 이름 목록"""
+    names = []
+    for name in BACKENDS:
+        try:
+            get_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+# ───────────────────────────────────────────────────
+# 추출 규칙 (hmall_collector.py의 processContainer와 동일)
+# ───────────────────────────────────────────────────
+def extract_raw_items(html: str, backend: str = "lxml", state: dict = None) -> dict:
+    """HTML에서 정규화 전 항목을 추출합니다.
+
+    반환값은 브라우저 수집기의 drain 결과와 같은 형태입니다:
+    { "items": [{time, code, name, itemDate}], "lastDate", "lastTime" }
+    """
+    b = get_backend(backend)
+    root = b.parse(html)
+    state = state or {"lastDate": "오늘", "lastTime": "시간정보없음"}
+    last_date, last_time = state["lastDate"], state["lastTime"]
+    items = []
+
+    for container in b.containers(root):
+        text = b.inner_text(container)
+
+        broadcast_time = b.attr(container, "data-time") or ""
+        if broadcast_time and " " in broadcast_time:
+            broadcast_time = broadcast_time.split(" ")[1]
+
+        # 시간 정보 추출 시도
+        m = _TIME_RE.search(broadcast_time or text)
+        current_time = m.group(1) if m else ""
+
+        # 날짜 정보 추출 시도 (예: "오늘", "2월 23일")
+        current_date = None
+        m = _DATE_RE.search(text)
+        if m:
+            current_date = m.group(1)
+        elif "내일" in text:
+            current_date = "내일"
+        elif "오늘" in text:
+            current_date = "오늘"
+
+        # 정보가 있으면 업데이트, 없으면 유지 (Stateful Propagation)
+        if current_time:
+            last_time = current_time
+        if current_date:
+            last_date = current_date
+
+        for link in b.links(container):
+            code = b.attr(link, "data-slitm-cd") or b.attr(link, "data-slitm_cd")
+            if not code:
+                m = _CODE_RE.search(b.attr(link, "href") or "")
+                if m:
+                    code = m.group(1)
+            if not code:
+                continue
+
+            lines = b.inner_text(link).strip().split("\n")
+            name = _PERCENT_RE.sub("", lines[0], count=1).strip()
+            if len(name) < 2:
+                name_el = b.name_element(container)
+                if name_el is not None:
+                    name = b.inner_text(name_el).strip().split("\n")[0].strip()
+
+            if len(name) >= 2:
+                items.append({"time": last_time, "code": code, "name": name, "itemDate": last_date})
+
+    return {"items": items, "lastDate": last_date, "lastTime": last_time}
+
+
+def extract_records(html: str, backend: str = "lxml", today: datetime.datetime = None,
+                    fallback_date: str = None) -> list:
+    """HTML에서 날짜/방송시간/상품코드/상품명 레코드를 추출합니다 (중복 제거, 수집 순서 유지)."""
+    today = today or datetime.datetime.now()
+    fallback_date = fallback_date or today.strftime("%m.%d")
+    results = {}
+    for item in extract_raw_items(html, backend)["items"]:
+        final_date = normalize_date(item["itemDate"], fallback_date, today)
+        key = (final_date, item["time"], item["code"])
+        if key not in results:
+            results[key] = {
+                "날짜": final_date,
+                "방송시간": item["time"],
+                "상품코드": item["code"],
+                "상품명": item["name"],
+            }
+    return list(results.values())
@@ -0,0 +1,196 @@
+"""브라우저 없이 서버 렌더링 HTML의 __NEXT_DATA__에서 편성표를 수집하는 빠른 경로"""
+import datetime
+import json
+import re
+
+import httpx
+
+from hmall_api import decode_schedule_payload
+
+BASE_URL = "https://www.hmall.com"
+SCHEDULE_PATH = "/md/dpl/index?mainDispSeq=2&brodType=all"
+# 브라우저 수집의 채널 필터 버튼 → 편성표 주소의 brodType 값 (없는 채널은 빠른 경로를 쓰지 않음)
+# 저장된 페이지로 확인한 값이 아니므로 결과가 brodType=all의 일부일 때만 필터가 적용된 것으로 봄
+CHANNEL_BROD_TYPES = {"TV쇼핑": "tv"}
+USER_AGENT = (
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 16_6 like Mac OS X) "
+    "AppleWebKit/605.1.15 (KHTML, like Gecko) "
+    "Version/16.6 Mobile/15E148 Safari/604.1"
+)
+REQUEST_TIMEOUT = 15      # 요청당 최대 시간(초)
+MIN_VALID_ITEMS = 20      # 이보다 적게 나오면 빠른 경로 실패로 보고 브라우저로 전환
+EXPECTED_DAYS = 7         # 전체 수집이 덮어야 하는 날짜 수 (오늘부터) — 하루라도 빠지면 브라우저로 전환
+
+_NEXT_DATA_RE = re.compile(
+    r'<script id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.S
+)
+_TIME_FORMAT_RE = re.compile(r"^\d{2}:\d{2}$")
+_DATE_FORMAT_RE = re.compile(r"^\d{2}\.\d{2}$")
+
+
+def extract_next_data(html: str):
+    """HTML에서 Next.js __NEXT_DATA__ JSON을 꺼냅니다. 없으면 None."""
+    m = _NEXT_DATA_RE.search(html)
+    if not m:
+        return None
+    try:
+        return json.loads(m.group(1))
+    except ValueError:
+        return None
+
+
+def next_data_url(next_data: dict):
+    """__NEXT_DATA__의 buildId로 getServerSideProps JSON 경로를 (URL, 쿼리)로 만듭니다."""
+    build_id = next_data.get("buildId")
+    page = next_data.get("page")
+    if not build_id or not page:
+        return None
+    prefix = next_data.get("assetPrefix") or ""
+    query = dict(next_data.get("query") or {})
+    # 동적 세그먼트([index])는 경로로, 나머지는 쿼리스트링으로
+    path = page
+    for key in re.findall(r"\[(\w+)\]", page):
+        path = path.replace(f"[{key}]", str(query.pop(key, key)))
+    return f"{BASE_URL}{prefix}/_next/data/{build_id}{path}.json", query
+
+
+def schedule_path(brod_type: str = "all") -> str:
+    """brodType(채널)을 적용한 편성표 경로"""
+    return SCHEDULE_PATH.replace("brodType=all", f"brodType={brod_type}")
+
+
+def missing_dates(records: list, today: datetime.datetime, days: int = EXPECTED_DAYS) -> list:
+    """오늘부터 days일 중 records에 한 건도 없는 날짜('MM.DD') 목록"""
+    found = {item["날짜"] for item in records}
+    expected = [(today + datetime.timedelta(days=offset)).strftime("%m.%d") for offset in range(days)]
+    return [date for date in expected if date not in found]
+
+
+def validate_records(records: list) -> bool:
+    """빠른 경로 결과가 브라우저 수집을 대체할 만큼 온전한지 확인합니다."""
+    if len(records) < MIN_VALID_ITEMS:
+        return False
+    for item in records:
+        if not _DATE_FORMAT_RE.match(item["날짜"] or ""):
+            return False
+        if not _TIME_FORMAT_RE.match(item["방송시간"] or ""):
+            return False
+        if not item["상품코드"] or len(item["상품명"]) < 2:
+            return False
+    return True
+
+
+def _dedup(records: list, fallback_date: str) -> list:
+    results = {}
+    for item in records:
+        if item["날짜"] is None:
+            item["날짜"] = fallback_date
+        key = (item["날짜"], item["방송시간"], item["상품코드"])
+        if key not in results:
+            results[key] = item
+    return list(results.values())
+
+
+async def _fetch_schedule(client: httpx.AsyncClient, brod_type: str, capture=None):
+    """brodType 하나의 편성표를 (레코드 리스트, 다음 페이지 여부)로 가져옵니다. __NEXT_DATA__가 없으면 None."""
+    path = schedule_path(brod_type)
+    print(f"[{datetime.datetime.now().strftime('%H:%M:%S')}] ⚡ 빠른 경로 시도: {path}")
+    resp = await client.get(path)
+    resp.raise_for_status()
+    if capture is not None:
+        capture("page", resp.content)
+    next_data = extract_next_data(resp.text)
+    if next_data is None:
+        print("  ⚠️ __NEXT_DATA__를 찾지 못했습니다.")
+        return None
+
+    records, has_more = decode_schedule_payload(next_data)
+
+    # HTML에 편성표가 없으면 같은 연결로 Next.js 데이터 경로를 한 번 더 조회
+    if not records:
+        route = next_data_url(next_data)
+        if route:
+            data_url, params = route
+            data_resp = await client.get(data_url, params=params)
+            if data_resp.status_code == 200:
+                if capture is not None:
+                    capture("json", data_resp.content)
+                records, has_more = decode_schedule_payload(data_resp.json())
+    return records, has_more
+
+
+def _keys(records: list) -> set:
+    return {(item["날짜"], item["방송시간"], item["상품코드"]) for item in records}
+
+
+async def crawl_hmall_fast(client: httpx.AsyncClient = None, capture=None, channels: list = ("TV쇼핑",),
+                           days: int = EXPECTED_DAYS):
+    """HTTP 요청만으로 편성표를 수집합니다. 전체 수집을 대신할 수 없으면 None을 반환합니다.
+
+    브라우저 수집과 같은 채널 필터(channels, CHANNEL_BROD_TYPES의 brodType)를 적용하고,
+    형식 검증에 더해 오늘부터 days일이 모두 들어 있고 다음 페이지가 남아 있지 않을 때만
+    결과를 반환합니다 (서버 렌더링 HTML에는 첫 페이지만 들어 있을 수 있음).
+    채널 필터를 적용했으면 brodType=all 편성표와 비교해, 필터 결과가 전체의 일부일 때만
+    (서버가 brodType을 무시하지 않았을 때만) 받아들입니다.
+    capture(kind, body)를 넘기면 받은 HTML("page")과 데이터 경로 응답("json")을 넘겨줍니다.
+    """
+    brod_types = [CHANNEL_BROD_TYPES.get(channel) for channel in channels] or ["all"]
+    if None in brod_types:
+        unknown = [ch for ch, bt in zip(channels, brod_types) if bt is None]
+        print(f"  ⚠️ 빠른 경로에서 채널 필터를 적용할 수 없습니다 ({', '.join(unknown)}) — 브라우저 수집으로 전환합니다.")
+        return None
+
+    own_client = client is None
+    if own_client:
+        client = httpx.AsyncClient(
+            base_url=BASE_URL,
+            headers={"User-Agent": USER_AGENT, "Accept-Language": "ko-KR,ko;q=0.9"},
+            timeout=REQUEST_TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=4),
+        )
+
+    records = []
+    unfiltered = None
+    try:
+        for brod_type in brod_types:
+            fetched = await _fetch_schedule(client, brod_type, capture)
+            if fetched is None:
+                return None
+            page_records, has_more = fetched
+            if has_more:
+                print(f"  ⚠️ 빠른 경로 응답에 다음 페이지가 남아 있습니다 (brodType={brod_type}) — 브라우저 수집으로 전환합니다.")
+                return None
+            records.extend(page_records)
+        if brod_types != ["all"]:
+            # 필터 확인용 (보관하지 않음)
+            fetched = await _fetch_schedule(client, "all")
+            if fetched is None or fetched[1]:
+                print("  ⚠️ 채널 필터를 확인할 전체 편성표를 받지 못했습니다 — 브라우저 수집으로 전환합니다.")
+                return None
+            unfiltered = fetched[0]
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"  ⚠️ 빠른 경로 요청 실패: {e}")
+        return None
+    finally:
+        if own_client:
+            await client.aclose()
+
+    now = datetime.datetime.now()
+    results = _dedup(records, now.strftime("%m.%d"))
+    if not validate_records(results):
+        print(f"  ⚠️ 빠른 경로 검증 실패 ({len(results)}개) — 브라우저 수집으로 전환합니다.")
+        return None
+    if unfiltered is not None:
+        filtered, everything = _keys(results), _keys(_dedup(unfiltered, now.strftime("%m.%d")))
+        if not filtered < everything:
+            print(f"  ⚠️ 채널 필터가 적용되지 않았습니다 (필터 {len(filtered)}개 / 전체 {len(everything)}개) "
+                  "— 브라우저 수집으로 전환합니다.")
+            return None
+    missing = missing_dates(results, now, days)
+    if missing:
+        print(f"  ⚠️ 빠른 경로 결과에 빠진 날짜가 있습니다 ({', '.join(missing)}) — 브라우저 수집으로 전환합니다.")
+        return None
+
+    print(f"  ✔ 빠른 경로로 {len(results)}개 수집")
+    return results
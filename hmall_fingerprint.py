@@ -0,0 +1,134 @@
+"""편성표 변경 감지 — 지난 실행과 같으면 전체 수집과 저장을 건너뜁니다.
+
+세 단계의 지문을 씁니다 (앞 단계일수록 싸고, 판단할 수 없으면 None):
+  http    — 편성표가 담긴 __NEXT_DATA__ 페이지의 ETag/Last-Modified 또는 편성표 자체 (브라우저 없음)
+  window  — 브라우저로 처음 그려진 편성표 창 (스크롤 전)
+  results — 수집 결과 전체 (저장 직전)
+지문과 마지막 전체 갱신 시각은 FINGERPRINT_FILE에 저장되며, FORCE_REFRESH_MINUTES가
+지나면 지문이 같아도 전체 수집을 강제합니다.
+"""
+import datetime
+import hashlib
+import json
+import os
+
+import httpx
+
+from hmall_api import decode_schedule_payload
+from hmall_fastpath import BASE_URL, REQUEST_TIMEOUT, SCHEDULE_PATH, USER_AGENT, extract_next_data
+
+FINGERPRINT_FILE = ".hmall_fingerprint.json"
+FORCE_REFRESH_MINUTES = 360     # 지문이 같아도 이 시간이 지나면 전체 수집
+WINDOW_SIZE = 10                # window 지문에 쓰는 앞쪽 방송 슬롯 수
+
+# 처음 그려진 편성표 창: [data-time, 상품코드 목록]
+# 상품명은 '방송중' 같은 상태 문구가 섞여 바뀌므로 지문에서 제외
+_WINDOW_SCRIPT = """(size) => Array.from(document.querySelectorAll('[data-time]')).slice(0, size).map(c => [
+    c.getAttribute('data-time'),
+    Array.from(c.querySelectorAll('a[href*="slitmCd="]'))
+        .map(a => (a.getAttribute('href').match(/slitmCd=(\\d+)/) || [])[1] || '').join(','),
+])"""
+
+
+def fingerprint(*parts) -> str:
+    """JSON 직렬화 가능한 값들의 SHA-256 지문"""
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResultsHasher:
+    """수집 결과 지문을 배치 단위로 누적 계산합니다 (스트리밍 수집용)."""
+
+    def __init__(self):
+        self._sha = hashlib.sha256(b"results")
+
+    def update(self, results: list):
+        for item in results:
+            line = "\t".join((item["날짜"], item["방송시간"], item["상품코드"], item["상품명"])) + "\n"
+            self._sha.update(line.encode("utf-8"))
+
+    def hexdigest(self) -> str:
+        return self._sha.hexdigest()
+
+
+def results_fingerprint(results: list) -> str:
+    hasher = ResultsHasher()
+    hasher.update(results)
+    return hasher.hexdigest()
+
+
+async def http_fingerprint(client: httpx.AsyncClient = None):
+    """브라우저 없이 편성표 페이지의 지문을 구합니다. 판단할 근거가 없으면 None."""
+    own_client = client is None
+    if own_client:
+        client = httpx.AsyncClient(
+            base_url=BASE_URL,
+            headers={"User-Agent": USER_AGENT},
+            timeout=REQUEST_TIMEOUT,
+            follow_redirects=True,
+        )
+    try:
+        resp = await client.get(SCHEDULE_PATH)
+        resp.raise_for_status()
+    except httpx.HTTPError:
+        return None
+    finally:
+        if own_client:
+            await client.aclose()
+
+    # __NEXT_DATA__에 편성표가 없으면(템플릿 정보뿐이면) 편성표는 XHR로 오므로 문서의
+    # ETag/Last-Modified가 같아도 편성표는 바뀌었을 수 있음 — 변경을 판단할 수 없음
+    next_data = extract_next_data(resp.text)
+    records, _ = decode_schedule_payload(next_data) if next_data else ([], None)
+    if not records:
+        return None
+
+    etag = resp.headers.get("etag")
+    last_modified = resp.headers.get("last-modified")
+    if etag or last_modified:
+        return fingerprint("http", etag, last_modified)
+    return fingerprint("next", records)
+
+
+async def window_fingerprint(page):
+    """스크롤 전 처음 그려진 편성표 창의 지문. 항목이 없으면 None."""
+    window = await page.evaluate(_WINDOW_SCRIPT, WINDOW_SIZE)
+    if not window:
+        return None
+    return fingerprint("window", datetime.date.today().isoformat(), window)
+
+
+class FingerprintStore:
+    """지문과 마지막 전체 갱신 시각을 디스크에 보관합니다."""
+
+    def __init__(self, path: str = FINGERPRINT_FILE, force_refresh_minutes: float = FORCE_REFRESH_MINUTES):
+        self.path = path
+        self.force_refresh_minutes = force_refresh_minutes
+        self.data = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.data = json.load(f)
+            except (OSError, ValueError):
+                self.data = {}
+
+    def refresh_due(self) -> bool:
+        refreshed_at = self.data.get("refreshed_at")
+        if not refreshed_at:
+            return True
+        age = datetime.datetime.now() - datetime.datetime.fromisoformat(refreshed_at)
+        return age.total_seconds() >= self.force_refresh_minutes * 60
+
+    def unchanged(self, kind: str, value) -> bool:
+        """kind 지문이 지난 전체 갱신 때와 같고 강제 갱신 시각 전이면 True"""
+        return value is not None and self.data.get(kind) == value and not self.refresh_due()
+
+    def update(self, **values):
+        """전체 수집·저장이 끝난 뒤 호출해 이번 실행에서 구한 지문과 갱신 시각을 기록합니다.
+
+        이번에 구하지 못한(None) 지문은 지난 값을 남기지 않고 지웁니다.
+        """
+        self.data = {kind: value for kind, value in values.items() if value is not None}
+        self.data["refreshed_at"] = datetime.datetime.now().isoformat(timespec="seconds")
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2)
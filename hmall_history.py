@@ -0,0 +1,285 @@
+"""편성표 이력 저장소 (SQLite) 및 조회 CLI
+
+실행마다 관측된 방송 슬롯을 누적 저장합니다 (처음/마지막 관측 시각 포함).
+크롤러의 hmall_schedule.csv는 이 저장소에서 내보낸 파일이 아니라 실행 중에 바로 쓰는 CSV이며,
+저장소의 실행 하나를 CSV로 받으려면 export를 사용합니다.
+
+사용 예:
+    python hmall_history.py runs
+    python hmall_history.py slots --from 2026-02-23 --to 2026-02-25
+    python hmall_history.py product 2232380752
+    python hmall_history.py diff            # 마지막 두 실행 비교
+    python hmall_history.py diff 12 15
+    python hmall_history.py export hmall_schedule.csv
+"""
+import argparse
+import csv
+import datetime
+import re
+import sqlite3
+
+HISTORY_DB = "hmall_history.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_at      TEXT NOT NULL,
+    item_count  INTEGER NOT NULL,
+    tier        TEXT NOT NULL DEFAULT 'full'   -- 'full' = 7일 전체, 'hot' = 가까운 시간대만 새로 고침
+);
+CREATE TABLE IF NOT EXISTS slots (
+    slot_id     INTEGER PRIMARY KEY AUTOINCREMENT,
+    brod_date   TEXT NOT NULL,      -- YYYY-MM-DD
+    brod_time   TEXT NOT NULL,      -- HH:MM
+    slitm_cd    TEXT NOT NULL,
+    slitm_nm    TEXT NOT NULL,
+    first_seen  TEXT NOT NULL,
+    last_seen   TEXT NOT NULL,
+    first_run   INTEGER NOT NULL REFERENCES runs(run_id),
+    last_run    INTEGER NOT NULL REFERENCES runs(run_id),
+    UNIQUE (brod_date, brod_time, slitm_cd)
+);
+CREATE TABLE IF NOT EXISTS observations (
+    run_id      INTEGER NOT NULL REFERENCES runs(run_id),
+    slot_id     INTEGER NOT NULL REFERENCES slots(slot_id),
+    PRIMARY KEY (run_id, slot_id)
+);
+CREATE INDEX IF NOT EXISTS idx_slots_time ON slots (brod_time);
+CREATE INDEX IF NOT EXISTS idx_slots_code ON slots (slitm_cd, brod_date);
+CREATE INDEX IF NOT EXISTS idx_slots_last_run ON slots (last_run);
+"""
+
+
+_MMDD_RE = re.compile(r"^(\d{1,2})\.(\d{1,2})$")
+
+
+def resolve_date(mmdd: str, now: datetime.datetime) -> str:
+    """'MM.DD'를 실행 시각 기준 연도를 붙여 'YYYY-MM-DD'로 바꿉니다 (연말/연초 넘김 처리).
+
+    형식이 다르면 원래 값을 그대로 반환합니다.
+    """
+    m = _MMDD_RE.match(mmdd)
+    if not m:
+        return mmdd
+    month, day = int(m.group(1)), int(m.group(2))
+    year = now.year
+    if month - now.month > 6:
+        year -= 1
+    elif now.month - month > 6:
+        year += 1
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+
+def to_mmdd(brod_date: str) -> str:
+    """저장된 'YYYY-MM-DD'를 CSV/시트에서 쓰는 'MM.DD'로 되돌립니다."""
+    if len(brod_date) == 10 and brod_date[4] == "-":
+        return brod_date[5:].replace("-", ".")
+    return brod_date
+
+
+class HistoryStore:
+    """편성표 이력 SQLite 저장소"""
+
+    def __init__(self, path: str = HISTORY_DB):
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._run_at = None   # begin_run으로 시작한 실행의 기준 시각 (연도 보정용)
+        self.conn.executescript(_SCHEMA)
+        # tier 열이 생기기 전에 만든 DB 마이그레이션
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(runs)")}
+        if "tier" not in columns:
+            self.conn.execute("ALTER TABLE runs ADD COLUMN tier TEXT NOT NULL DEFAULT 'full'")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def begin_run(self, run_at: datetime.datetime = None, tier: str = "full", commit: bool = True) -> int:
+        """스트리밍 기록용: 실행을 만들고 run_id를 반환합니다 (add_batch → finish_run 순서로 호출)."""
+        run_at = run_at or datetime.datetime.now()
+        self._run_at = run_at
+        run_id = self.conn.execute(
+            "INSERT INTO runs (run_at, item_count, tier) VALUES (?, 0, ?)",
+            (run_at.strftime("%Y-%m-%d %H:%M:%S"), tier),
+        ).lastrowid
+        if commit:
+            self.conn.commit()
+        return run_id
+
+    def add_batch(self, run_id: int, results: list, commit: bool = True):
+        """수집 순서대로 들어온 항목 배치를 기록합니다."""
+        run_at = self._run_at or datetime.datetime.now()
+        stamp = run_at.strftime("%Y-%m-%d %H:%M:%S")
+        rows = [
+            (resolve_date(item["날짜"], run_at), item["방송시간"], item["상품코드"], item["상품명"])
+            for item in results
+        ]
+        self.conn.executemany(
+            """INSERT INTO slots (brod_date, brod_time, slitm_cd, slitm_nm,
+                                  first_seen, last_seen, first_run, last_run)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT (brod_date, brod_time, slitm_cd) DO UPDATE SET
+                   slitm_nm = COALESCE(NULLIF(excluded.slitm_nm, ''), slitm_nm),
+                   last_seen = excluded.last_seen,
+                   last_run = excluded.last_run""",
+            [(d, t, c, n, stamp, stamp, run_id, run_id) for d, t, c, n in rows],
+        )
+        # 관측 순서(rowid)가 수집 순서와 같도록 결과 순서대로 기록
+        self.conn.executemany(
+            """INSERT OR IGNORE INTO observations (run_id, slot_id)
+               SELECT ?, slot_id FROM slots
+               WHERE brod_date = ? AND brod_time = ? AND slitm_cd = ?""",
+            [(run_id, d, t, c) for d, t, c, _ in rows],
+        )
+        if commit:
+            self.conn.commit()
+
+    def finish_run(self, run_id: int):
+        """실행의 항목 수를 확정하고 커밋합니다."""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE runs SET item_count = (SELECT COUNT(*) FROM observations WHERE run_id = ?) "
+                "WHERE run_id = ?",
+                (run_id, run_id),
+            )
+
+    def latest_runs(self, limit: int = 10) -> list:
+        return self.conn.execute(
+            "SELECT run_id, run_at, item_count, tier FROM runs ORDER BY run_id DESC LIMIT ?", (limit,)
+        ).fetchall()
+
+    def last_run_at(self, tier: str = None):
+        """마지막 실행(tier를 주면 그 계층의 마지막 실행) 시각. 없으면 None."""
+        if tier is None:
+            row = self.conn.execute("SELECT MAX(run_at) FROM runs").fetchone()
+        else:
+            row = self.conn.execute("SELECT MAX(run_at) FROM runs WHERE tier = ?", (tier,)).fetchone()
+        return datetime.datetime.strptime(row[0], "%Y-%m-%d %H:%M:%S") if row[0] else None
+
+    def run_slots(self, run_id: int) -> list:
+        """한 실행에서 관측된 슬롯을 수집 순서대로 반환합니다."""
+        return self.conn.execute(
+            """SELECT s.* FROM observations o JOIN slots s USING (slot_id)
+               WHERE o.run_id = ? ORDER BY o.rowid""",
+            (run_id,),
+        ).fetchall()
+
+    def run_results(self, run_id: int = None, tier: str = None) -> list:
+        """한 실행(기본: 마지막 실행, tier를 주면 그 계층의 마지막 실행)의 슬롯을
+        크롤러 결과 형식(날짜/방송시간/상품코드/상품명)으로 반환합니다."""
+        if run_id is None:
+            row = self.conn.execute(
+                "SELECT MAX(run_id) FROM runs" + (" WHERE tier = ?" if tier else ""), (tier,) if tier else ()
+            ).fetchone()
+            if row[0] is None:
+                return []
+            run_id = row[0]
+        return [
+            {"날짜": to_mmdd(r["brod_date"]), "방송시간": r["brod_time"],
+             "상품코드": r["slitm_cd"], "상품명": r["slitm_nm"]}
+            for r in self.run_slots(run_id)
+        ]
+
+    def slots_between(self, date_from: str, date_to: str) -> list:
+        """날짜 범위(YYYY-MM-DD, 양끝 포함)의 슬롯을 반환합니다."""
+        return self.conn.execute(
+            """SELECT * FROM slots WHERE brod_date BETWEEN ? AND ?
+               ORDER BY brod_date, brod_time, slitm_cd""",
+            (date_from, date_to),
+        ).fetchall()
+
+    def product_history(self, code: str) -> list:
+        """상품코드 하나의 방송 이력을 반환합니다."""
+        return self.conn.execute(
+            "SELECT * FROM slots WHERE slitm_cd = ? ORDER BY brod_date, brod_time", (code,)
+        ).fetchall()
+
+    def diff_runs(self, old_run: int, new_run: int) -> dict:
+        """두 실행 사이에 추가/삭제된 슬롯을 반환합니다."""
+        query = """SELECT s.* FROM observations o JOIN slots s USING (slot_id)
+                   WHERE o.run_id = ? AND o.slot_id NOT IN
+                       (SELECT slot_id FROM observations WHERE run_id = ?)
+                   ORDER BY s.brod_date, s.brod_time"""
+        return {
+            "added": self.conn.execute(query, (new_run, old_run)).fetchall(),
+            "removed": self.conn.execute(query, (old_run, new_run)).fetchall(),
+        }
+
+    def export_csv(self, filename: str, run_id: int = None) -> int:
+        """한 실행(기본: 마지막 실행)의 슬롯을 기존 CSV 형식으로 내보냅니다."""
+        rows = self.run_results(run_id)
+        with open(filename, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.writer(f)
+            writer.writerow(["날짜", "방송시간", "상품코드", "상품명"])
+            for item in rows:
+                writer.writerow([item["날짜"], item["방송시간"], item["상품코드"], item["상품명"]])
+        return len(rows)
+
+
+def _print_slots(rows):
+    for r in rows:
+        print(f"{r['brod_date']} {r['brod_time']}  {r['slitm_cd']}  {r['slitm_nm']}"
+              f"  (관측 {r['first_seen']} ~ {r['last_seen']})")
+    print(f"— {len(rows)}건")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="현대홈쇼핑 편성표 이력 조회")
+    parser.add_argument("--db", default=HISTORY_DB, help="이력 DB 경로")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_runs = sub.add_parser("runs", help="최근 실행 목록")
+    p_runs.add_argument("--limit", type=int, default=10)
+
+    p_slots = sub.add_parser("slots", help="날짜 범위의 방송 슬롯")
+    p_slots.add_argument("--from", dest="date_from", required=True, help="YYYY-MM-DD")
+    p_slots.add_argument("--to", dest="date_to", help="YYYY-MM-DD (기본: --from과 같음)")
+
+    p_product = sub.add_parser("product", help="상품코드 하나의 방송 이력")
+    p_product.add_argument("code")
+
+    p_diff = sub.add_parser("diff", help="두 실행 사이의 변경 (기본: 마지막 두 실행)")
+    p_diff.add_argument("old_run", type=int, nargs="?")
+    p_diff.add_argument("new_run", type=int, nargs="?")
+
+    p_export = sub.add_parser("export", help="실행 결과를 CSV로 내보내기")
+    p_export.add_argument("filename")
+    p_export.add_argument("--run", type=int, help="run_id (기본: 마지막 실행)")
+
+    args = parser.parse_args(argv)
+
+    with HistoryStore(args.db) as store:
+        if args.command == "runs":
+            for r in store.latest_runs(args.limit):
+                print(f"#{r['run_id']}  {r['run_at']}  {r['tier']:<4}  {r['item_count']}개")
+        elif args.command == "slots":
+            _print_slots(store.slots_between(args.date_from, args.date_to or args.date_from))
+        elif args.command == "product":
+            _print_slots(store.product_history(args.code))
+        elif args.command == "diff":
+            old_run, new_run = args.old_run, args.new_run
+            if old_run is None or new_run is None:
+                latest = store.latest_runs(2)
+                if len(latest) < 2:
+                    print("비교할 실행이 두 개 이상 필요합니다.")
+                    return
+                new_run, old_run = latest[0]["run_id"], latest[1]["run_id"]
+            changes = store.diff_runs(old_run, new_run)
+            print(f"#{old_run} → #{new_run}")
+            print(f"➕ 추가 {len(changes['added'])}건")
+            _print_slots(changes["added"])
+            print(f"➖ 삭제 {len(changes['removed'])}건")
+            _print_slots(changes["removed"])
+        elif args.command == "export":
+            count = store.export_csv(args.filename, args.run)
+            print(f"💾 CSV 저장: {args.filename} ({count}개)")
+
+
+if __name__ == "__main__":
+    main()
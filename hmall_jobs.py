@@ -0,0 +1,142 @@
+"""(날짜 탭 × 채널 필터) 크롤링 작업을 제한된 페이지 풀에서 동시에 실행하는 스케줄러"""
+import asyncio
+import datetime
+import re
+from dataclasses import dataclass, field
+
+
+@dataclass
+class CrawlJob:
+    """날짜 탭 하나와 채널 필터 하나에 대한 수집 작업"""
+    day_label: str          # 날짜 탭 버튼 텍스트 (예: "오늘", "23\n월")
+    channel: str            # 채널 필터 버튼 텍스트 (예: "TV쇼핑")
+    date: str               # 이 탭의 날짜 ("MM.DD")
+    later_dates: frozenset = field(default_factory=frozenset)  # 다른 작업이 맡는 이후 날짜
+
+    @property
+    def name(self) -> str:
+        label = self.day_label.replace(chr(10), ' ')
+        return f"{label}/{self.channel}" if self.channel else label
+
+
+def tab_date(label: str, today: datetime.datetime) -> str:
+    """날짜 탭 텍스트("오늘", "내일", "23\\n월")를 'MM.DD'로 변환합니다."""
+    if "오늘" in label:
+        return today.strftime("%m.%d")
+    if "내일" in label:
+        return (today + datetime.timedelta(days=1)).strftime("%m.%d")
+    m = re.search(r"(\d{1,2})", label)
+    if not m:
+        return today.strftime("%m.%d")
+    day = int(m.group(1))
+    # 편성표 탭은 어제~2주 뒤 범위이므로 그 안에서 일(day)이 맞는 날짜를 찾음 (월·연 넘김 포함)
+    for offset in range(-1, 15):
+        candidate = today + datetime.timedelta(days=offset)
+        if candidate.day == day:
+            return candidate.strftime("%m.%d")
+    return today.strftime("%m.%d")
+
+
+def build_jobs(day_labels: list, channels: list, today: datetime.datetime, to_date=tab_date) -> list:
+    """날짜 탭 × 채널 조합으로 작업 목록을 만듭니다. to_date(label, today)는 탭 라벨의 'MM.DD'."""
+    dates = [to_date(label, today) for label in day_labels]
+    jobs = []
+    for i, label in enumerate(day_labels):
+        later = frozenset(dates[i + 1:]) - {dates[i]}
+        for channel in channels:
+            jobs.append(CrawlJob(day_label=label, channel=channel, date=dates[i], later_dates=later))
+    return jobs
+
+
+async def stream_jobs(jobs: list, worker, pool_size: int, timeout: float, retries: int,
+                      failed: list = None, queue_size: int = 64):
+    """작업을 최대 pool_size개씩 동시에 실행하며 새 항목 배치를 작업 순서대로 흘려보내는 async generator.
+
+    worker(job, emit)는 수집 중 새 항목 리스트를 await emit(items)로 넘길 수 있고,
+    끝나면 { key: item }을 반환합니다 (emit하지 않은 나머지는 완료 시 흘려보냄).
+    앞선 작업이 끝나기 전에 뒤 작업이 넘긴 항목은 버퍼에 두었다가 순서가 오면 내보내므로
+    출력 순서는 작업 순서(jobs)를 따르고, (날짜, 방송시간, 상품코드) 중복은 제거됩니다.
+    실패한 작업은 failed 리스트에 추가됩니다 (실패 전에 넘긴 항목은 유지).
+    """
+    failed = [] if failed is None else failed
+    out = asyncio.Queue(maxsize=queue_size)
+    lock = asyncio.Lock()
+    index = {job.name: i for i, job in enumerate(jobs)}
+    buffers = {i: [] for i in range(len(jobs))}
+    finished = set()
+    seen = set()
+    head = 0
+
+    async def release(items):
+        batch = []
+        for item in items:
+            key = (item["날짜"], item["방송시간"], item["상품코드"])
+            if key not in seen:
+                seen.add(key)
+                batch.append(item)
+        if batch:
+            await out.put(batch)
+
+    async def emit(i, items):
+        async with lock:
+            if i == head:
+                await release(items)
+            else:
+                buffers[i].extend(items)
+
+    async def finish(i, results):
+        nonlocal head
+        async with lock:
+            if results:
+                if i == head:
+                    await release(results.values())
+                else:
+                    buffers[i].extend(results.values())
+            finished.add(i)
+            while head in finished:
+                head += 1
+                if head < len(jobs):
+                    await release(buffers.pop(head))
+
+    queue = asyncio.Queue()
+    for job in jobs:
+        queue.put_nowait(job)
+
+    async def pool_worker():
+        while True:
+            try:
+                job = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            i = index[job.name]
+            for attempt in range(retries + 1):
+                try:
+                    results = await asyncio.wait_for(worker(job, lambda items: emit(i, items)), timeout)
+                    print(f"  ✔ [{job.name}] {len(results)}개 수집")
+                    break
+                except Exception as e:
+                    reason = "시간 초과" if isinstance(e, asyncio.TimeoutError) else e
+                    print(f"  ⚠️ [{job.name}] 실패 ({attempt + 1}/{retries + 1}): {reason}")
+            else:
+                failed.append(job)
+                results = {}
+            await finish(i, results)
+
+    async def produce():
+        try:
+            await asyncio.gather(*(pool_worker() for _ in range(max(1, min(pool_size, len(jobs))))))
+        finally:
+            await out.put(None)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            batch = await out.get()
+            if batch is None:
+                break
+            yield batch
+        await producer
+    finally:
+        if not producer.done():
+            producer.cancel()
+
@@ -0,0 +1,194 @@
+"""실행별 계측 — 단계별 시간, 스크롤별 추출 비용, API 지연, 브라우저 메모리
+
+한 실행(run_once)에 RunMetrics 하나를 만들어 크롤러의 stats dict("metrics")로 넘기고,
+끝나면 JSON 리포트(METRICS_FILE)와 선택적으로 Prometheus 텍스트 형식으로 기록합니다.
+동시에 도는 페이지들의 단계 시간은 합산되므로 벽시계 시간보다 클 수 있습니다.
+"""
+import contextlib
+import datetime
+import json
+import os
+import time
+
+# CDP Performance.getMetrics에서 남길 항목
+BROWSER_METRICS = (
+    "JSHeapUsedSize", "JSHeapTotalSize", "Nodes", "Documents", "JSEventListeners",
+    "LayoutCount", "RecalcStyleCount", "LayoutDuration", "ScriptDuration", "TaskDuration",
+)
+
+
+def _quantile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class RunMetrics:
+    """한 실행의 계측값을 모읍니다."""
+
+    def __init__(self):
+        self.started_at = datetime.datetime.now()
+        self._started = time.perf_counter()
+        self.seconds = None
+        self.outcome = None
+        self.phases = {}       # { 단계: [횟수, 초] }
+        self.scrolls = []      # [{"job", "seconds", "bytes", "items"}] — job은 작업 이름 (DOM·API 수집 공통)
+        self.api = {}          # { API 이름: [지연(초), ...] }
+        self.api_errors = {}   # { API 이름: 실패 수 }
+        self.browser = []      # [{"label", CDP 지표...}]
+        self.counters = {}     # { 이름: 값 } — 항목 수, 스크롤 수 등
+
+    def add_phase(self, name: str, seconds: float):
+        entry = self.phases.setdefault(name, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """with metrics.phase("goto"): await page.goto(...) 처럼 감싼 구간의 시간을 잽니다."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, time.perf_counter() - started)
+
+    def record_scroll(self, job: str, seconds: float, payload_bytes: int, items: int):
+        """스크롤 1회(또는 API 응답 1건)의 추출 시간, 페이지에서 넘어온 크기, 새 항목 수"""
+        self.scrolls.append({"job": job, "seconds": seconds, "bytes": payload_bytes, "items": items})
+
+    def record_api(self, name: str, seconds: float, ok: bool = True):
+        self.api.setdefault(name, []).append(seconds)
+        if not ok:
+            self.api_errors[name] = self.api_errors.get(name, 0) + 1
+
+    @contextlib.contextmanager
+    def api_call(self, name: str):
+        """감싼 호출의 지연을 API 지연으로 기록합니다 (예외가 나면 실패로 집계)."""
+        started = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record_api(name, time.perf_counter() - started, ok)
+
+    def count(self, name: str, value: float = 1):
+        """카운터를 더합니다 (예: 작업 수 "jobs", 재시도 "job_retries", 실패 작업 "failed_jobs")."""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    async def sample_browser(self, page, label: str):
+        """CDP Performance.getMetrics로 페이지의 JS 힙·DOM 노드·레이아웃 비용을 기록합니다 (Chromium 전용)."""
+        try:
+            session = await page.context.new_cdp_session(page)
+            await session.send("Performance.enable")
+            result = await session.send("Performance.getMetrics")
+            await session.detach()
+        except Exception:
+            return
+        values = {m["name"]: m["value"] for m in result.get("metrics", []) if m["name"] in BROWSER_METRICS}
+        self.browser.append({"label": label, **values})
+
+    def finish(self, outcome: str):
+        self.outcome = outcome
+        self.seconds = time.perf_counter() - self._started
+
+    def report(self) -> dict:
+        """JSON으로 쓸 수 있는 요약"""
+        seconds = self.seconds if self.seconds is not None else time.perf_counter() - self._started
+        scroll_seconds = [s["seconds"] for s in self.scrolls]
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "seconds": seconds,
+            "outcome": self.outcome,
+            "counters": self.counters,
+            "phases": {name: {"count": c, "seconds": s} for name, (c, s) in sorted(self.phases.items())},
+            "scroll_summary": {
+                "count": len(self.scrolls),
+                "seconds": sum(scroll_seconds),
+                "p50_seconds": _quantile(scroll_seconds, 0.5),
+                "p90_seconds": _quantile(scroll_seconds, 0.9),
+                "bytes": sum(s["bytes"] for s in self.scrolls),
+                "items": sum(s["items"] for s in self.scrolls),
+            },
+            "scrolls": self.scrolls,
+            "api": {
+                name: {
+                    "count": len(values),
+                    "errors": self.api_errors.get(name, 0),
+                    "seconds": sum(values),
+                    "p50_seconds": _quantile(values, 0.5),
+                    "p90_seconds": _quantile(values, 0.9),
+                    "max_seconds": max(values),
+                }
+                for name, values in sorted(self.api.items())
+            },
+            "browser": self.browser,
+        }
+
+    def write_json(self, path: str):
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+
+    def to_prometheus(self) -> str:
+        """마지막 실행 값을 게이지로 내보내는 Prometheus 텍스트 형식 (node_exporter textfile collector용)"""
+        report = self.report()
+        lines = []
+
+        def metric(name, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                value = repr(float(value))
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        metric("hmall_run_seconds", "Wall time of the last crawl run.", [({}, report["seconds"])])
+        metric("hmall_run_timestamp_seconds", "Start time of the last crawl run.",
+               [({}, self.started_at.timestamp())])
+        metric("hmall_run_outcome", "Outcome of the last crawl run (1 for the current outcome).",
+               [({"outcome": report["outcome"] or "unknown"}, 1)])
+        metric("hmall_run_counter", "Per-run counters (items, scrolls, ...).",
+               [({"name": name}, value) for name, value in sorted(report["counters"].items())])
+        metric("hmall_phase_seconds", "Cumulative time spent per phase across pages.",
+               [({"phase": name}, p["seconds"]) for name, p in report["phases"].items()])
+        metric("hmall_phase_count", "Number of times each phase ran.",
+               [({"phase": name}, p["count"]) for name, p in report["phases"].items()])
+        summary = report["scroll_summary"]
+        metric("hmall_scroll_extract_seconds", "Per-scroll extraction time.",
+               [({"stat": "sum"}, summary["seconds"]), ({"stat": "p50"}, summary["p50_seconds"]),
+                ({"stat": "p90"}, summary["p90_seconds"])])
+        metric("hmall_scroll_payload_bytes", "Bytes returned by page-side extraction over the run.",
+               [({}, summary["bytes"])])
+        api_samples = []
+        for name, a in report["api"].items():
+            api_samples += [({"api": name, "stat": "count"}, a["count"]), ({"api": name, "stat": "errors"}, a["errors"]),
+                            ({"api": name, "stat": "p50"}, a["p50_seconds"]), ({"api": name, "stat": "p90"}, a["p90_seconds"]),
+                            ({"api": name, "stat": "max"}, a["max_seconds"])]
+        metric("hmall_api_latency_seconds", "API call latency per endpoint.", api_samples)
+        if self.browser:
+            peak = {key: max(s.get(key, 0) for s in self.browser) for key in ("JSHeapUsedSize", "Nodes")}
+            metric("hmall_browser_peak", "Peak browser metrics sampled via CDP.",
+                   [({"metric": key}, value) for key, value in peak.items()])
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp, path)
+
+    def print_summary(self):
+        report = self.report()
+        top = sorted(report["phases"].items(), key=lambda kv: kv[1]["seconds"], reverse=True)[:5]
+        print(f"⏱️ 실행 {report['seconds']:.1f}s ({report['outcome']}) — "
+              + ", ".join(f"{name} {p['seconds']:.1f}s" for name, p in top))
+
+
+def metrics_of(stats: dict) -> RunMetrics:
+    """크롤러 stats dict에 담긴 RunMetrics (없으면 만들어 넣음)"""
+    if stats is None:
+        return RunMetrics()
+    return stats.setdefault("metrics", RunMetrics())
@@ -0,0 +1,120 @@
+"""수집 항목 정규화·중복 제거 단계 (열 단위 배치)
+
+수집기가 넘긴 항목을 한 건씩 정규화하는 대신 배치를 열(방송시간/상품코드/상품명/날짜 표기)로
+받아 한 번에 처리합니다.
+
+- 날짜 표기("오늘", "내일", "2월 23일")는 실행을 시작할 때 한 번 만든 조회 표로 'MM.DD'로 바꿉니다.
+  표는 오늘 앞뒤 날짜를 실제 날짜 계산으로 만들어 연 넘김(12월 31일 → 1월 1일)을 포함하며,
+  표에 없는 표기만 어댑터의 해석 함수로 한 번 해석해 표에 더합니다.
+- 배치 전체의 (날짜, 방송시간, 상품코드) 키를 한 번에 해시해 이미 본 키를 집합 연산으로
+  걸러냅니다. 새 항목이 없는 배치는 레코드를 만들지 않습니다.
+- 상품명은 새 항목에만, 컴파일된 패턴(hmall_catalog.clean_name)으로 가격·버튼 문구를
+  떼어 냅니다 (같은 상품명은 한 번만 처리). 버튼 문구만 잡힌 상품명은 빈 이름이 되어
+  카탈로그 조인(hmall_catalog.ProductCatalog.join)이 채웁니다.
+
+속도 비교는 bench_normalize.py 참고.
+"""
+import datetime
+from itertools import repeat
+from operator import itemgetter
+
+from hmall_catalog import clean_name
+from hmall_extract import normalize_date
+
+DATE_TABLE_PAST_DAYS = 7      # 조회 표에 미리 넣는 지난 날짜 수
+DATE_TABLE_FUTURE_DAYS = 21   # 조회 표에 미리 넣는 앞날짜 수 (편성표는 2주 앞까지)
+
+_ITEM_COLUMNS = itemgetter("time", "code", "name", "itemDate")
+
+
+class RawBatch:
+    """수집기 drain 결과({time, code, name, itemDate} 리스트)의 열 단위 표현"""
+    __slots__ = ("times", "codes", "names", "dates")
+
+    def __init__(self, times: list, codes: list, names: list, dates: list):
+        self.times = times
+        self.codes = codes
+        self.names = names
+        self.dates = dates
+
+    @classmethod
+    def from_items(cls, items: list) -> "RawBatch":
+        if not items:
+            return cls([], [], [], [])
+        return cls(*map(list, zip(*map(_ITEM_COLUMNS, items))))
+
+    def __len__(self):
+        return len(self.codes)
+
+
+def date_table(today: datetime.datetime, resolve=normalize_date) -> dict:
+    """{ 날짜 표기: 'MM.DD' } — 오늘·내일과 오늘 앞뒤 날짜의 "N월 N일"/"N월N일" 표기"""
+    raws = ["오늘", "내일"]
+    for offset in range(-DATE_TABLE_PAST_DAYS, DATE_TABLE_FUTURE_DAYS + 1):
+        day = today + datetime.timedelta(days=offset)
+        raws += [f"{day.month}월 {day.day}일", f"{day.month}월{day.day}일"]
+    table = {raw: resolve(raw, None, today) for raw in raws}
+    return {raw: value for raw, value in table.items() if value is not None}
+
+
+class RecordNormalizer:
+    """작업 하나의 수집 항목을 배치 단위로 정규화하고 이미 본 항목을 걸러냅니다.
+
+    resolve(날짜 표기, fallback, today)는 어댑터의 normalize_date입니다. 날짜로 해석되지 않는
+    표기는 add에 넘긴 fallback(작업 날짜)이 됩니다.
+    """
+
+    def __init__(self, today: datetime.datetime = None, resolve=normalize_date):
+        self.today = today or datetime.datetime.now()
+        self.resolve = resolve
+        self.dates = date_table(self.today, resolve)
+        self.undated = set()    # 날짜로 해석되지 않는 표기 (fallback 사용)
+        self.seen = set()       # 이미 내보낸 (날짜, 방송시간, 상품코드)
+        self._names = {}
+        self.stats = {"items": 0, "new": 0}
+
+    def _learn(self, raws):
+        """조회 표에 없는 날짜 표기만 한 번 해석해 표에 더합니다."""
+        for raw in set(raws) - self.dates.keys() - self.undated:
+            value = self.resolve(raw, None, self.today) if raw else None
+            if value is None:
+                self.undated.add(raw)
+            else:
+                self.dates[raw] = value
+
+    def date(self, raw: str, fallback: str) -> str:
+        """날짜 표기 하나를 'MM.DD'로 바꿉니다."""
+        self._learn((raw,))
+        return self.dates.get(raw, fallback)
+
+    def clean(self, name: str) -> str:
+        cleaned = self._names.get(name)
+        if cleaned is None:
+            cleaned = self._names[name] = clean_name(name)
+        return cleaned
+
+    def add(self, batch: RawBatch, fallback: str) -> list:
+        """배치에서 처음 보는 항목만 날짜/방송시간/상품코드/상품명 레코드로 반환합니다 (배치 순서 유지)."""
+        n = len(batch)
+        self.stats["items"] += n
+        if not n:
+            return []
+        self._learn(batch.dates)
+        dates = list(map(self.dates.get, batch.dates, repeat(fallback, n)))
+        keys = list(zip(dates, batch.times, batch.codes))
+        # 키별 첫 위치 (뒤에서부터 넣어 앞쪽 위치가 남음)
+        first = dict(zip(reversed(keys), range(n - 1, -1, -1)))
+        new = first.keys() - self.seen
+        if not new:
+            return []
+        self.seen |= new
+
+        times, codes, names = batch.times, batch.codes, batch.names
+        records = [{
+            "날짜": dates[i],
+            "방송시간": times[i],
+            "상품코드": codes[i],
+            "상품명": self.clean(names[i]),
+        } for i in sorted(map(first.__getitem__, new))]
+        self.stats["new"] += len(records)
+        return records
@@ -0,0 +1,234 @@
+"""수집 결과 스트리밍 파이프라인 — 여러 저장 대상(sink)이 배치를 동시에 소비합니다.
+
+크롤러(async generator)가 내보내는 항목 배치를 sink마다 크기 제한 큐로 나눠 주므로,
+느린 sink는 크롤러를 잠시 멈추게 할 뿐(backpressure) 메모리를 무한히 쓰지 않습니다.
+sink는 첫 배치가 도착할 때 엽니다 (변경 없음으로 건너뛴 실행은 아무것도 열지 않음).
+한 sink가 실패해도 나머지는 계속 기록하며, 실패는 run_pipeline의 반환값에 담깁니다.
+크롤러가 도중에 예외로 끝나면 sink는 close 대신 abort되어 반쪽 결과를 남기지 않습니다.
+"""
+import asyncio
+import contextlib
+import csv
+import json
+import os
+import sys
+import time
+
+from hmall_history import HistoryStore
+
+SINK_QUEUE_SIZE = 32   # sink별 대기 배치 수 상한
+
+_ABORT = object()
+
+
+class Sink:
+    """저장 대상 기본형: open → write(batch)* → close (수집 실패 시 abort)"""
+    name = "sink"
+
+    async def open(self):
+        pass
+
+    async def write(self, batch: list):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+    async def abort(self):
+        pass
+
+
+class HistorySink(Sink):
+    """배치가 올 때마다 이력 저장소(SQLite)에 기록합니다. 커밋은 close 때 한 번.
+
+    keep(항목)을 주면 참인 항목만 기록합니다 (hot 수집에서 이전 실행에서 이어 붙인 편성은
+    이번 실행의 관측이 아니므로 first_seen/last_seen/observations에 남기지 않음).
+    """
+    name = "history"
+
+    def __init__(self, tier: str = "full", path: str = None, keep=None):
+        self.tier = tier
+        self.path = path
+        self.keep = keep
+        self.store = None
+        self.run_id = None
+
+    async def open(self):
+        self.store = HistoryStore(self.path) if self.path else HistoryStore()
+        self.run_id = self.store.begin_run(tier=self.tier, commit=False)
+
+    async def write(self, batch: list):
+        if self.keep is not None:
+            batch = [item for item in batch if self.keep(item)]
+        self.store.add_batch(self.run_id, batch, commit=False)
+
+    async def close(self):
+        self.store.finish_run(self.run_id)
+        self.store.close()
+        print(f"🗄️ 이력 저장: #{self.run_id} ({self.tier})")
+
+    async def abort(self):
+        self.store.conn.rollback()
+        self.store.close()
+
+
+class CsvSink(Sink):
+    """배치가 올 때마다 CSV 행(fields 열)을 씁니다. 임시 파일에 쓰고 끝나면 교체합니다."""
+    name = "csv"
+
+    def __init__(self, filename: str = "hmall_schedule.csv", fields: tuple = ("날짜", "방송시간", "상품코드", "상품명")):
+        self.filename = filename
+        self.fields = fields
+        self.count = 0
+        self._file = None
+        self._writer = None
+
+    async def open(self):
+        self._file = open(self.filename + ".tmp", "w", newline="", encoding="utf-8-sig")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.fields)
+
+    async def write(self, batch: list):
+        self._writer.writerows([item[field] for field in self.fields] for item in batch)
+        self._file.flush()
+        self.count += len(batch)
+
+    async def close(self):
+        self._file.close()
+        os.replace(self.filename + ".tmp", self.filename)
+        print(f"💾 CSV 저장: {self.filename} ({self.count}개)")
+
+    async def abort(self):
+        self._file.close()
+        os.remove(self.filename + ".tmp")
+
+
+def stdout_reserved(jsonl: str = None):
+    """jsonl이 "-"(표준 출력)이면 그동안의 진행 상황 print()를 표준 오류로 돌립니다.
+
+    JsonlSink("-")는 원래 표준 출력(sys.__stdout__)에 쓰므로 파이프에는 JSONL만 남습니다.
+    """
+    return contextlib.redirect_stdout(sys.stderr) if jsonl == "-" else contextlib.nullcontext()
+
+
+class JsonlSink(Sink):
+    """항목마다 JSON 한 줄을 씁니다 (path가 "-"면 표준 출력, stdout_reserved와 함께 사용)."""
+    name = "jsonl"
+
+    def __init__(self, path: str = "-"):
+        self.path = path
+        self._file = None
+
+    async def open(self):
+        self._file = sys.__stdout__ if self.path == "-" else open(self.path, "w", encoding="utf-8")
+
+    async def write(self, batch: list):
+        for item in batch:
+            self._file.write(json.dumps(item, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    async def close(self):
+        if self._file is not sys.__stdout__:
+            self._file.close()
+
+    async def abort(self):
+        await self.close()
+
+
+class BufferedSink(Sink):
+    """배치를 모아 두었다가 close 때 코루틴 함수 flush(results, prepared)로 한 번에 씁니다.
+
+    Google Sheets처럼 전체 격자가 있어야 쓸 수 있는 대상용입니다. prepare()(인증, 기존
+    시트 읽기 등)는 open 때 태스크로 시작해 수집과 겹쳐 실행됩니다. 수집이 중단되면
+    prepare 결과를 discard(prepared)로 정리합니다.
+    """
+
+    def __init__(self, name: str, flush, prepare=None, discard=None):
+        self.name = name
+        self.flush = flush
+        self.prepare = prepare
+        self.discard = discard
+        self.results = []
+        self._prepared = None
+
+    async def open(self):
+        if self.prepare is not None:
+            self._prepared = asyncio.ensure_future(self.prepare())
+
+    async def write(self, batch: list):
+        self.results.extend(batch)
+
+    async def close(self):
+        prepared = await self._prepared if self._prepared is not None else None
+        await self.flush(self.results, prepared)
+
+    async def abort(self):
+        if self._prepared is None:
+            return
+        try:
+            prepared = await self._prepared
+        except Exception:
+            return
+        if self.discard is not None:
+            await self.discard(prepared)
+
+
+async def run_pipeline(source, sinks: list, queue_size: int = SINK_QUEUE_SIZE) -> dict:
+    """source(항목 배치의 async iterable)를 모든 sink에 동시에 흘려보냅니다.
+
+    반환값: {"items": 전체 항목 수, "failed": {sink 이름: 예외}, "seconds": {sink 이름: 기록에 쓴 초}}
+    """
+    failed = {}
+    seconds = {}
+    queues, tasks = [], []
+
+    async def consume(sink, queue):
+        ended = False
+        busy = 0.0   # 큐를 기다린 시간을 뺀, 실제로 기록하는 데 쓴 시간
+
+        async def timed(call):
+            nonlocal busy
+            started = time.perf_counter()
+            try:
+                await call
+            finally:
+                busy += time.perf_counter() - started
+                seconds[sink.name] = busy
+
+        try:
+            await timed(sink.open())
+            while True:
+                batch = await queue.get()
+                if batch is None or batch is _ABORT:
+                    break
+                await timed(sink.write(batch))
+            ended = True
+            if batch is _ABORT:
+                await timed(sink.abort())
+            else:
+                await timed(sink.close())
+        except Exception as e:
+            failed[sink.name] = e
+            print(f"❌ [{sink.name}] 저장 실패: {e}")
+            # 크롤러가 막히지 않도록 남은 배치는 버림
+            while not ended and await queue.get() not in (None, _ABORT):
+                pass
+
+    items = 0
+    end = _ABORT
+    try:
+        async for batch in source:
+            if not tasks:
+                for sink in sinks:
+                    queue = asyncio.Queue(maxsize=queue_size)
+                    queues.append(queue)
+                    tasks.append(asyncio.create_task(consume(sink, queue)))
+            items += len(batch)
+            for queue in queues:
+                await queue.put(batch)
+        end = None
+    finally:
+        for queue in queues:
+            await queue.put(end)
+        await asyncio.gather(*tasks)
+    return {"items": items, "failed": failed, "seconds": seconds}
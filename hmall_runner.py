@@ -0,0 +1,120 @@
+"""여러 홈쇼핑 사이트를 Chromium 하나에서 함께 수집하는 러너
+
+사이트(어댑터, hmall_sites.py)마다 브라우저 컨텍스트를 따로 만들어 쿠키와 사용자
+에이전트를 분리하고, 동시에 여는 페이지 수는 어댑터의 pool_size로 사이트별로 제한합니다.
+모든 사이트의 결과는 공통 레코드 스키마(RECORD_FIELDS: 사이트/날짜/방송시간/상품코드/상품명)로
+하나의 파이프라인(CSV, 선택: JSONL)에 기록됩니다.
+
+사용 예:
+    python hmall_runner.py                        # SITES에 등록된 모든 사이트
+    python hmall_runner.py --site hmall --jsonl -
+"""
+import argparse
+import asyncio
+import datetime
+
+from playwright.async_api import async_playwright
+
+from hmall_blocking import ResourceBlocker
+from hmall_crawler import (BLOCK_RESOURCES, CHANNELS, CRAWL_MODE, PAGE_POOL_SIZE, SCHEDULE_URL, SELECTOR_PROFILE,
+                           stream_site)
+from hmall_pipeline import SINK_QUEUE_SIZE, CsvSink, JsonlSink, run_pipeline, stdout_reserved
+from hmall_sites import RECORD_FIELDS, SITES, HmallAdapter
+
+SITES_CSV = "schedule_all.csv"   # 모든 사이트 결과 (공통 스키마)
+
+
+def default_adapters(names: list = None) -> list:
+    """names(기본: SITES 전체)의 어댑터. H.mall은 hmall_crawler.py 설정(주소, 채널, 페이지 수, 선택자 프로필)을 따릅니다."""
+    adapters = []
+    for name in names or list(SITES):
+        if name == HmallAdapter.name:
+            adapters.append(HmallAdapter(SCHEDULE_URL, CHANNELS, PAGE_POOL_SIZE, SELECTOR_PROFILE))
+        else:
+            adapters.append(SITES[name]())
+    return adapters
+
+
+async def stream_sites(adapters: list, stats: dict = None, mode: str = None):
+    """모든 어댑터를 브라우저 하나에서 동시에 수집하며 공통 스키마 레코드 배치를 도착 순서대로 내보냅니다.
+
+    stats[사이트 이름]에 사이트별 수집 통계(crawl_hmall의 stats와 같은 형식)와 항목 수("items")를
+    남깁니다. 한 사이트가 실패해도 나머지는 계속 수집하며, 실패는 stats[이름]["error"]에 남습니다.
+    """
+    stats = {} if stats is None else stats
+    mode = mode or CRAWL_MODE
+    queue = asyncio.Queue(maxsize=SINK_QUEUE_SIZE)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+
+        async def run_site(adapter):
+            site_stats = stats.setdefault(adapter.name, {"items": 0})
+            context = await browser.new_context(**adapter.context_options)
+            blocker = ResourceBlocker() if BLOCK_RESOURCES else None
+            if blocker:
+                await blocker.install(context)
+            try:
+                async for batch in stream_site(context, blocker, adapter, mode, site_stats):
+                    site_stats["items"] += len(batch)
+                    await queue.put([{"사이트": adapter.name, **item} for item in batch])
+            except Exception as e:
+                site_stats["error"] = str(e)
+                print(f"❌ [{adapter.name}] 수집 실패: {e}")
+            finally:
+                await context.close()
+
+        async def produce():
+            try:
+                await asyncio.gather(*(run_site(adapter) for adapter in adapters))
+            finally:
+                await queue.put(None)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    break
+                yield batch
+            await producer
+        finally:
+            if not producer.done():
+                producer.cancel()
+            await browser.close()
+
+
+async def run_sites(adapters: list, csv_path: str = SITES_CSV, jsonl: str = None) -> dict:
+    """어댑터들을 함께 수집해 공통 스키마 CSV(선택: JSONL)로 저장하고 사이트별 통계를 반환합니다."""
+    print("=" * 50)
+    print(f"  홈쇼핑 편성표 크롤러 — {', '.join(a.name for a in adapters)}")
+    print(f"  실행 시각: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("=" * 50)
+
+    stats = {}
+    sinks = [CsvSink(csv_path, RECORD_FIELDS)]
+    if jsonl:
+        sinks.append(JsonlSink(jsonl))
+    await run_pipeline(stream_sites(adapters, stats), sinks)
+
+    for name, site_stats in stats.items():
+        failed = len(site_stats.get("failed_jobs", []))
+        status = f"실패: {site_stats['error']}" if "error" in site_stats else f"실패 작업 {failed}개"
+        print(f"🏷️ [{name}] {site_stats['items']}개 ({status}, 스크롤 {site_stats.get('scrolls', 0)}회)")
+    return stats
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="여러 홈쇼핑 편성표를 브라우저 하나로 함께 수집")
+    parser.add_argument("--site", action="append", choices=sorted(SITES), help="수집할 사이트 (반복 가능, 기본: 전체)")
+    parser.add_argument("--csv", default=SITES_CSV, help=f"결과 CSV 경로 (기본: {SITES_CSV})")
+    parser.add_argument("--jsonl", metavar="PATH", help="결과를 JSON Lines로도 기록 (\"-\" = 표준 출력)")
+    args = parser.parse_args()
+
+    # --jsonl - 이면 표준 출력은 JSONL 전용, 진행 상황은 표준 오류로
+    with stdout_reserved(args.jsonl):
+        await run_sites(default_adapters(args.site), args.csv, args.jsonl)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
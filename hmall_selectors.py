@@ -0,0 +1,181 @@
+"""자가 보정 선택자 프로필 — 화면 전체를 훑는 대신 보정해 둔 선택자로 바로 찾기
+
+날짜 탭, 채널 필터, 목록 컨테이너, 방송(시간) 컨테이너, 상품 링크, 상품명, '상품 더보기'
+버튼을 찾는 최소한의 안정적인 CSS 선택자를 한 번만 보정(calibrate)해 SELECTOR_PROFILE_FILE에
+저장합니다. 보정은 버튼·링크 전체를 훑지만, 이후 실행은 querySelectorAll 개수만 세는 가벼운
+검사(check)로 프로필이 여전히 맞는지 확인하고 실패할 때만 다시 보정합니다.
+
+해시 클래스(._1jauv3p0, .h84bfs5처럼 빌드마다 바뀌는 이름)는 선택자에 쓰지 않고,
+data-* / role / aria-* 속성과 사람이 붙인 클래스 이름만 사용합니다. 텍스트 비교는
+레이아웃을 강제하는 innerText 대신 textContent로 합니다.
+"""
+import datetime
+import json
+import os
+
+SELECTOR_PROFILE_FILE = ".hmall_selectors.json"
+REQUIRED_KEYS = ("tabs", "items", "links")   # 하나라도 없으면 보정 실패 (기존 전체 탐색으로 동작)
+
+# 보정: 기존 방식(버튼·링크 전체 탐색)으로 요소를 찾고 그 요소들만 가리키는 선택자를 만듦
+_CALIBRATE_SCRIPT = """(channels) => {
+    const hashed = (name) => /\\d/.test(name) && /^[a-z0-9_]+$/i.test(name) && name.length >= 5;
+    const text = (el) => (el.textContent || '').replace(/\\s+/g, ' ').trim();
+    const quote = (v) => '"' + v.replace(/\\\\/g, '\\\\\\\\').replace(/"/g, '\\\\"') + '"';
+    const ATTRS = ['data-testid', 'data-role', 'role', 'aria-label'];
+
+    // 요소들이 공통으로 가진 안정적인 조각 (태그 + 같은 속성 + 해시가 아닌 같은 클래스)
+    const common = (els) => {
+        const tag = els[0].tagName.toLowerCase();
+        let sel = els.every(e => e.tagName.toLowerCase() === tag) ? tag : '';
+        for (const a of ATTRS) {
+            const v = els[0].getAttribute(a);
+            if (v && !/\\d{3,}/.test(v) && els.every(e => e.getAttribute(a) === v)) sel += `[${a}=${quote(v)}]`;
+        }
+        for (const c of els[0].classList) {
+            if (!hashed(c) && els.every(e => e.classList.contains(c))) sel += '.' + CSS.escape(c);
+        }
+        return sel || '*';
+    };
+    const ancestorOf = (els) => {
+        let a = els[0].parentElement;
+        while (a && !els.every(e => a.contains(e))) a = a.parentElement;
+        return a;
+    };
+    // els를 모두 포함하고 그 밖의 요소는 거의 없는 가장 짧은 선택자
+    const group = (els, slack = 2) => {
+        if (!els.length) return null;
+        const own = common(els);
+        const candidates = [own];
+        let a = ancestorOf(els);
+        for (let depth = 0; a && a !== document.documentElement && depth < 5; a = a.parentElement, depth++) {
+            const frag = common([a]);
+            if (frag !== a.tagName.toLowerCase()) candidates.push(`${frag} ${own}`);
+            if (a.id && !hashed(a.id)) candidates.push(`#${CSS.escape(a.id)} ${own}`);
+        }
+        for (const sel of candidates) {
+            let found;
+            try { found = document.querySelectorAll(sel); } catch (e) { continue; }
+            const set = new Set(found);
+            if (els.every(e => set.has(e)) && found.length <= els.length * slack) return sel;
+        }
+        return null;
+    };
+    const firstMatching = (candidates, root = document) =>
+        candidates.filter(sel => root.querySelector(sel)).join(', ') || null;
+
+    const profile = {};
+
+    const tabs = Array.from(document.querySelectorAll('button')).filter(b => {
+        const t = text(b);
+        return t.length < 15 && (t.includes('오늘') || /\\d+/.test(t));
+    });
+    profile.tabs = group(tabs, 1.5);
+
+    const filters = Array.from(document.querySelectorAll('button, a'))
+        .filter(b => channels.some(ch => text(b) === ch));
+    if (filters.length) {
+        const siblings = Array.from(filters[0].parentElement.children)
+            .filter(e => e.tagName === filters[0].tagName);
+        profile.channels = group(siblings);
+    }
+
+    profile.links = firstMatching(['a[href*="slitmCd="]', '[data-slitm-cd]', '[data-slitm_cd]']);
+    const links = profile.links ? Array.from(document.querySelectorAll(profile.links)) : [];
+    if (links.length) {
+        // 링크 안의 상품명 요소 (없으면 수집기가 링크 텍스트를 씀)
+        profile.names = firstMatching(['[aria-label="제품명"]', '.pdname'], links[0]);
+    }
+
+    if (document.querySelector('[data-time]')) {
+        profile.items = '[data-time]';
+    } else if (links.length) {
+        // 시간(HH:MM)이 적힌 가장 가까운 상위 요소를 방송 컨테이너로 봄
+        const owners = [...new Set(links.map(l => {
+            let a = l.parentElement;
+            while (a && !/\\d{2}:\\d{2}/.test(a.textContent || '')) a = a.parentElement;
+            return a;
+        }).filter(Boolean))];
+        profile.items = owners.length ? group(owners, 3) : null;
+    }
+
+    if (document.querySelector('[data-testid="virtuoso-item-list"]')) {
+        profile.list = '[data-testid="virtuoso-item-list"]';
+    } else if (profile.items) {
+        const items = Array.from(document.querySelectorAll(profile.items));
+        const a = items.length ? ancestorOf(items) : null;
+        profile.list = a ? group([a], 1) : null;
+    }
+
+    const more = Array.from(document.querySelectorAll('button')).find(b => text(b).includes('상품 더보기'));
+    profile.more = more ? group([more], 1) : (document.querySelector('.btn_more') ? '.btn_more' : null);
+    return profile;
+}"""
+
+# 검사: 선택자마다 일치하는 요소 수만 셈 (텍스트·레이아웃을 읽지 않음)
+_CHECK_SCRIPT = """(selectors) => {
+    const counts = {};
+    for (const [key, sel] of Object.entries(selectors)) {
+        try { counts[key] = sel ? document.querySelectorAll(sel).length : 0; } catch (e) { counts[key] = -1; }
+    }
+    return counts;
+}"""
+
+
+class SelectorProfile:
+    """사이트 하나의 보정된 선택자 { 키: CSS 선택자 또는 None }"""
+
+    def __init__(self, path: str = SELECTOR_PROFILE_FILE):
+        self.path = path
+        self.selectors = {}
+        self.url = None
+        self.calibrated_at = None
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.selectors = data.get("selectors", {})
+            self.url = data.get("url")
+            self.calibrated_at = data.get("calibrated_at")
+        except (OSError, ValueError):
+            pass
+
+    def get(self, key: str, default: str = None):
+        return self.selectors.get(key) or default
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"url": self.url, "calibrated_at": self.calibrated_at, "selectors": self.selectors},
+                      f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+
+    async def check(self, page) -> list:
+        """프로필 선택자가 현재 페이지에서도 맞는지 확인하고, 맞지 않는 키 목록을 반환합니다."""
+        counts = await page.evaluate(_CHECK_SCRIPT, self.selectors)
+        failed = [key for key in REQUIRED_KEYS if counts.get(key, 0) <= 0]
+        if self.selectors.get("tabs") and counts.get("tabs", 0) < 2:
+            failed.append("tabs")
+        return sorted(set(failed))
+
+    async def calibrate(self, page, url: str, channels: list) -> bool:
+        """페이지를 한 번 훑어 선택자를 다시 만들고 저장합니다. 필수 선택자를 못 찾으면 False."""
+        selectors = await page.evaluate(_CALIBRATE_SCRIPT, list(channels))
+        missing = [key for key in REQUIRED_KEYS if not selectors.get(key)]
+        if missing:
+            print(f"  ⚠️ 선택자 보정 실패 ({', '.join(missing)}) — 전체 탐색으로 수집합니다.")
+            self.selectors = {}
+            return False
+        self.selectors = selectors
+        self.url = url
+        self.calibrated_at = datetime.datetime.now().isoformat(timespec="seconds")
+        self.save()
+        print("  🔧 선택자 보정: " + ", ".join(f"{k}={v}" for k, v in selectors.items() if v))
+        return True
+
+    async def ensure(self, page, url: str, channels: list) -> str:
+        """프로필을 검사하고 필요할 때만 다시 보정합니다. "ok", "calibrated", "failed" 중 하나를 반환."""
+        if self.selectors and self.url == url:
+            failed = await self.check(page)
+            if not failed:
+                return "ok"
+            print(f"  🔧 선택자 프로필이 맞지 않습니다 ({', '.join(failed)}) — 다시 보정합니다.")
+        return "calibrated" if await self.calibrate(page, url, channels) else "failed"
@@ -0,0 +1,342 @@
+"""Google Sheets 증분 동기화 — 전체 삭제 후 재작성 대신 바뀐 셀만 씁니다.
+
+SheetsClient는 Sheets REST API(v4)를 httpx로 직접 호출하는 비동기 클라이언트입니다.
+액세스 토큰은 만료될 때만 갱신하고, 연결은 keep-alive로 재사용합니다. 값 쓰기는
+요청 크기 제한 아래로 나눈 values.batchUpdate로 보내며, 할당량 초과(429)와 일시적인
+서버 오류는 지수 백오프로 재시도합니다. 여러 탭을 한 번에 동기화할 수 있고, 격자보다
+작은 탭은 쓰기 전에 자동으로 늘립니다.
+"""
+import asyncio
+import json
+import os
+import random
+
+import httpx
+from google.auth.transport.requests import Request
+
+SHEET_CACHE_FILE = ".hmall_sheet_cache.json"  # 마지막 업로드 내용 (시트 재조회 생략용)
+KEY_COLUMNS = 3                               # (날짜, 방송시간, 상품코드)
+DATA_COLUMNS = 4                              # 날짜, 방송시간, 상품코드, 상품명
+
+SHEETS_API = "https://sheets.googleapis.com/v4/spreadsheets"
+SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+MAX_CELLS_PER_REQUEST = 20000      # values.batchUpdate 한 번에 보내는 최대 셀 수
+MAX_BYTES_PER_REQUEST = 1_500_000  # 요청 본문 크기 상한 (권장 2MB 아래)
+MAX_RETRIES = 6                    # 429/5xx 재시도 횟수
+BACKOFF_MAX_SECONDS = 64           # 재시도 대기 상한
+NEW_SHEET_ROWS = 1000              # 새 탭을 만들 때 최소 행 수
+GROW_HEADROOM = 0.2                # 탭을 늘릴 때 여유분 (행 수 비율)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def column_letter(index: int) -> str:
+    """0부터 시작하는 열 번호를 A1 표기 열 문자로 변환합니다 (0 → A, 26 → AA)."""
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _pad(row: list, width: int) -> list:
+    row = [str(v) for v in row[:width]]
+    return row + [""] * (width - len(row))
+
+
+def key_diff(old_rows: list, new_rows: list) -> dict:
+    """(날짜, 방송시간, 상품코드) 기준으로 추가/삭제/변경된 행 수를 셉니다 (헤더 제외)."""
+    old = {tuple(r[:KEY_COLUMNS]): _pad(r, DATA_COLUMNS) for r in old_rows if any(r)}
+    new = {tuple(r[:KEY_COLUMNS]): _pad(r, DATA_COLUMNS) for r in new_rows if any(r)}
+    return {
+        "inserted": sum(1 for k in new if k not in old),
+        "removed": sum(1 for k in old if k not in new),
+        "changed": sum(1 for k in new if k in old and old[k] != new[k]),
+    }
+
+
+def build_cell_updates(old_grid: list, new_grid: list) -> list:
+    """두 격자를 비교해 다른 셀만 덮어쓰는 batch_update 범위 목록을 만듭니다.
+
+    행마다 바뀐 열 구간을 잡고, 같은 열 구간을 가진 연속 행은 하나의 범위로
+    합칩니다. 새 격자보다 긴 기존 행은 빈 값으로 지웁니다.
+    """
+    width = max([len(r) for r in old_grid + new_grid] or [0])
+    height = max(len(old_grid), len(new_grid))
+
+    spans = []  # (행 번호, 시작 열, 끝 열, 값)
+    for r in range(height):
+        old = _pad(old_grid[r] if r < len(old_grid) else [], width)
+        new = _pad(new_grid[r] if r < len(new_grid) else [], width)
+        changed = [c for c in range(width) if old[c] != new[c]]
+        if changed:
+            start, end = changed[0], changed[-1]
+            spans.append((r, start, end, new[start:end + 1]))
+
+    updates = []
+    for r, start, end, values in spans:
+        last = updates[-1] if updates else None
+        if last and last["_cols"] == (start, end) and last["_end_row"] == r - 1:
+            last["values"].append(values)
+            last["_end_row"] = r
+        else:
+            updates.append({"_cols": (start, end), "_start_row": r, "_end_row": r, "values": [values]})
+
+    for u in updates:
+        start, end = u.pop("_cols")
+        u["range"] = (
+            f"{column_letter(start)}{u.pop('_start_row') + 1}:"
+            f"{column_letter(end)}{u.pop('_end_row') + 1}"
+        )
+    return updates
+
+
+def load_cached_grids(path: str = SHEET_CACHE_FILE) -> dict:
+    """마지막으로 업로드한 탭별 격자 { 탭 이름: 격자 }를 읽습니다. 없으면 빈 dict."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_cached_grids(grids: dict, path: str = SHEET_CACHE_FILE):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(grids, f, ensure_ascii=False)
+
+
+def a1_range(title: str, cell_range: str = None) -> str:
+    """탭 이름을 따옴표로 감싼 A1 범위 ('크롤링 10.18'!A1:D5)"""
+    quoted = "'" + title.replace("'", "''") + "'"
+    return f"{quoted}!{cell_range}" if cell_range else quoted
+
+
+def chunk_value_ranges(data: list, max_cells: int = MAX_CELLS_PER_REQUEST,
+                       max_bytes: int = MAX_BYTES_PER_REQUEST) -> list:
+    """[{"range", "values"}] 목록을 요청 크기 제한 아래의 묶음들로 나눕니다.
+
+    한 범위가 제한보다 크면 행 단위로 잘라 여러 범위로 보냅니다 (범위는 "탭!A1:D9" 형식).
+    """
+    pieces = []
+    for entry in data:
+        values = entry["values"]
+        width = max([len(row) for row in values] or [1]) or 1
+        rows_per_piece = max(1, max_cells // width)
+        row_bytes = max(1, len(json.dumps(values, ensure_ascii=False).encode("utf-8")) // max(1, len(values)))
+        rows_per_piece = max(1, min(rows_per_piece, max_bytes // row_bytes))
+        if len(values) <= rows_per_piece:
+            pieces.append(entry)
+            continue
+        title, cells = entry["range"].rsplit("!", 1)
+        start, end = cells.split(":")
+        start_col = start.rstrip("0123456789")
+        end_col = end.rstrip("0123456789")
+        first_row = int(start[len(start_col):])
+        for offset in range(0, len(values), rows_per_piece):
+            part = values[offset:offset + rows_per_piece]
+            top = first_row + offset
+            pieces.append({"range": f"{title}!{start_col}{top}:{end_col}{top + len(part) - 1}", "values": part})
+
+    chunks, current, cells, size = [], [], 0, 0
+    for entry in pieces:
+        entry_cells = sum(len(row) for row in entry["values"])
+        entry_size = len(json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+        if current and (cells + entry_cells > max_cells or size + entry_size > max_bytes):
+            chunks.append(current)
+            current, cells, size = [], 0, 0
+        current.append(entry)
+        cells += entry_cells
+        size += entry_size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class SheetsError(Exception):
+    """Sheets API 오류 (재시도 후에도 실패)"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+
+
+class SheetsClient:
+    """스프레드시트 하나에 대한 비동기 Sheets API 클라이언트
+
+    credentials(google-auth 서비스 계정 자격 증명)는 여러 실행에서 재사용할 수 있으며,
+    토큰이 없거나 만료됐을 때만 갱신합니다.
+    """
+
+    def __init__(self, credentials, spreadsheet_id: str, max_retries: int = MAX_RETRIES,
+                 max_cells: int = MAX_CELLS_PER_REQUEST, max_bytes: int = MAX_BYTES_PER_REQUEST):
+        self.credentials = credentials
+        self.spreadsheet_id = spreadsheet_id
+        self.max_retries = max_retries
+        self.max_cells = max_cells
+        self.max_bytes = max_bytes
+        self.requests = 0
+        self.retries = 0
+        self._token_lock = asyncio.Lock()
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(60, connect=15),
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=4),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    async def _token(self, force: bool = False) -> str:
+        async with self._token_lock:
+            if force or not self.credentials.valid:
+                await asyncio.to_thread(self.credentials.refresh, Request())
+            return self.credentials.token
+
+    async def _request(self, method: str, path: str, **kwargs) -> dict:
+        """스프레드시트 경로(path: "", ":batchUpdate", "/values:batchGet" 등)에 인증 헤더를 붙여 요청합니다.
+
+        429/5xx는 지수 백오프로, 401은 토큰을 갱신한 뒤 다시 시도합니다.
+        """
+        url = f"{SHEETS_API}/{self.spreadsheet_id}{path}"
+        refreshed = False
+        for attempt in range(self.max_retries + 1):
+            token = await self._token()
+            self.requests += 1
+            try:
+                resp = await self._client.request(method, url, headers={"Authorization": f"Bearer {token}"},
+                                                  **kwargs)
+            except httpx.TransportError as e:
+                if attempt == self.max_retries:
+                    raise SheetsError(0, str(e)) from e
+                resp = None
+            if resp is not None:
+                if resp.status_code == 401 and not refreshed:
+                    refreshed = True
+                    await self._token(force=True)
+                    continue
+                if resp.status_code < 400:
+                    return resp.json() if resp.content else {}
+                if resp.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    try:
+                        message = resp.json().get("error", {}).get("message", resp.text)
+                    except ValueError:
+                        message = resp.text
+                    raise SheetsError(resp.status_code, message)
+            # Retry-After가 있으면 따르고, 없으면 1, 2, 4, ...초 + 지터
+            retry_after = resp.headers.get("Retry-After") if resp is not None else None
+            delay = float(retry_after) if retry_after and retry_after.isdigit() else 2 ** attempt
+            delay = min(BACKOFF_MAX_SECONDS, delay) + random.uniform(0, 1)
+            self.retries += 1
+            status = resp.status_code if resp is not None else "연결 오류"
+            print(f"   ⏳ Sheets API {status} — {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+            await asyncio.sleep(delay)
+        raise SheetsError(0, "재시도 횟수 초과")
+
+    async def sheet_properties(self) -> dict:
+        """{ 탭 이름: {"sheetId", "rows", "cols"} }"""
+        data = await self._request("GET", "", params={"fields": "sheets.properties"})
+        return {
+            s["properties"]["title"]: {
+                "sheetId": s["properties"]["sheetId"],
+                "rows": s["properties"].get("gridProperties", {}).get("rowCount", 0),
+                "cols": s["properties"].get("gridProperties", {}).get("columnCount", 0),
+            }
+            for s in data.get("sheets", [])
+        }
+
+    async def ensure_sheets(self, sizes: dict) -> dict:
+        """{ 탭 이름: (행 수, 열 수) }보다 작은 탭은 늘리고 없는 탭은 만든 뒤 탭 속성을 반환합니다.
+
+        한 번의 batchUpdate 요청으로 처리합니다.
+        """
+        props = await self.sheet_properties()
+        requests = []
+        for title, (rows, cols) in sizes.items():
+            current = props.get(title)
+            if current is None:
+                requests.append({"addSheet": {"properties": {
+                    "title": title, "gridProperties": {"rowCount": max(rows, NEW_SHEET_ROWS), "columnCount": cols},
+                }}})
+            elif rows > current["rows"] or cols > current["cols"]:
+                grid = {"rowCount": max(current["rows"], int(rows * (1 + GROW_HEADROOM))),
+                        "columnCount": max(current["cols"], cols)}
+                requests.append({"updateSheetProperties": {
+                    "properties": {"sheetId": current["sheetId"], "gridProperties": grid},
+                    "fields": "gridProperties.rowCount,gridProperties.columnCount",
+                }})
+        if requests:
+            await self._request("POST", ":batchUpdate", json={"requests": requests})
+            props = await self.sheet_properties()
+        return props
+
+    async def get_values(self, titles: list) -> dict:
+        """여러 탭의 값을 한 번에 읽습니다 (values.batchGet). 없는 탭은 빈 격자."""
+        if not titles:
+            return {}
+        existing = await self.sheet_properties()
+        present = [t for t in titles if t in existing]
+        grids = {t: [] for t in titles}
+        if present:
+            data = await self._request("GET", "/values:batchGet",
+                                       params=[("ranges", a1_range(t)) for t in present]
+                                       + [("majorDimension", "ROWS")])
+            for title, value_range in zip(present, data.get("valueRanges", [])):
+                grids[title] = value_range.get("values", [])
+        return grids
+
+    async def clear(self, titles: list):
+        await self._request("POST", "/values:batchClear", json={"ranges": [a1_range(t) for t in titles]})
+
+    async def update_values(self, data: list) -> int:
+        """[{"range", "values"}]를 크기 제한 아래로 나눠 values.batchUpdate로 씁니다. 요청 수를 반환합니다."""
+        chunks = chunk_value_ranges(data, self.max_cells, self.max_bytes)
+        for chunk in chunks:
+            await self._request("POST", "/values:batchUpdate",
+                                json={"valueInputOption": "RAW", "data": chunk})
+        return len(chunks)
+
+    async def sync(self, grids: dict, mode: str = "diff", old_grids: dict = None) -> dict:
+        """{ 탭 이름: 격자 }의 모든 탭을 격자와 같아지도록 씁니다. 탭별 통계 dict를 반환합니다.
+
+        mode="diff"면 기존 격자(old_grids에 없는 탭은 시트에서 읽음)와 비교해 바뀐 셀만,
+        "full"이면 탭을 비운 뒤 전체를 씁니다. 모든 탭의 쓰기는 하나의 요청 묶음으로 보냅니다.
+        """
+        old_grids = dict(old_grids or {})
+        if mode == "diff":
+            old_grids.update(await self.get_values([t for t in grids if t not in old_grids]))
+        sizes = {}
+        for title, grid in grids.items():
+            old = old_grids.get(title) or []
+            sizes[title] = (max(len(grid), len(old), 1), max([len(r) for r in grid + old] or [1]))
+        await self.ensure_sheets(sizes)
+
+        data, stats = [], {}
+        if mode == "diff":
+            for title, grid in grids.items():
+                old = old_grids.get(title) or []
+                updates = build_cell_updates(old, grid)
+                data += [{"range": a1_range(title, u["range"]), "values": u["values"]} for u in updates]
+                stats[title] = key_diff(old[1:], grid[1:])
+                stats[title]["ranges"] = len(updates)
+                stats[title]["cells"] = sum(len(row) for u in updates for row in u["values"])
+        else:
+            await self.clear(list(grids))
+            for title, grid in grids.items():
+                if grid:
+                    width = max(len(r) for r in grid)
+                    data.append({"range": a1_range(title, f"A1:{column_letter(width - 1)}{len(grid)}"),
+                                 "values": [_pad(r, width) for r in grid]})
+                stats[title] = {"inserted": max(0, len(grid) - 1), "removed": 0, "changed": 0,
+                                "ranges": 1, "cells": len(grid) * max([len(r) for r in grid] or [0])}
+
+        if data:
+            await self.update_values(data)
+        return stats
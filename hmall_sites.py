@@ -0,0 +1,180 @@
+"""사이트 어댑터 — 홈쇼핑 편성표 사이트마다 다른 부분을 모은 인터페이스
+
+크롤러의 수집 루프(hmall_crawler.py의 stream_site/_crawl_job)는 주소, 컨텍스트 설정,
+날짜 탭 찾기·클릭, 채널 필터, 페이지 내 추출 스크립트, 날짜 해석을 어댑터를 통해서만
+사용합니다. 다른 홈쇼핑 채널은 SiteAdapter를 상속해 이 부분만 구현하고 SITES에 등록하면
+hmall_runner.py로 H.mall과 같은 브라우저에서 함께 수집할 수 있습니다.
+"""
+import abc
+import datetime
+
+from hmall_api import ScheduleResponseCollector
+from hmall_browser import CONTEXT_OPTIONS
+from hmall_collector import drain_collector, install_collector
+from hmall_extract import normalize_date
+from hmall_fastpath import BASE_URL, SCHEDULE_PATH
+from hmall_jobs import tab_date
+from hmall_selectors import SELECTOR_PROFILE_FILE, SelectorProfile
+from hmall_waits import ITEM_SELECTOR, LIST_SELECTOR
+
+# 러너가 모든 사이트의 결과를 기록하는 공통 레코드 스키마
+RECORD_FIELDS = ("사이트", "날짜", "방송시간", "상품코드", "상품명")
+
+
+class SiteAdapter(abc.ABC):
+    """편성표 사이트 하나의 탐색·추출 방법
+
+    수집기(install_collector/drain_collector)는 hmall_collector.py와 같은 형식
+    ({"items": [{"time", "code", "name", "itemDate"}], "lastDate", "lastTime"})을 반환해야 합니다.
+    이 둘은 사이트마다 구현해야 하며(구현하지 않은 어댑터는 만들 수 없음), 나머지는 기본 동작이 있습니다.
+    """
+    name = "site"                    # 레코드의 "사이트" 값
+    url = None                       # 편성표 주소
+    context_options = {}             # 브라우저 컨텍스트 설정 (사용자 에이전트, 뷰포트 등)
+    channels = []                    # 적용할 채널 필터 (비어 있으면 필터 없음)
+    pool_size = 2                    # 이 사이트에 동시에 여는 페이지 수
+    list_selector = "body"           # 목록 변경을 관찰할 컨테이너
+    item_selector = "[data-time]"    # 첫 항목 렌더링 확인용 선택자
+    more_selector = None             # '더보기' 버튼 선택자 (없으면 None)
+
+    async def prepare(self, page):
+        """첫 화면이 열린 뒤 수집 전에 한 번 호출됩니다 (선택자 보정 등)."""
+
+    async def discover_tabs(self, page) -> list:
+        """날짜 탭 라벨 목록 (없으면 빈 리스트 — 첫 화면 하나만 수집)"""
+        return []
+
+    def start_tab(self, labels: list) -> int:
+        """수집을 시작할 탭 위치"""
+        return 0
+
+    def tab_date(self, label: str, today: datetime.datetime) -> str:
+        """탭 라벨을 'MM.DD'로 바꿉니다."""
+        return today.strftime("%m.%d")
+
+    async def open_tab(self, page, label: str):
+        """날짜 탭을 클릭합니다 (대기는 호출하는 쪽에서)."""
+
+    async def apply_filter(self, page, channel: str):
+        """채널 필터를 클릭합니다 (대기는 호출하는 쪽에서)."""
+
+    @abc.abstractmethod
+    async def install_collector(self, page, state: dict, known_codes=frozenset()):
+        ...
+
+    @abc.abstractmethod
+    async def drain_collector(self, page) -> dict:
+        ...
+
+    def normalize_date(self, raw_date: str, fallback: str, today: datetime.datetime) -> str:
+        """수집기가 넘긴 날짜 표기를 'MM.DD'로 바꿉니다."""
+        return fallback
+
+    def response_collector(self, fallback_date: str):
+        """편성표 API 응답 가로채기 수집기 (지원하지 않으면 None — DOM 스크롤 수집)"""
+        return None
+
+
+class HmallAdapter(SiteAdapter):
+    """현대홈쇼핑(H.mall) 모바일 편성표
+
+    profile_path의 선택자 프로필(hmall_selectors.py)이 있으면 탭·필터·목록·상품 링크를
+    보정된 선택자로 바로 찾고, 프로필이 없거나 보정에 실패하면 버튼 전체를 훑습니다.
+    """
+    name = "hmall"
+    context_options = CONTEXT_OPTIONS
+
+    def __init__(self, url: str = BASE_URL + SCHEDULE_PATH, channels: list = ("TV쇼핑",), pool_size: int = 3,
+                 profile_path: str = SELECTOR_PROFILE_FILE):
+        self.url = url
+        self.channels = list(channels)
+        self.pool_size = pool_size
+        self.profile = SelectorProfile(profile_path) if profile_path else None
+
+    def _selector(self, key: str):
+        return self.profile.get(key) if self.profile is not None else None
+
+    @property
+    def list_selector(self) -> str:
+        return self._selector("list") or LIST_SELECTOR
+
+    @property
+    def item_selector(self) -> str:
+        return self._selector("items") or ITEM_SELECTOR
+
+    @property
+    def more_selector(self) -> str:
+        # 보정할 때 버튼이 아직 안 그려졌을 수 있으므로 프로필에 없으면 기존 로케이터로 찾음
+        return self._selector("more") or "button:has-text('상품 더보기'), .btn_more"
+
+    async def prepare(self, page):
+        if self.profile is not None:
+            await self.profile.ensure(page, self.url, self.channels)
+
+    async def discover_tabs(self, page) -> list:
+        if self._selector("tabs"):
+            return await page.evaluate("""(selector) => Array.from(document.querySelectorAll(selector))
+                .map(b => b.textContent.replace(/\\s+/g, ' ').trim())
+                .filter(t => t.length < 15 && (t.includes('오늘') || /\\d+/.test(t)))""", self._selector("tabs"))
+        return await page.evaluate("""() => {
+            let btns = Array.from(document.querySelectorAll('button'));
+            return btns
+                .filter(b => (b.innerText.includes('오늘') || /\\d+/.test(b.innerText)) && b.innerText.length < 15)
+                .map(b => b.innerText.trim());
+        }""")
+
+    def start_tab(self, labels: list) -> int:
+        # 오늘(또는 첫 번째)부터 시작
+        return next((i for i, t in enumerate(labels) if "오늘" in t), 0)
+
+    def tab_date(self, label: str, today: datetime.datetime) -> str:
+        return tab_date(label, today)
+
+    async def open_tab(self, page, label: str):
+        # JavaScript로 탭 클릭 (viewport 바깥 요소도 안전하게 처리)
+        if self._selector("tabs"):
+            await page.evaluate("""([selector, label]) => {
+                const target = Array.from(document.querySelectorAll(selector))
+                    .find(b => b.textContent.replace(/\\s+/g, ' ').trim() === label);
+                if (target) target.click();
+            }""", [self._selector("tabs"), label])
+            return
+        await page.evaluate("""(label) => {
+            let btns = Array.from(document.querySelectorAll('button'));
+            let target = btns.find(b => b.innerText.includes(label));
+            if (target) target.click();
+        }""", label.split("\n")[0])
+
+    async def apply_filter(self, page, channel: str):
+        if self._selector("channels"):
+            await page.evaluate("""([selector, channel]) => {
+                const btns = Array.from(document.querySelectorAll(selector));
+                const target = btns.find(b => b.textContent.trim() === channel)
+                    || btns.find(b => b.textContent.includes(channel));
+                if (target) target.click();
+            }""", [self._selector("channels"), channel])
+            return
+        await page.evaluate("""(channel) => {
+            let btns = Array.from(document.querySelectorAll('button, a'));
+            let tvBtn = btns.find(b => b.innerText.trim() === channel || b.innerText.includes(channel));
+            if (tvBtn) tvBtn.click();
+        }""", channel)
+
+    async def install_collector(self, page, state: dict, known_codes=frozenset()):
+        selectors = self.profile.selectors if self.profile is not None else {}
+        await install_collector(page, state, known_codes, selectors)
+
+    async def drain_collector(self, page) -> dict:
+        return await drain_collector(page)
+
+    def normalize_date(self, raw_date: str, fallback: str, today: datetime.datetime) -> str:
+        return normalize_date(raw_date, fallback, today)
+
+    def response_collector(self, fallback_date: str):
+        return ScheduleResponseCollector(fallback_date=fallback_date)
+
+
+# 러너에서 이름으로 고를 수 있는 어댑터 (새 사이트는 여기에 등록)
+SITES = {
+    HmallAdapter.name: HmallAdapter,
+}
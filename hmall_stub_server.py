@@ -0,0 +1,285 @@
+"""로컬 H.mall 대역 서버 — 재현 가능한 크롤러 벤치마크용
+
+실제 사이트처럼 날짜 탭, 'TV쇼핑' 필터, 스크롤 시 편성표 API(JSON)로 행을
+추가하는 가상화 목록(화면 밖 행 제거), '상품 더보기' 버튼, 상품 상세 페이지를 흉내 냅니다.
+편성표는 설정값으로 결정적으로 생성되므로 ground_truth()와 결과를 비교할 수 있습니다.
+
+단독 실행:
+    python hmall_stub_server.py --port 8765 --latency 0.2
+"""
+import argparse
+import datetime
+import json
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+WEEKDAYS = "월화수목금토일"
+
+
+@dataclass
+class StubConfig:
+    days: int = 7               # 편성 일수 (날짜 탭 수)
+    slots_per_day: int = 16     # 하루 방송 슬롯 수
+    slots_per_page: int = 4     # API 한 번에 내려주는 슬롯 수
+    latency: float = 0.0        # API 응답 지연(초)
+    more_every: int = 3         # 이 페이지 수마다 '상품 더보기' 클릭 필요 (0 = 버튼 없음)
+    window: int = 24            # 가상화 목록에 동시에 남겨 두는 행 수
+    base_date: datetime.date = None  # 편성 시작일 (기본: 오늘)
+
+
+def build_schedule(config: StubConfig) -> list:
+    """결정적인 편성표를 만듭니다: [{date, time, channel, items: [(code, name)]}]"""
+    base = config.base_date or datetime.date.today()
+    step = 24 * 60 // config.slots_per_day
+    slots = []
+    for d in range(config.days):
+        day = base + datetime.timedelta(days=d)
+        for s in range(config.slots_per_day):
+            minutes = s * step
+            items = [
+                (f"22{d:02d}{s:03d}{k:03d}", f"테스트상품 {d + 1}일차 {s + 1}번 구성{k + 1}")
+                for k in range((d * 31 + s) % 3 + 1)
+            ]
+            slots.append({
+                "date": day,
+                "time": f"{minutes // 60:02d}:{minutes % 60:02d}",
+                "channel": "data" if s % 4 == 3 else "tv",
+                "items": items,
+            })
+    return slots
+
+
+def ground_truth(config: StubConfig, channel: str = "tv") -> list:
+    """필터 적용 시 크롤러가 수집해야 하는 레코드 (날짜/방송시간/상품코드/상품명)"""
+    return [
+        {"날짜": slot["date"].strftime("%m.%d"), "방송시간": slot["time"], "상품코드": code, "상품명": name}
+        for slot in build_schedule(config)
+        if channel == "all" or slot["channel"] == channel
+        for code, name in slot["items"]
+    ]
+
+
+_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>편성표 (stub)</title>
+<style>
+  body { margin: 0; font-family: sans-serif; }
+  .row { height: 180px; border-bottom: 1px solid #ddd; }
+  #more { display: none; width: 100%; height: 48px; }
+</style></head>
+<body>
+<div id="tabs">__TABS__</div>
+<div id="channels"><button data-type="all">전체</button><button data-type="tv">TV쇼핑</button></div>
+<div data-testid="virtuoso-item-list" id="list" style="padding-top: 0px;"></div>
+<button id="more" class="btn_more">상품 더보기</button>
+<script id="__NEXT_DATA__" type="application/json">{"props":{"pageProps":{}},"page":"/dpl/[index]","query":{},"buildId":"stub"}</script>
+<script>
+const MORE_EVERY = __MORE_EVERY__, WINDOW = __WINDOW__;
+const list = document.getElementById('list'), more = document.getElementById('more');
+const state = { day: 0, type: 'all', page: 0, loading: false, last: false, sinceMore: 0, gen: 0 };
+
+function render(brodList) {
+  for (const b of brodList) {
+    const row = document.createElement('div');
+    row.className = 'row';
+    row.setAttribute('data-time', b.brodStrtDtm);
+    const links = b.itemList.map(i =>
+      `<a href="/md/pda/itemPtc?slitmCd=${i.slitmCd}"><span aria-label="제품명">${i.slitmNm}</span></a>`).join('');
+    row.innerHTML = `<div class="_1jauv3p0"><div class="_1jauv3p1"><p class="_1jauv3p7"><em>${b.time}</em> ~</p>` +
+      `<span class="_1jauv3p4">${b.dateLabel}</span></div><div class="h84bfs0">${links}</div></div>`;
+    list.appendChild(row);
+  }
+  // 가상화: 화면 위로 지나간 행은 제거하고 그 높이만큼 padding-top으로 보존
+  let pad = parseInt(list.style.paddingTop) || 0;
+  while (list.children.length > WINDOW) {
+    pad += list.firstElementChild.offsetHeight;
+    list.removeChild(list.firstElementChild);
+  }
+  list.style.paddingTop = pad + 'px';
+}
+
+async function load() {
+  if (state.loading || state.last) return;
+  state.loading = true;
+  const gen = state.gen;
+  const r = await fetch(`/md/api/brod/schedule?day=${state.day}&brodType=${state.type}&page=${state.page}`);
+  const data = await r.json();
+  state.loading = false;
+  if (gen !== state.gen) return;  // 탭/필터가 바뀌었으면 버림
+  render(data.brodList);
+  state.page++;
+  state.last = data.lastYn === 'Y';
+  state.sinceMore++;
+  if (MORE_EVERY && state.sinceMore >= MORE_EVERY && !state.last) more.style.display = 'block';
+  else if (!state.last && document.body.scrollHeight <= innerHeight + 300) load();
+}
+
+function reset() {
+  state.gen++;
+  state.page = 0; state.last = false; state.sinceMore = 0; state.loading = false;
+  list.innerHTML = ''; list.style.paddingTop = '0px'; more.style.display = 'none';
+  window.scrollTo(0, 0);
+  load();
+}
+
+document.querySelectorAll('#tabs button').forEach(b =>
+  b.addEventListener('click', () => { state.day = +b.dataset.day; reset(); }));
+document.querySelectorAll('#channels button').forEach(b =>
+  b.addEventListener('click', () => { state.type = b.dataset.type; reset(); }));
+more.addEventListener('click', () => { more.style.display = 'none'; state.sinceMore = 0; load(); });
+window.addEventListener('scroll', () => {
+  if (more.style.display === 'block') return;
+  if (innerHeight + scrollY >= document.body.scrollHeight - 300) load();
+});
+load();
+</script>
+</body></html>"""
+
+
+class StubServer:
+    """백그라운드 스레드에서 도는 대역 서버. start()가 편성표 URL을 반환합니다."""
+
+    def __init__(self, config: StubConfig = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StubConfig()
+        self.schedule = build_schedule(self.config)
+        self.api_requests = 0
+        self.page_views = 0
+        self.product_views = 0
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/md/dpl/index?mainDispSeq=2&brodType=all"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _render_page(self) -> bytes:
+        base = self.schedule[0]["date"]
+        tabs = []
+        for d in range(self.config.days):
+            day = base + datetime.timedelta(days=d)
+            label = "오늘" if d == 0 else f"{day.day}<br>{WEEKDAYS[day.weekday()]}"
+            tabs.append(f'<button data-day="{d}">{label}</button>')
+        html = (_PAGE_TEMPLATE
+                .replace("__TABS__", "".join(tabs))
+                .replace("__MORE_EVERY__", str(self.config.more_every))
+                .replace("__WINDOW__", str(self.config.window)))
+        return html.encode("utf-8")
+
+    def _api_page(self, query: dict) -> bytes:
+        day = int(query.get("day", ["0"])[0])
+        page = int(query.get("page", ["0"])[0])
+        brod_type = query.get("brodType", ["all"])[0]
+        base = self.schedule[0]["date"]
+        start = base + datetime.timedelta(days=day)
+        slots = [
+            s for s in self.schedule
+            if s["date"] >= start and (brod_type == "all" or s["channel"] == brod_type)
+        ]
+        size = self.config.slots_per_page
+        chunk = slots[page * size:(page + 1) * size]
+        body = {
+            "brodList": [
+                {
+                    "brodStrtDtm": f"{s['date'].strftime('%Y%m%d')} {s['time']}",
+                    "time": s["time"],
+                    "dateLabel": f"{s['date'].month}월 {s['date'].day}일({WEEKDAYS[s['date'].weekday()]})",
+                    "itemList": [{"slitmCd": code, "slitmNm": name} for code, name in s["items"]],
+                }
+                for s in chunk
+            ],
+            "lastYn": "Y" if (page + 1) * size >= len(slots) else "N",
+        }
+        return json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+    def _product_page(self, query: dict):
+        """상품 상세 페이지 (__NEXT_DATA__에 상품 정보). 없는 상품코드면 None."""
+        code = query.get("slitmCd", [""])[0]
+        for slot in self.schedule:
+            for item_code, name in slot["items"]:
+                if item_code == code:
+                    data = {"props": {"pageProps": {"itemPtc": {
+                        "slitmCd": code, "slitmNm": name,
+                        "sellPrc": 10000 + int(code[-6:]) % 990 * 100, "dispCtgrNm": "테스트카테고리",
+                    }}}, "page": "/pda/itemPtc", "query": {"slitmCd": code}, "buildId": "stub"}
+                    return (f'<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8"><title>{name}</title></head>'
+                            f'<body><script id="__NEXT_DATA__" type="application/json">'
+                            f'{json.dumps(data, ensure_ascii=False)}</script></body></html>').encode("utf-8")
+        return None
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, body: bytes, content_type: str):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                if parts.path == "/md/api/brod/schedule":
+                    server.api_requests += 1
+                    if server.config.latency:
+                        time.sleep(server.config.latency)
+                    self._send(server._api_page(parse_qs(parts.query)), "application/json; charset=utf-8")
+                elif parts.path == "/md/dpl/index":
+                    server.page_views += 1
+                    self._send(server._render_page(), "text/html; charset=utf-8")
+                elif parts.path == "/md/pda/itemPtc":
+                    server.product_views += 1
+                    body = server._product_page(parse_qs(parts.query))
+                    if body is None:
+                        self.send_error(404)
+                    else:
+                        self._send(body, "text/html; charset=utf-8")
+                else:
+                    self.send_error(404)
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 H.mall 대역 서버")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--slots-per-day", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--more-every", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    config = StubConfig(days=args.days, slots_per_day=args.slots_per_day,
+                        latency=args.latency, more_every=args.more_every)
+    server = StubServer(config, port=args.port)
+    print(f"🧪 대역 서버 실행 중: {server.url} (정답 {len(ground_truth(config))}개)")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
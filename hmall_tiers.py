@@ -0,0 +1,56 @@
+"""수집 계층 — 가까운 시간대만 자주 새로 고치는 hot 수집과 가끔 도는 7일 전체(full) 수집
+
+hot 수집은 편성이 자주 바뀌는 지금~HOT_WINDOW_HOURS 뒤까지만 스크롤하고,
+그 뒤 구간은 이력 저장소의 마지막 편성표를 그대로 이어 붙입니다.
+"""
+import datetime
+
+from hmall_history import resolve_date
+
+TIERS = ("hot", "full")
+
+
+def slot_datetime(mmdd: str, time: str, now: datetime.datetime):
+    """('MM.DD', 'HH:MM')을 datetime으로 바꿉니다. 형식이 다르면 None."""
+    try:
+        date = datetime.datetime.strptime(resolve_date(mmdd, now), "%Y-%m-%d")
+        hour, minute = (int(part) for part in time.split(":"))
+    except (ValueError, AttributeError):
+        return None
+    return date.replace(hour=hour, minute=minute)
+
+
+def past_horizon(mmdd: str, time: str, horizon: datetime.datetime, now: datetime.datetime) -> bool:
+    """슬롯이 수집 범위(horizon)를 넘었으면 True. 시각을 알 수 없으면 False."""
+    slot = slot_datetime(mmdd, time, now)
+    return slot is not None and slot > horizon
+
+
+def horizon_dates(now: datetime.datetime, horizon: datetime.datetime) -> frozenset:
+    """오늘부터 horizon 날짜까지의 'MM.DD' 집합 (hot 수집에서 열 날짜 탭)"""
+    dates = set()
+    day = now.date()
+    while day <= horizon.date():
+        dates.add(day.strftime("%m.%d"))
+        day += datetime.timedelta(days=1)
+    return frozenset(dates)
+
+
+def choose_tier(requested: str, last_full_at, now: datetime.datetime, full_sweep_minutes: float) -> str:
+    """requested가 "auto"면 마지막 전체 수집 후 full_sweep_minutes가 지났을 때만 "full"."""
+    if requested in TIERS:
+        return requested
+    if last_full_at is None or (now - last_full_at).total_seconds() >= full_sweep_minutes * 60:
+        return "full"
+    return "hot"
+
+
+def merge_hot(stored: list, fresh: list, horizon: datetime.datetime, now: datetime.datetime) -> list:
+    """hot 수집 결과를 저장된 편성표에 병합합니다.
+
+    horizon까지는 이번 수집 결과가 기준이고(사라진 슬롯은 삭제), horizon 뒤는
+    저장된 편성을 유지합니다.
+    """
+    merged = [item for item in fresh if not past_horizon(item["날짜"], item["방송시간"], horizon, now)]
+    merged.extend(item for item in stored if past_horizon(item["날짜"], item["방송시간"], horizon, now))
+    return merged
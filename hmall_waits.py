@@ -0,0 +1,128 @@
+"""고정 sleep 대신 실제 신호(DOM 변경, 네트워크 유휴, 새 [data-time] 노드)로 대기하는 계층"""
+import asyncio
+import time
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from hmall_api import is_schedule_url
+
+# 편성표 목록 컨테이너 (Virtuoso) — 없으면 body 전체를 관찰
+LIST_SELECTOR = '[data-testid="virtuoso-item-list"]'
+ITEM_SELECTOR = "[data-time], ._1jauv3p0"
+NETWORK_IDLE_SECONDS = 0.3  # 진행 중인 편성표 XHR이 0인 상태가 이만큼 유지되면 유휴로 판단
+
+# 관찰자 설치: 이후 추가된 노드 수와 마지막 [data-time] 값을 기록
+_ARM_SCRIPT = """(selector) => {
+    if (window.__hmallWait) window.__hmallWait.observer.disconnect();
+    const target = document.querySelector(selector) || document.body;
+    const times = document.querySelectorAll('[data-time]');
+    const state = {
+        mutations: 0,
+        lastTime: times.length ? times[times.length - 1].getAttribute('data-time') : null,
+    };
+    state.observer = new MutationObserver(muts => {
+        for (const m of muts) state.mutations += m.addedNodes.length;
+    });
+    state.observer.observe(target, { childList: true, subtree: true });
+    window.__hmallWait = state;
+}"""
+
+_MUTATED_SCRIPT = "() => window.__hmallWait && window.__hmallWait.mutations > 0"
+
+_NEW_TIME_NODE_SCRIPT = """() => {
+    const s = window.__hmallWait;
+    const times = document.querySelectorAll('[data-time]');
+    const last = times.length ? times[times.length - 1].getAttribute('data-time') : null;
+    return !!s && last !== null && last !== s.lastTime;
+}"""
+
+
+class AdaptiveWaiter:
+    """페이지 신호를 기다리고, 신호별 대기 시간을 집계합니다.
+
+    사용법: arm() → 클릭/스크롤 → wait_for_change(timeout). 상한(timeout)은
+    그대로 유지되며 신호가 먼저 오면 즉시 반환합니다.
+    """
+
+    def __init__(self, page, list_selector: str = LIST_SELECTOR, stats: dict = None,
+                 item_selector: str = ITEM_SELECTOR):
+        self.page = page
+        self.list_selector = list_selector
+        self.item_selector = item_selector
+        # { signal: [횟수, 누적 대기(초)] } — 여러 페이지가 같은 dict를 공유해 합산 가능
+        self.stats = {} if stats is None else stats
+        self._inflight = 0
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_request_done)
+        page.on("requestfailed", self._on_request_done)
+
+    def _is_tracked(self, request) -> bool:
+        # 편성표 요청만 셈 (분석·롱폴링·추적 XHR이 끝나기를 기다리면 매번 상한까지 대기)
+        return request.resource_type in ("xhr", "fetch") and is_schedule_url(request.url)
+
+    def _on_request(self, request):
+        if self._is_tracked(request):
+            self._inflight += 1
+
+    def _on_request_done(self, request):
+        if self._is_tracked(request):
+            self._inflight = max(0, self._inflight - 1)
+
+    def _record(self, signal: str, started: float) -> str:
+        entry = self.stats.setdefault(signal, [0, 0.0])
+        entry[0] += 1
+        entry[1] += time.monotonic() - started
+        return signal
+
+    async def arm(self):
+        """다음 동작으로 생기는 변경을 놓치지 않도록 동작 전에 관찰자를 설치합니다."""
+        await self.page.evaluate(_ARM_SCRIPT, self.list_selector)
+
+    async def wait_for_network_idle(self, timeout: float) -> bool:
+        """진행 중인 편성표 XHR/fetch 요청이 모두 끝날 때까지 최대 timeout초 기다립니다."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._inflight == 0:
+                await asyncio.sleep(NETWORK_IDLE_SECONDS)
+                if self._inflight == 0:
+                    return True
+            else:
+                await asyncio.sleep(0.05)
+        return False
+
+    async def wait_for_change(self, timeout: float) -> str:
+        """arm() 이후 목록이 바뀔 때까지 기다리고, 먼저 도달한 신호 이름을 반환합니다.
+
+        "time-node" = 새 [data-time] 노드, "mutation" = 목록 DOM 변경,
+        "network-idle" = 요청이 끝났지만 DOM 변화 없음, "timeout" = 상한 도달
+        """
+        started = time.monotonic()
+        try:
+            await self.page.wait_for_function(_MUTATED_SCRIPT, timeout=timeout * 1000)
+        except PlaywrightTimeoutError:
+            return self._record("timeout", started)
+
+        # DOM 변경 직후 데이터 요청이 진행 중이면 응답이 그려질 때까지 조금 더 대기
+        if self._inflight:
+            await self.wait_for_network_idle(max(0.0, timeout - (time.monotonic() - started)))
+        if await self.page.evaluate(_NEW_TIME_NODE_SCRIPT):
+            return self._record("time-node", started)
+        return self._record("mutation", started)
+
+    async def wait_for_items(self, timeout: float) -> str:
+        """편성표 항목이 처음 렌더링될 때까지 기다립니다 (페이지 로드 직후)."""
+        started = time.monotonic()
+        try:
+            await self.page.wait_for_selector(self.item_selector, timeout=timeout * 1000)
+        except PlaywrightTimeoutError:
+            return self._record("timeout", started)
+        if not await self.wait_for_network_idle(max(0.0, timeout - (time.monotonic() - started))):
+            return self._record("time-node", started)
+        return self._record("network-idle", started)
+
+    def report(self):
+        """신호별 대기 횟수와 누적 시간을 출력합니다."""
+        if not self.stats:
+            return
+        parts = [f"{signal} {count}회/{spent:.1f}s" for signal, (count, spent) in sorted(self.stats.items())]
+        print(f"  ⏱️ 대기 신호: {', '.join(parts)}")